@@ -1,7 +1,9 @@
+import collections
 import enum
 import hashlib
 import logging
 import secrets
+import time
 
 import passlib.context
 import starlette.authentication
@@ -9,6 +11,8 @@ import starlette.requests
 
 import app.database as database
 import app.errors as errors
+import app.settings as settings
+import app.utils as utils
 
 
 logger = logging.getLogger(__name__)
@@ -47,6 +51,67 @@ def hash_token(token):
     return hashlib.sha512(token.encode("utf-8")).hexdigest()
 
 
+########################################################################################
+# Caching
+########################################################################################
+
+
+class Cache:
+    """In-memory mapping whose entries expire after a time to live.
+
+    When the cache holds more than `size` entries, the least recently used ones are
+    evicted. Each server process has its own caches, so changes that are made through
+    another process only become visible once the entries expire.
+    """
+
+    def __init__(self, ttl, size):
+        self.ttl = ttl
+        self.size = size
+        self.entries = collections.OrderedDict()  # Key -> (value, expiration time)
+
+    def get(self, key):
+        """Return the cached value of the key; Raise KeyError if it's missing."""
+        value, expiration = self.entries[key]
+        if expiration < time.monotonic():
+            del self.entries[key]
+            raise KeyError(key)
+        self.entries.move_to_end(key)
+        return value
+
+    def set(self, key, value, ttl=None):
+        """Cache the value for the default or, if it's shorter, the given ttl."""
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        self.entries[key] = (value, time.monotonic() + ttl)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, key):
+        """Remove the key from the cache, e.g. when the underlying data changed."""
+        self.entries.pop(key, None)
+
+    def clear(self):
+        """Remove all entries from the cache."""
+        self.entries.clear()
+
+
+# Access token hash -> user identifier, or None if the access token is invalid. Logging
+# out or revoking a session has to invalidate the session's entry.
+sessions = Cache(
+    ttl=settings.AUTHENTICATION_CACHE_TTL, size=settings.AUTHENTICATION_CACHE_SIZE
+)
+
+# (user identifier, network identifier) -> relationship of the user with the network
+relationships = Cache(
+    ttl=settings.AUTHORIZATION_CACHE_TTL, size=settings.AUTHORIZATION_CACHE_SIZE
+)
+# (network identifier, sensor identifier) -> True if the sensor exists in the network;
+# Sensors that don't exist are not cached, so that new sensors are found right away
+sensors = Cache(
+    ttl=settings.AUTHORIZATION_CACHE_TTL, size=settings.AUTHORIZATION_CACHE_SIZE
+)
+
+
 ########################################################################################
 # Authentication middleware
 ########################################################################################
@@ -73,19 +138,41 @@ class AuthenticationMiddleware:
         if scheme.lower() != "bearer":
             logger.warning("Malformed authorization header")
             return None
-        # Check if we have the access token in the database
+        access_token_hash = hash_token(access_token)
+        try:
+            user_identifier = sessions.get(access_token_hash)
+        except KeyError:
+            user_identifier = await self._lookup(request, access_token_hash)
+        if user_identifier is None:
+            logger.warning("Invalid access token")
+        # Return the requester's identity
+        return user_identifier
+
+    async def _lookup(self, request, access_token_hash):
+        """Read the session of the access token from the database and cache it."""
         query, arguments = database.parametrize(
             identifier="authenticate",
-            arguments={"access_token_hash": hash_token(access_token)},
+            arguments={
+                "access_token_hash": access_token_hash,
+                "session_lifetime": settings.SESSION_LIFETIME,
+            },
         )
         elements = await request.state.dbpool.fetch(query, *arguments)
-        elements = database.dictify(elements)
-        # If the result set is empty, the access token is invalid
+        # If the result set is empty, the access token is invalid or expired
         if len(elements) == 0:
-            logger.warning("Invalid access token")
+            sessions.set(access_token_hash, None)
             return None
-        # Return the requester's identity
-        return elements[0]["user_identifier"]
+        user_identifier = elements[0]["user_identifier"]
+        # Don't keep the session in the cache for longer than it's valid
+        ttl = (
+            None
+            if settings.SESSION_LIFETIME is None
+            else elements[0]["creation_timestamp"]
+            + settings.SESSION_LIFETIME
+            - utils.timestamp()
+        )
+        sessions.set(access_token_hash, user_identifier, ttl=ttl)
+        return user_identifier
 
     async def __call__(self, scope, receive, send):
         # Only process HTTP requests, not websockets
@@ -134,6 +221,11 @@ class Network(Resource):
     async def _authorize(self, request):
         if request.state.identity is None:
             return Relationship.NONE
+        key = (request.state.identity, self.identifier)
+        try:
+            return relationships.get(key)
+        except KeyError:
+            pass
         query, arguments = database.parametrize(
             identifier="authorize-resource-network",
             arguments={
@@ -142,37 +234,49 @@ class Network(Resource):
             },
         )
         elements = await request.state.dbpool.fetch(query, *arguments)
-        elements = database.dictify(elements)
         if len(elements) == 0:
             raise errors.NotFoundError
-        return (
+        relationship = (
             Relationship.DEFAULT
             if elements[0]["user_identifier"] is None
             else Relationship.OWNER
         )
+        relationships.set(key, relationship)
+        return relationship
 
 
 class Sensor(Resource):
     async def _authorize(self, request):
         if request.state.identity is None:
             return Relationship.NONE
+        network_identifier = self.identifier["network_identifier"]
+        sensor_identifier = self.identifier["sensor_identifier"]
+        key = (request.state.identity, network_identifier)
+        try:
+            sensors.get((network_identifier, sensor_identifier))
+            return relationships.get(key)
+        except KeyError:
+            pass
+        # Read both the relationship with the network and the sensor's existence at once
         query, arguments = database.parametrize(
             identifier="authorize-resource-sensor",
             arguments={
                 "user_identifier": request.state.identity,
-                "network_identifier": self.identifier["network_identifier"],
-                "sensor_identifier": self.identifier["sensor_identifier"],
+                "network_identifier": network_identifier,
+                "sensor_identifier": sensor_identifier,
             },
         )
         elements = await request.state.dbpool.fetch(query, *arguments)
-        elements = database.dictify(elements)
         if len(elements) == 0:
             raise errors.NotFoundError
-        return (
+        relationship = (
             Relationship.DEFAULT
             if elements[0]["user_identifier"] is None
             else Relationship.OWNER
         )
+        sensors.set((network_identifier, sensor_identifier), True)
+        relationships.set(key, relationship)
+        return relationship
 
 
 async def authorize(request, resource):
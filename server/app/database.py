@@ -1,25 +1,32 @@
 import contextlib
 import json
+import math
 import os
 import string
+import uuid
 
 import asyncpg
-import pendulum
 
 import app.settings as settings
 
 
 def prepare():
-    """Load SQL queries from `queries.sql` file."""
+    """Load SQL queries from `queries.sql` file and compile them."""
     with open(os.path.join(os.path.dirname(__file__), "queries.sql"), "r") as file:
         statements = file.read().split("\n\n\n")
         # Validate format
         assert all(statement.startswith("-- name: ") for statement in statements)
         assert not any("\n-- name: " in statement for statement in statements)
-        return {
-            statement.split("\n", 1)[0][9:]: statement.split("\n", 1)[1]
-            for statement in statements
-        }
+    queries = {}
+    for statement in statements:
+        identifier, query = statement.split("\n", 1)
+        template = string.Template(query)
+        # Get a list of the query argument names from the template
+        keys = tuple(template.get_identifiers())
+        # Replace named arguments with native numbered arguments
+        query = template.substitute({key: f"${i+1}" for i, key in enumerate(keys)})
+        queries[identifier[9:]] = (query, keys, frozenset(keys))
+    return queries
 
 
 queries = prepare()
@@ -27,52 +34,85 @@ queries = prepare()
 
 def parametrize(identifier, arguments):
     """Return the query and translate named arguments into valid PostgreSQL."""
-    template = string.Template(queries[identifier])
+    query, keys, names = queries[identifier]
     single = isinstance(arguments, dict)
-    # Get a list of the query argument names from the template
-    keys = template.get_identifiers()
     # Raise an error if unknown arguments are passed
-    if diff := set(arguments.keys() if single else arguments[0].keys()) - set(keys):
+    if diff := (arguments.keys() if single else arguments[0].keys()) - names:
         raise ValueError(f"Unknown query arguments: {diff}")
-    # Replace named arguments with native numbered arguments
-    query = template.substitute({key: f"${i+1}" for i, key in enumerate(keys)})
     # Build argument tuple and fill missing arguments with None
-    arguments = (
-        tuple(arguments.get(key) for key in keys)
-        if single
-        else [tuple(x.get(key) for key in keys) for x in arguments]
-    )
-    return query, arguments
+    if single:
+        return query, tuple(map(arguments.get, keys))
+    return query, [tuple(map(x.get, keys)) for x in arguments]
+
+
+# Seconds between the unix epoch and the PostgreSQL epoch (2000-01-01T00:00:00Z)
+_EPOCH_OFFSET = 946684800
+
+
+def _encode_timestamp(x):
+    """Encode a unix timestamp into microseconds since the PostgreSQL epoch."""
+    # Round to microseconds the same way as datetime.fromtimestamp does
+    fraction, seconds = math.modf(x)
+    return ((int(seconds) - _EPOCH_OFFSET) * 1000000 + round(fraction * 1e6),)
+
+
+def _decode_timestamp(x):
+    """Decode microseconds since the PostgreSQL epoch into a unix timestamp."""
+    return (x[0] + _EPOCH_OFFSET * 1000000) / 1000000
+
+
+def _encode_uuid(x):
+    """Encode a UUID string into its 16 bytes."""
+    return uuid.UUID(x).bytes
+
+
+def _decode_uuid(x):
+    """Decode the 16 bytes of a UUID into its canonical string representation."""
+    # Formatting the hex digits directly skips the validation of the UUID class
+    x = x.hex()
+    return f"{x[:8]}-{x[8:12]}-{x[12:16]}-{x[16:20]}-{x[20:]}"
+
+
+# Version of the binary JSONB format, which is otherwise the same as the text format
+_JSONB_VERSION = b"\x01"
 
 
-def dictify(elements):
-    """Cast a asyncpg SELECT query result into a list of dictionaries."""
-    # TODO: implement this as a custom asyncpg record_class on pool?
-    # see https://magicstack.github.io/asyncpg/current/api/index.html#connection-pools
-    return [dict(record) for record in elements]
+def _encode_jsonb(x):
+    """Encode a JSON-serializable object into the binary JSONB format."""
+    return _JSONB_VERSION + json.dumps(x).encode()
+
+
+def _decode_jsonb(x):
+    """Decode the binary JSONB format into a Python object."""
+    return json.loads(x[1:])
 
 
 async def initialize(connection):
-    # Automatically encode/decode TIMESTAMPTZ fields to/from unix timestamps
+    # Automatically encode/decode TIMESTAMPTZ fields to/from unix timestamps. All
+    # codecs use the binary format, which is required for COPY and skips formatting
+    # and parsing strings for every value.
     await connection.set_type_codec(
         typename="timestamptz",
         schema="pg_catalog",
-        encoder=lambda x: pendulum.from_timestamp(x).isoformat(),
-        decoder=lambda x: pendulum.parse(x).float_timestamp,
+        encoder=_encode_timestamp,
+        decoder=_decode_timestamp,
+        format="tuple",
     )
-    # Automatically encode/decode JSONB fields to/from str
+    # Automatically encode/decode JSONB fields to/from Python objects
     await connection.set_type_codec(
         typename="jsonb",
         schema="pg_catalog",
-        encoder=json.dumps,
-        decoder=json.loads,
+        encoder=_encode_jsonb,
+        decoder=_decode_jsonb,
+        format="binary",
     )
     # Automatically encode/decode UUID fields to/from str
     await connection.set_type_codec(
         typename="uuid",
         schema="pg_catalog",
-        encoder=str,
-        decoder=str,
+        encoder=_encode_uuid,
+        decoder=_decode_uuid,
+        format="binary",
     )
 
 
@@ -92,3 +132,20 @@ async def pool():
         init=initialize,
     ) as x:
         yield x
+
+
+@contextlib.asynccontextmanager
+async def connection():
+    """Context manager for a database connection outside of the pool."""
+    x = await asyncpg.connect(
+        host=settings.POSTGRESQL_URL,
+        port=settings.POSTGRESQL_PORT,
+        user=settings.POSTGRESQL_USERNAME,
+        password=settings.POSTGRESQL_PASSWORD,
+        database=settings.POSTGRESQL_DATABASE,
+    )
+    try:
+        await initialize(x)
+        yield x
+    finally:
+        await x.close()
@@ -1,5 +1,8 @@
 import asyncio
 import contextlib
+import csv
+import io
+import json
 import logging
 
 import asyncpg
@@ -15,12 +18,13 @@ import app.errors as errors
 import app.logs as logs
 import app.mqtt as mqtt
 import app.settings as settings
+import app.utils as utils
 import app.validation as validation
 
 
 @validation.validate(schema=validation.ReadStatusRequest)
 async def read_status(request, values):
-    return starlette.responses.JSONResponse(
+    return utils.JSONResponse(
         status_code=200,
         content={
             "environment": settings.ENVIRONMENT,
@@ -53,7 +57,7 @@ async def create_user(request, values):
                     f"{request.method} {request.url.path} -- Uniqueness violation"
                 )
                 raise errors.ConflictError
-            user_identifier = database.dictify(elements)[0]["user_identifier"]
+            user_identifier = elements[0]["user_identifier"]
             # Create new session
             query, arguments = database.parametrize(
                 identifier="create-session",
@@ -64,7 +68,7 @@ async def create_user(request, values):
             )
             await connection.execute(query, *arguments)
     # Return successful response
-    return starlette.responses.JSONResponse(
+    return utils.JSONResponse(
         status_code=201,
         content={"user_identifier": user_identifier, "access_token": access_token},
     )
@@ -77,7 +81,6 @@ async def create_session(request, values):
         identifier="read-user", arguments={"user_name": values.body["user_name"]}
     )
     elements = await request.state.dbpool.fetch(query, *arguments)
-    elements = database.dictify(elements)
     if len(elements) == 0:
         logger.warning(f"{request.method} {request.url.path} -- User not found")
         raise errors.NotFoundError
@@ -98,7 +101,7 @@ async def create_session(request, values):
     )
     await request.state.dbpool.execute(query, *arguments)
     # Return successful response
-    return starlette.responses.JSONResponse(
+    return utils.JSONResponse(
         status_code=201,
         content={"user_identifier": user_identifier, "access_token": access_token},
     )
@@ -124,7 +127,7 @@ async def create_network(request, values):
                     f"{request.method} {request.url.path} -- Uniqueness violation"
                 )
                 raise errors.ConflictError
-            network_identifier = database.dictify(elements)[0]["network_identifier"]
+            network_identifier = elements[0]["network_identifier"]
             # Create new permission
             query, arguments = database.parametrize(
                 identifier="create-permission",
@@ -139,8 +142,10 @@ async def create_network(request, values):
                 # This can happen if the user is deleted after the permissions check
                 logger.warning(f"{request.method} {request.url.path} -- User not found")
                 raise errors.UnauthorizedError
+    # Forget the user's cached relationship with the network
+    auth.relationships.invalidate((request.state.identity, network_identifier))
     # Return successful response
-    return starlette.responses.JSONResponse(
+    return utils.JSONResponse(
         status_code=201,
         content={"network_identifier": network_identifier},
     )
@@ -158,9 +163,7 @@ async def read_networks(request, values):
         arguments={"user_identifier": request.state.identity},
     )
     elements = await request.state.dbpool.fetch(query, *arguments)
-    return starlette.responses.JSONResponse(
-        status_code=200, content=database.dictify(elements)
-    )
+    return utils.JSONResponse(status_code=200, content=elements)
 
 
 @validation.validate(schema=validation.CreateSensorRequest)
@@ -194,9 +197,12 @@ async def create_sensor(request, values):
     except asyncpg.exceptions.UniqueViolationError:
         logger.warning(f"{request.method} {request.url.path} -- Uniqueness violation")
         raise errors.ConflictError
-    sensor_identifier = database.dictify(elements)[0]["sensor_identifier"]
+    sensor_identifier = elements[0]["sensor_identifier"]
+    # Accept MQTT messages from the new sensor right away
+    request.state.registry.add(sensor_identifier)
+    auth.sensors.invalidate((values.path["network_identifier"], sensor_identifier))
     # Return successful response
-    return starlette.responses.JSONResponse(
+    return utils.JSONResponse(
         status_code=201,
         content={"sensor_identifier": sensor_identifier},
     )
@@ -216,9 +222,102 @@ async def read_sensors(request, values):
         arguments={"network_identifier": values.path["network_identifier"]},
     )
     elements = await request.state.dbpool.fetch(query, *arguments)
-    return starlette.responses.JSONResponse(
-        status_code=200, content=database.dictify(elements)
+    return utils.JSONResponse(status_code=200, content=elements)
+
+
+@validation.validate(schema=validation.ReadLatestRequest)
+async def read_latest(request, values):
+    relationship = await auth.authorize(
+        request, auth.Network(values.path["network_identifier"])
     )
+    if relationship < auth.Relationship.DEFAULT:
+        raise errors.UnauthorizedError
+    if relationship < auth.Relationship.OWNER:
+        raise errors.ForbiddenError
+    query, arguments = database.parametrize(
+        identifier="read-latest",
+        arguments={"network_identifier": values.path["network_identifier"]},
+    )
+    elements = await request.state.dbpool.fetch(query, *arguments)
+    elements = [
+        {
+            "sensor_identifier": element["sensor_identifier"],
+            "sensor_name": element["sensor_name"],
+            "measurements": element["measurements"],
+            "log": (
+                {
+                    "severity": element["log_severity"],
+                    "message": element["log_message"],
+                    "revision": element["log_revision"],
+                    "creation_timestamp": element["log_creation_timestamp"],
+                }
+                if element["log_creation_timestamp"] is not None
+                else None
+            ),
+            "acknowledgment": (
+                {
+                    "revision": element["acknowledgment_revision"],
+                    "acknowledgment_timestamp": element["acknowledgment_timestamp"],
+                    "success": element["acknowledgment_success"],
+                }
+                if element["acknowledgment_timestamp"] is not None
+                else None
+            ),
+        }
+        for element in elements
+    ]
+    # Return successful response
+    return utils.JSONResponse(status_code=200, content=elements)
+
+
+def _classify(measurement_timestamp, log_timestamp, measurement_window, log_window):
+    """Classify a sensor's health by whether it recently sent measurements and logs."""
+    now = utils.timestamp()
+    measurements = (
+        measurement_timestamp is not None
+        and measurement_timestamp > now - measurement_window
+    )
+    logs = log_timestamp is not None and log_timestamp > now - log_window
+    if measurements:
+        return "unstable" if logs else "online"
+    return "error" if logs else "offline"
+
+
+@validation.validate(schema=validation.ReadHealthRequest)
+async def read_health(request, values):
+    relationship = await auth.authorize(
+        request, auth.Network(values.path["network_identifier"])
+    )
+    if relationship < auth.Relationship.DEFAULT:
+        raise errors.UnauthorizedError
+    if relationship < auth.Relationship.OWNER:
+        raise errors.ForbiddenError
+    measurement_window = (
+        values.query["measurement_window"] or settings.HEALTH_MEASUREMENT_WINDOW
+    )
+    log_window = values.query["log_window"] or settings.HEALTH_LOG_WINDOW
+    query, arguments = database.parametrize(
+        identifier="read-health",
+        arguments={"network_identifier": values.path["network_identifier"]},
+    )
+    elements = await request.state.dbpool.fetch(query, *arguments)
+    elements = [
+        {
+            "sensor_identifier": element["sensor_identifier"],
+            "sensor_name": element["sensor_name"],
+            "status": _classify(
+                element["measurement_timestamp"],
+                element["log_timestamp"],
+                measurement_window,
+                log_window,
+            ),
+            "measurement_timestamp": element["measurement_timestamp"],
+            "log_timestamp": element["log_timestamp"],
+        }
+        for element in elements
+    ]
+    # Return successful response
+    return utils.JSONResponse(status_code=200, content=elements)
 
 
 @validation.validate(schema=validation.UpdateSensorRequest)
@@ -254,11 +353,15 @@ async def update_sensor(request, values):
     except asyncpg.exceptions.UniqueViolationError:
         logger.warning(f"{request.method} {request.url.path} -- Uniqueness violation")
         raise errors.ConflictError
+    # Forget whether the sensor exists, also if the update didn't find it
+    auth.sensors.invalidate(
+        (values.path["network_identifier"], values.path["sensor_identifier"])
+    )
     if response != "UPDATE 1":
         logger.warning(f"{request.method} {request.url.path} -- Sensor not found")
         raise errors.NotFoundError
     # Return successful response
-    return starlette.responses.JSONResponse(status_code=200, content={})
+    return utils.JSONResponse(status_code=200, content={})
 
 
 @validation.validate(schema=validation.CreateConfigurationRequest)
@@ -288,7 +391,7 @@ async def create_configuration(request, values):
     except asyncpg.ForeignKeyViolationError:
         logger.warning(f"{request.method} {request.url.path} -- Sensor not found")
         raise errors.NotFoundError
-    revision = database.dictify(elements)[0]["revision"]
+    revision = elements[0]["revision"]
     # Send MQTT message with configuration
     await mqtt.publish_configuration(
         sensor_identifier=values.path["sensor_identifier"],
@@ -298,7 +401,7 @@ async def create_configuration(request, values):
         dbpool=request.state.dbpool,
     )
     # Return successful response
-    return starlette.responses.JSONResponse(
+    return utils.JSONResponse(
         status_code=201,
         content={"revision": revision},
     )
@@ -329,11 +432,9 @@ async def read_configurations(request, values):
     )
     elements = await request.state.dbpool.fetch(query, *arguments)
     # Return successful response
-    return starlette.responses.JSONResponse(
+    return utils.JSONResponse(
         status_code=200,
-        content=database.dictify(
-            elements if values.query["direction"] == "next" else reversed(elements)
-        ),
+        content=elements if values.query["direction"] == "next" else elements[::-1],
     )
 
 
@@ -346,61 +447,247 @@ async def read_measurements(request, values):
             arguments={"sensor_identifier": values.path["sensor_identifier"]},
         )
         elements = await request.state.dbpool.fetch(query, *arguments)
+        content = {element["attribute"]: element["values"] for element in elements}
+        if values.query["layout"] == "columns":
+            content = {
+                attribute: _columns(buckets, ["bucket_timestamp", "average"])
+                for attribute, buckets in content.items()
+            }
         # Return successful response
-        return starlette.responses.JSONResponse(
-            status_code=200,
-            content={
-                element["attribute"]: element["values"]
-                for element in database.dictify(elements)
-            },
-        )
+        return utils.JSONResponse(status_code=200, content=content)
     # Page through measurements
+    arguments = {
+        "sensor_identifier": values.path["sensor_identifier"],
+        "creation_timestamp": values.query["creation_timestamp"],
+        "start_timestamp": values.query["start"],
+        "end_timestamp": values.query["end"],
+        "limit": values.query["limit"],
+    }
+    identifier = f"read-measurements-{values.query['direction']}"
+    if values.query["attribute"] is not None:
+        arguments["attribute"] = values.query["attribute"]
+        identifier = f"read-measurements-attribute-{values.query['direction']}"
+    query, arguments = database.parametrize(identifier=identifier, arguments=arguments)
+    elements = await request.state.dbpool.fetch(query, *arguments)
+    if values.query["direction"] == "previous":
+        elements = elements[::-1]
+    if values.query["layout"] == "columns":
+        # Attributes missing from a sample are null at that sample's index
+        attributes = dict.fromkeys(k for element in elements for k in element["value"])
+        content = {
+            **_columns(elements, ["revision", "creation_timestamp"]),
+            "value": {
+                attribute: [element["value"].get(attribute) for element in elements]
+                for attribute in attributes
+            },
+        }
+    else:
+        content = elements
+    # Return successful response
+    return utils.JSONResponse(status_code=200, content=content)
+
+
+def _columns(elements, keys):
+    """Transpose a list of objects into one array per key."""
+    return {key: [element[key] for element in elements] for key in keys}
+
+
+# Resolutions of the measurement aggregates in seconds, from coarsest to finest
+_RESOLUTIONS = {"1 day": 86400, "1 hour": 3600, "10 minutes": 600, "1 minute": 60}
+
+
+def _resolve(start, end, points):
+    """Pick the coarsest resolution that still gives the requested number of points."""
+    for resolution, seconds in _RESOLUTIONS.items():
+        if (end - start) / seconds >= points:
+            return resolution
+    return "1 minute"
+
+
+@validation.validate(schema=validation.ReadMeasurementsAggregatesRequest)
+async def read_measurements_aggregates(request, values):
+    end = utils.timestamp() if values.query["end"] is None else values.query["end"]
+    # Default to the last four weeks, the same as the hourly aggregation
+    start = end - 28 * 86400 if values.query["start"] is None else values.query["start"]
+    resolution = _resolve(start, end, values.query["points"])
+    # Read the materialized buckets from the view of the chosen resolution
     query, arguments = database.parametrize(
-        identifier="read-measurements",
+        identifier=f"read-measurements-aggregates-{resolution.replace(' ', '-')}",
         arguments={
             "sensor_identifier": values.path["sensor_identifier"],
-            "creation_timestamp": values.query["creation_timestamp"],
-            "direction": values.query["direction"],
+            "start_timestamp": start,
+            "end_timestamp": end,
         },
     )
     elements = await request.state.dbpool.fetch(query, *arguments)
+    # Aggregate the buckets after the newest materialized one from the raw measurements
+    boundary = start
+    if len(elements) > 0:
+        boundary = max(
+            start,
+            max(element["bucket_timestamp"] for element in elements)
+            + _RESOLUTIONS[resolution],
+        )
+    if boundary < end:
+        query, arguments = database.parametrize(
+            identifier="read-measurements-aggregates-tail",
+            arguments={
+                "sensor_identifier": values.path["sensor_identifier"],
+                "resolution": resolution,
+                "start_timestamp": boundary,
+                "end_timestamp": end,
+            },
+        )
+        elements += await request.state.dbpool.fetch(query, *arguments)
+    keys = ["bucket_timestamp", "minimum", "maximum", "average", "count"]
+    attributes = {}
+    if values.query["layout"] == "columns":
+        for element in elements:
+            columns = attributes.setdefault(element["attribute"], {k: [] for k in keys})
+            for key in keys:
+                columns[key].append(element[key])
+    else:
+        for element in elements:
+            attributes.setdefault(element["attribute"], []).append(
+                {key: element[key] for key in keys}
+            )
     # Return successful response
-    return starlette.responses.JSONResponse(
+    return utils.JSONResponse(
         status_code=200,
-        content=database.dictify(
-            elements if values.query["direction"] == "next" else reversed(elements)
-        ),
+        content={"resolution": _RESOLUTIONS[resolution], "attributes": attributes},
+    )
+
+
+def _encode_ndjson(elements):
+    """Encode measurements as one JSON object per line."""
+    return "".join(json.dumps(dict(element)) + "\n" for element in elements)
+
+
+def _encode_csv(elements):
+    """Encode measurements as CSV with one line per attribute."""
+    output = io.StringIO()
+    csv.writer(output).writerows(
+        (
+            element["sensor_identifier"],
+            element["revision"],
+            element["creation_timestamp"],
+            attribute,
+            value,
+        )
+        for element in elements
+        for attribute, value in element["value"].items()
+    )
+    return output.getvalue()
+
+
+# Exports hold their connection for as long as the client reads. They use their own
+# connections so that slow downloads can't starve the pool that ingest and the other
+# routes share, and their number is bounded to stay clear of the server's limit.
+_exports = asyncio.Semaphore(4)
+
+
+async def _stream_measurements(sensor_identifiers, values):
+    """Stream the measurements of the sensors in chunks from server-side cursors."""
+    encode = _encode_csv if values.query["format"] == "csv" else _encode_ndjson
+    # Read all sensors from the same snapshot of the database
+    async with (
+        _exports,
+        database.connection() as connection,
+        connection.transaction(isolation="repeatable_read", readonly=True),
+    ):
+        if values.query["format"] == "csv":
+            output = io.StringIO()
+            csv.writer(output).writerow([
+                "sensor_identifier",
+                "revision",
+                "creation_timestamp",
+                "attribute",
+                "value",
+            ])
+            yield output.getvalue()
+        for sensor_identifier in sensor_identifiers:
+            query, arguments = database.parametrize(
+                identifier="export-measurements",
+                arguments={
+                    "sensor_identifier": sensor_identifier,
+                    "start_timestamp": values.query["start"],
+                    "end_timestamp": values.query["end"],
+                },
+            )
+            cursor = await connection.cursor(query, *arguments)
+            while True:
+                elements = await cursor.fetch(1024)
+                if len(elements) == 0:
+                    break
+                yield encode(elements)
+
+
+def _export_measurements(sensor_identifiers, values):
+    """Return a streaming response of the measurements in the requested format."""
+    media_type, extension = {
+        "ndjson": ("application/x-ndjson", "ndjson"),
+        "csv": ("text/csv", "csv"),
+    }[values.query["format"]]
+    return starlette.responses.StreamingResponse(
+        content=_stream_measurements(sensor_identifiers, values),
+        status_code=200,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="measurements.{extension}"'
+        },
     )
 
 
+@validation.validate(schema=validation.ExportNetworkMeasurementsRequest)
+async def export_network_measurements(request, values):
+    query, arguments = database.parametrize(
+        identifier="read-network-sensors",
+        arguments={"network_identifier": values.path["network_identifier"]},
+    )
+    elements = await request.state.dbpool.fetch(query, *arguments)
+    if len(elements) == 0:
+        logger.warning(f"{request.method} {request.url.path} -- Network not found")
+        raise errors.NotFoundError
+    sensor_identifiers = [
+        element["sensor_identifier"]
+        for element in elements
+        if element["sensor_identifier"] is not None
+    ]
+    return _export_measurements(sensor_identifiers, values)
+
+
+@validation.validate(schema=validation.ExportMeasurementsRequest)
+async def export_measurements(request, values):
+    query, arguments = database.parametrize(
+        identifier="read-sensors",
+        arguments={"network_identifier": values.path["network_identifier"]},
+    )
+    elements = await request.state.dbpool.fetch(query, *arguments)
+    if values.path["sensor_identifier"] not in [
+        element["sensor_identifier"] for element in elements
+    ]:
+        raise errors.NotFoundError
+    return _export_measurements([values.path["sensor_identifier"]], values)
+
+
 @validation.validate(schema=validation.ReadLogsRequest)
 async def read_logs(request, values):
     query, arguments = database.parametrize(
-        identifier="read-logs",
+        identifier=f"read-logs-{values.query['direction']}",
         arguments={
             "sensor_identifier": values.path["sensor_identifier"],
             "creation_timestamp": values.query["creation_timestamp"],
-            "direction": values.query["direction"],
+            "start_timestamp": values.query["start"],
+            "end_timestamp": values.query["end"],
+            "limit": values.query["limit"],
+            "severity": values.query["severity"],
         },
     )
     elements = await request.state.dbpool.fetch(query, *arguments)
-    elements = database.dictify(
-        elements if values.query["direction"] == "next" else reversed(elements)
-    )
-    elements = [
-        {
-            "severity": element["severity"],
-            "revision": element["revision"],
-            "creation_timestamp": element["creation_timestamp"],
-            "subject": element["message"],
-            "details": "",
-        }
-        for element in elements
-    ]
     # Return successful response
-    return starlette.responses.JSONResponse(
+    return utils.JSONResponse(
         status_code=200,
-        content=elements,
+        content=elements if values.query["direction"] == "next" else elements[::-1],
     )
 
 
@@ -411,21 +698,22 @@ async def read_logs_aggregates(request, values):
         arguments={"sensor_identifier": values.path["sensor_identifier"]},
     )
     elements = await request.state.dbpool.fetch(query, *arguments)
-    elements = database.dictify(elements)
-    elements = [
-        {
-            "severity": element["severity"],
-            "min_revision": element["min_revision"],
-            "max_revision": element["max_revision"],
-            "min_creation_timestamp": element["min_creation_timestamp"],
-            "max_creation_timestamp": element["max_creation_timestamp"],
-            "subject": element["message"],
-            "count": element["count"],
-        }
-        for element in elements
-    ]
     # Return successful response
-    return starlette.responses.JSONResponse(
+    return utils.JSONResponse(
+        status_code=200,
+        content=elements,
+    )
+
+
+@validation.validate(schema=validation.ReadNetworkLogsAggregatesRequest)
+async def read_network_logs_aggregates(request, values):
+    query, arguments = database.parametrize(
+        identifier="aggregate-network-logs",
+        arguments={"network_identifier": values.path["network_identifier"]},
+    )
+    elements = await request.state.dbpool.fetch(query, *arguments)
+    # Return successful response
+    return utils.JSONResponse(
         status_code=200,
         content=elements,
     )
@@ -468,6 +756,16 @@ ROUTES = [
         endpoint=read_sensors,
         methods=["GET"],
     ),
+    starlette.routing.Route(
+        path="/networks/{network_identifier}/latest",
+        endpoint=read_latest,
+        methods=["GET"],
+    ),
+    starlette.routing.Route(
+        path="/networks/{network_identifier}/health",
+        endpoint=read_health,
+        methods=["GET"],
+    ),
     starlette.routing.Route(
         path="/networks/{network_identifier}/sensors/{sensor_identifier}",
         endpoint=update_sensor,
@@ -488,6 +786,21 @@ ROUTES = [
         endpoint=read_measurements,
         methods=["GET"],
     ),
+    starlette.routing.Route(
+        path="/networks/{network_identifier}/sensors/{sensor_identifier}/measurements/aggregates",
+        endpoint=read_measurements_aggregates,
+        methods=["GET"],
+    ),
+    starlette.routing.Route(
+        path="/networks/{network_identifier}/sensors/{sensor_identifier}/measurements/export",
+        endpoint=export_measurements,
+        methods=["GET"],
+    ),
+    starlette.routing.Route(
+        path="/networks/{network_identifier}/measurements/export",
+        endpoint=export_network_measurements,
+        methods=["GET"],
+    ),
     starlette.routing.Route(
         path="/networks/{network_identifier}/sensors/{sensor_identifier}/logs",
         endpoint=read_logs,
@@ -498,19 +811,40 @@ ROUTES = [
         endpoint=read_logs_aggregates,
         methods=["GET"],
     ),
+    starlette.routing.Route(
+        path="/networks/{network_identifier}/logs/aggregates",
+        endpoint=read_network_logs_aggregates,
+        methods=["GET"],
+    ),
     # fmt: on
 ]
 
 
 @contextlib.asynccontextmanager
 async def lifespan(app):
-    """Manage the lifetime of the database client and the MQTT client."""
-    async with database.pool() as dbpool, mqtt.client() as mqttc:
+    """Manage the lifetime of the database client, the MQTT client and the registry."""
+    async with (
+        database.pool() as dbpool,
+        mqtt.client() as mqttc,
+        mqtt.Registry(dbpool) as registry,
+    ):
+        # Configure the retention of raw measurements
+        query, arguments = database.parametrize(
+            identifier="update-measurement-retention",
+            arguments={"drop_after": settings.MEASUREMENT_RETENTION},
+        )
+        await dbpool.execute(query, *arguments)
+        # Configure the expiry of sessions
+        query, arguments = database.parametrize(
+            identifier="update-session-lifetime",
+            arguments={"session_lifetime": settings.SESSION_LIFETIME},
+        )
+        await dbpool.execute(query, *arguments)
         # Start MQTT listener in (unawaited) asyncio task
         loop = asyncio.get_event_loop()
-        task = loop.create_task(mqtt.listen(mqttc, dbpool))
+        task = loop.create_task(mqtt.listen(mqttc, dbpool, registry))
         # Yield clients to application state
-        yield {"dbpool": dbpool, "mqttc": mqttc}
+        yield {"dbpool": dbpool, "mqttc": mqttc, "registry": registry}
         # Wait for the MQTT listener task to be cancelled when the app exits
         task.cancel()
         try:
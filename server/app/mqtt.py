@@ -1,8 +1,11 @@
 import asyncio
+import collections
 import contextlib
 import json
 import logging
+import re
 import ssl
+import time
 
 import aiomqtt
 import asyncpg
@@ -11,6 +14,7 @@ import pydantic
 import app.database as database
 import app.settings as settings
 import app.validation as validation
+import app.validation.constants as constants
 
 
 def _encode_payload(payload):
@@ -96,85 +100,548 @@ async def publish_configuration(
     task.add_done_callback(task_references.remove)
 
 
-async def _process_acknowledgments(sensor_identifier, payload, dbpool):
+# Column order of the rows for each kind of message; The first column is always the
+# sensor identifier. Measurements and logs are copied into their tables as is; The
+# database sets their receipt timestamp.
+ACKNOWLEDGMENT_COLUMNS = (
+    "sensor_identifier",
+    "revision",
+    "acknowledgment_timestamp",
+    "success",
+)
+MEASUREMENT_COLUMNS = (
+    "sensor_identifier",
+    "attribute_identifier",
+    "value",
+    "revision",
+    "creation_timestamp",
+)
+# Well-known measurement families of the edge nodes; With the wide storage mode, each
+# sample of a family is stored as a single row in the family's table. The tables and
+# their aggregates in measurements.sql are generated from these by scripts/generate.
+FAMILIES = {
+    "measurement_co2": (
+        "gmp343_raw",
+        "gmp343_compensated",
+        "gmp343_filtered",
+        "gmp343_temperature",
+        "bme280_temperature",
+        "bme280_humidity",
+        "bme280_pressure",
+        "sht45_temperature",
+        "sht45_humidity",
+    ),
+    "measurement_calibration": (
+        "cal_bottle_id",
+        "cal_gmp343_raw",
+        "cal_gmp343_compensated",
+        "cal_gmp343_filtered",
+        "cal_gmp343_temperature",
+        "cal_bme280_temperature",
+        "cal_bme280_humidity",
+        "cal_bme280_pressure",
+        "cal_sht45_temperature",
+        "cal_sht45_humidity",
+    ),
+    "measurement_system": (
+        "enclosure_bme280_temperature",
+        "enclosure_bme280_humidity",
+        "enclosure_bme280_pressure",
+        "raspi_cpu_temperature",
+        "raspi_disk_usage",
+        "raspi_cpu_usage",
+        "raspi_memory_usage",
+        "ups_powered_by_grid",
+        "ups_battery_is_fully_charged",
+        "ups_battery_error_detected",
+        "ups_battery_above_voltage_threshold",
+    ),
+    "measurement_wind": (
+        "wxt532_direction_min",
+        "wxt532_direction_avg",
+        "wxt532_direction_max",
+        "wxt532_speed_min",
+        "wxt532_speed_avg",
+        "wxt532_speed_max",
+        "wxt532_last_update_time",
+    ),
+    "measurement_wind_sensor": (
+        "wxt532_temperature",
+        "wxt532_heating_voltage",
+        "wxt532_supply_voltage",
+        "wxt532_reference_voltage",
+        "wxt532_last_update_time",
+    ),
+}
+SAMPLE_COLUMNS = {
+    "measurement": MEASUREMENT_COLUMNS,
+    **{
+        table: ("sensor_identifier", "revision", "creation_timestamp", *attributes)
+        for table, attributes in FAMILIES.items()
+    },
+}
+LOG_COLUMNS = (
+    "sensor_identifier",
+    "severity",
+    "message",
+    "revision",
+    "creation_timestamp",
+)
+
+
+def _decode_acknowledgments(sensor_identifier, payload):
+    """Validate an acknowledgments payload and flatten it into database rows."""
+    return [
+        (sensor_identifier, x["revision"], x["timestamp"], x["success"])
+        for x in validation.AcknowledgmentsDictValidator.validate_json(payload)
+    ]
+
+
+def _decode_measurements(sensor_identifier, payload):
+    """Validate a measurements payload and flatten it into database rows."""
+    return [
+        (sensor_identifier, attribute, value, x.get("revision"), x["timestamp"])
+        for x in validation.MeasurementsDictValidator.validate_json(payload)
+        for attribute, value in x["value"].items()
+    ]
+
+
+_FAMILIES = [
+    (table, frozenset(attributes), attributes) for table, attributes in FAMILIES.items()
+]
+
+
+def _decode_samples(sensor_identifier, payload):
+    """Validate a measurements payload into rows for the wide storage mode.
+
+    Samples of a known family become a single row; Samples with other attributes
+    become one row per attribute for the generic table. Rows are prefixed with the
+    sensor identifier and the name of their table.
+    """
+    rows = []
+    for x in validation.MeasurementsDictValidator.validate_json(payload):
+        value, revision, timestamp = x["value"], x.get("revision"), x["timestamp"]
+        for table, keys, attributes in _FAMILIES:
+            if value and value.keys() <= keys:
+                rows.append((
+                    sensor_identifier,
+                    table,
+                    revision,
+                    timestamp,
+                    *[value.get(attribute) for attribute in attributes],
+                ))
+                break
+        else:
+            rows.extend(
+                (sensor_identifier, "measurement", attribute, v, revision, timestamp)
+                for attribute, v in value.items()
+            )
+    return rows
+
+
+def _decode_logs(sensor_identifier, payload):
+    """Validate a logs payload and flatten it into database rows."""
+    return [
+        (
+            sensor_identifier,
+            x["severity"],
+            x["message"],
+            x.get("revision"),
+            x["timestamp"],
+        )
+        for x in validation.LogsDictValidator.validate_json(payload)
+    ]
+
+
+def _newest(rows, index):
+    """Return each sensor's row with the newest timestamp at the given index."""
+    newest = {}
+    for row in rows:
+        if row[0] not in newest or row[index] >= newest[row[0]][index]:
+            newest[row[0]] = row
+    # Sort by sensor so that concurrent writers lock the latest rows in the same order
+    return [newest[x] for x in sorted(newest)]
+
+
+def _latest_measurements(rows):
+    """Return each sensor's newest value per attribute from rows of single values."""
+    latest = {}
+    for sensor_identifier, attribute, value, revision, timestamp in rows:
+        attributes = latest.setdefault(sensor_identifier, {})
+        if (
+            attribute not in attributes
+            or timestamp >= attributes[attribute]["creation_timestamp"]
+        ):
+            attributes[attribute] = {
+                "value": value,
+                "revision": revision,
+                "creation_timestamp": timestamp,
+            }
+    return [{"sensor_identifier": x, "measurements": latest[x]} for x in sorted(latest)]
+
+
+async def _process_acknowledgments(rows, dbpool):
     query, arguments = database.parametrize(
         identifier="update-configuration-on-acknowledgment",
-        arguments=[
-            {
-                "sensor_identifier": sensor_identifier,
-                "revision": element.revision,
-                "acknowledgment_timestamp": element.timestamp,
-                "success": element.success,
-            }
-            for element in payload
-        ],
+        arguments=[dict(zip(ACKNOWLEDGMENT_COLUMNS, row)) for row in rows],
     )
-    try:
-        await dbpool.executemany(query, arguments)
-    except asyncpg.ForeignKeyViolationError:
-        logger.warning(f"Failed to process; Sensor not found: {sensor_identifier}")
+    latest_query, latest_arguments = database.parametrize(
+        identifier="update-latest-acknowledgment",
+        arguments=[dict(zip(ACKNOWLEDGMENT_COLUMNS, row)) for row in _newest(rows, 2)],
+    )
+    async with dbpool.acquire() as connection, connection.transaction():
+        await connection.executemany(query, arguments)
+        await connection.executemany(latest_query, latest_arguments)
+
+
+class Dictionary:
+    """In-memory cache of the integer codes that represent attribute names.
+
+    Codes never change once they are assigned, so the cache is never invalidated.
+    """
+
+    def __init__(self):
+        self.codes = {}
+
+    async def encode(self, rows, dbpool):
+        """Replace the attribute name in the second element of each row by its code."""
+        names = {row[1] for row in rows} - self.codes.keys()
+        # Names that were added concurrently by another worker or server instance are
+        # not returned by the query; These are picked up in the next iteration
+        while len(names) > 0:
+            query, arguments = database.parametrize(
+                identifier="create-attributes",
+                arguments={"attribute_names": list(names)},
+            )
+            for element in await dbpool.fetch(query, *arguments):
+                self.codes[element["attribute_name"]] = element["attribute_identifier"]
+            names -= self.codes.keys()
+        return [(row[0], self.codes[row[1]], *row[2:]) for row in rows]
+
+
+dictionary = Dictionary()
 
 
-async def _process_measurements(sensor_identifier, payload, dbpool):
+async def _process_measurements(rows, dbpool):
+    records = await dictionary.encode(rows, dbpool)
     query, arguments = database.parametrize(
-        identifier="create-measurement",
-        arguments=[
-            {
-                "sensor_identifier": sensor_identifier,
-                "attribute": attribute,
-                "value": value,
-                "revision": element.revision,
-                "creation_timestamp": element.timestamp,
-            }
-            for element in payload
-            for attribute, value in element.value.items()
-        ],
+        identifier="update-latest-measurements", arguments=_latest_measurements(rows)
     )
-    try:
-        await dbpool.executemany(query, arguments)
-    except asyncpg.ForeignKeyViolationError:
-        logger.warning(f"Failed to process; Sensor not found: {sensor_identifier}")
+    # Update the latest values in the same transaction so that retries don't
+    # duplicate rows
+    async with dbpool.acquire() as connection, connection.transaction():
+        await connection.copy_records_to_table(
+            table_name="measurement", records=records, columns=MEASUREMENT_COLUMNS
+        )
+        await connection.executemany(query, arguments)
 
 
-async def _process_logs(sensor_identifier, payload, dbpool):
+async def _process_samples(rows, dbpool):
+    tables = {}
+    values = []  # Rows of single values, in the same format as for the generic table
+    for row in rows:
+        tables.setdefault(row[1], []).append((row[0], *row[2:]))
+        if row[1] == "measurement":
+            values.append((row[0], *row[2:]))
+        else:
+            values.extend(
+                (row[0], attribute, value, row[2], row[3])
+                for attribute, value in zip(FAMILIES[row[1]], row[4:])
+                if value is not None
+            )
+    if "measurement" in tables:
+        tables["measurement"] = await dictionary.encode(tables["measurement"], dbpool)
     query, arguments = database.parametrize(
-        identifier="create-log",
-        arguments=[
-            {
-                "sensor_identifier": sensor_identifier,
-                "message": element.message,
-                "revision": element.revision,
-                "creation_timestamp": element.timestamp,
-                "severity": element.severity,
-            }
-            for element in payload
-        ],
+        identifier="update-latest-measurements", arguments=_latest_measurements(values)
     )
-    try:
-        await dbpool.executemany(query, arguments)
-    except asyncpg.ForeignKeyViolationError:
-        logger.warning(f"Failed to process; Sensor not found: {sensor_identifier}")
+    # Write all tables in one transaction so that retries don't duplicate rows
+    async with dbpool.acquire() as connection, connection.transaction():
+        for table, records in tables.items():
+            await connection.copy_records_to_table(
+                table_name=table, records=records, columns=SAMPLE_COLUMNS[table]
+            )
+        await connection.executemany(query, arguments)
+
+
+async def _process_logs(rows, dbpool):
+    query, arguments = database.parametrize(
+        identifier="update-latest-log",
+        arguments=[dict(zip(LOG_COLUMNS, row)) for row in _newest(rows, 4)],
+    )
+    async with dbpool.acquire() as connection, connection.transaction():
+        await connection.copy_records_to_table(
+            table_name="log", records=rows, columns=LOG_COLUMNS
+        )
+        await connection.executemany(query, arguments)
 
 
 SUBSCRIPTIONS = {
-    "acknowledgments/+": (
-        _process_acknowledgments,
-        validation.AcknowledgmentsValidator,
-    ),
+    "acknowledgments/+": (_decode_acknowledgments, _process_acknowledgments),
     "measurements/+": (
-        _process_measurements,
-        validation.MeasurementsValidator,
-    ),
-    "logs/+": (
-        _process_logs,
-        validation.LogsValidator,
+        (_decode_samples, _process_samples)
+        if settings.MEASUREMENT_STORAGE == "wide"
+        else (_decode_measurements, _process_measurements)
     ),
+    "logs/+": (_decode_logs, _process_logs),
 }
 
 
-async def listen(mqttc, dbpool):
+async def _write(process, rows, dbpool):
+    """Write rows in bulk; Isolate sensors that don't exist if the write fails."""
+    try:
+        await process(rows, dbpool)
+    except asyncpg.ForeignKeyViolationError:
+        # A single unknown sensor fails the whole batch. Retry sensor by sensor so that
+        # the rows of all other sensors are still written.
+        groups = {}
+        for row in rows:
+            groups.setdefault(row[0], []).append(row)
+        for sensor_identifier, group in groups.items():
+            try:
+                await process(group, dbpool)
+            except asyncpg.ForeignKeyViolationError:
+                logger.warning(
+                    f"Failed to process; Sensor not found: {sensor_identifier}"
+                )
+
+
+class Buffer:
+    """Collect rows from many messages and sensors and write them in bulk.
+
+    The buffer is flushed when it holds `size` rows or when its oldest row has waited
+    for `latency` seconds, whichever comes first. Flushes are serialized, so rows are
+    written in the order they were received.
+    """
+
+    def __init__(
+        self,
+        dbpool,
+        size=settings.INGEST_BUFFER_SIZE,
+        latency=settings.INGEST_BUFFER_LATENCY,
+    ):
+        self.dbpool = dbpool
+        self.size = size
+        self.latency = latency
+        self.rows = {process: [] for _, process in SUBSCRIPTIONS.values()}
+        self.count = 0
+        self.lock = asyncio.Lock()
+        self.filled = asyncio.Event()  # Set while the buffer contains rows
+
+    async def put(self, process, rows):
+        """Add rows to the buffer and flush right away if the buffer is full."""
+        self.rows[process].extend(rows)
+        self.count += len(rows)
+        self.filled.set()
+        if self.count >= self.size:
+            await self.flush()
+
+    async def flush(self):
+        """Write all buffered rows to the database."""
+        async with self.lock:
+            rows = self.rows
+            self.rows = {process: [] for process in rows.keys()}
+            self.count = 0
+            self.filled.clear()
+            for process, elements in rows.items():
+                if len(elements) == 0:
+                    continue
+                try:
+                    await _write(process, elements, self.dbpool)
+                # Errors are logged and ignored as we can't give feedback
+                except Exception as e:  # pragma: no cover
+                    logger.error(e, exc_info=True)
+
+    async def _run(self):
+        """Flush the buffer at the latest `latency` seconds after it was filled."""
+        while True:
+            await self.filled.wait()
+            await asyncio.sleep(self.latency)
+            # Shield the flush so that cancellation doesn't lose rows mid-write
+            await asyncio.shield(self.flush())
+
+    async def __aenter__(self):
+        self.task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(self, *args):
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        # Write the remaining rows before the database pool is closed
+        await self.flush()
+
+
+class Deduplicator:
+    """Drop rows that were already received within a time window.
+
+    Sensors publish with QoS 1 and resend unacknowledged messages after a restart,
+    so the same rows can arrive more than once. The deduplicator remembers each row,
+    which covers the sensor identifier, the creation timestamp and the values, for
+    `window` seconds, but never more than `size` rows at once. The rows themselves
+    are the keys, so that distinct rows with equal hashes are both kept.
+    """
+
+    def __init__(
+        self,
+        window=settings.INGEST_DEDUPLICATION_WINDOW,
+        size=settings.INGEST_DEDUPLICATION_SIZE,
+    ):
+        self.window = window
+        self.size = size
+        self.rows = collections.OrderedDict()  # Row -> time of receipt
+        self.suppressed = 0
+
+    def filter(self, rows):
+        """Return the rows that weren't seen before and remember them."""
+        now = time.monotonic()
+        # Forget the rows that are older than the window
+        threshold = now - self.window
+        while len(self.rows) > 0 and next(iter(self.rows.values())) < threshold:
+            self.rows.popitem(last=False)
+        elements = []
+        for row in rows:
+            if row in self.rows:
+                continue
+            self.rows[row] = now
+            elements.append(row)
+        # Forget the oldest rows if the cache is full
+        while len(self.rows) > self.size:
+            self.rows.popitem(last=False)
+        self.suppressed += len(rows) - len(elements)
+        return elements
+
+
+class Registry:
+    """In-memory set of the identifiers of all existing sensors.
+
+    The listener uses the registry to drop messages of unknown sensors without a
+    round trip to the database. Sensors created through the API are added right
+    away; The registry is reloaded periodically to pick up other changes.
+    """
+
+    def __init__(self, dbpool, interval=settings.SENSOR_REGISTRY_INTERVAL):
+        self.dbpool = dbpool
+        self.interval = interval
+        self.identifiers = set()
+        self.additions = set()  # Sensors added while the registry is reloading
+
+    def __contains__(self, sensor_identifier):
+        return sensor_identifier in self.identifiers
+
+    def add(self, sensor_identifier):
+        """Register a newly created sensor."""
+        self.identifiers.add(sensor_identifier)
+        self.additions.add(sensor_identifier)
+
+    async def refresh(self):
+        """Reload the sensor identifiers from the database."""
+        self.additions = set()
+        query, arguments = database.parametrize(
+            identifier="read-sensor-identifiers", arguments={}
+        )
+        elements = await self.dbpool.fetch(query, *arguments)
+        self.identifiers = {
+            element["sensor_identifier"] for element in elements
+        } | self.additions
+        logger.debug(f"Loaded {len(self.identifiers)} sensors into the registry")
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.refresh()
+            except Exception as e:  # pragma: no cover
+                logger.error(e, exc_info=True)
+
+    async def __aenter__(self):
+        await self.refresh()
+        self.task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(self, *args):
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+
+
+class Dispatcher:
+    """Distribute messages over a pool of workers, sharded by sensor.
+
+    Each worker validates and buffers its messages one after the other, so that the
+    messages of a sensor are written in the order they were received, while the
+    workers write to the database concurrently. The workers' queues are bounded; When
+    a queue is full, the listener waits until there's space again.
+    """
+
+    def __init__(
+        self,
+        dbpool,
+        workers=settings.INGEST_WORKERS,
+        size=settings.INGEST_QUEUE_SIZE,
+    ):
+        self.queues = [asyncio.Queue(maxsize=size) for _ in range(workers)]
+        self.buffers = [Buffer(dbpool) for _ in range(workers)]
+        self.deduplicators = [Deduplicator() for _ in range(workers)]
+
+    @property
+    def suppressed(self):
+        """Return the number of duplicate rows that were dropped so far."""
+        return sum(deduplicator.suppressed for deduplicator in self.deduplicators)
+
+    async def put(self, sensor_identifier, decode, process, payload):
+        """Queue a message with the worker that is responsible for the sensor."""
+        queue = self.queues[hash(sensor_identifier) % len(self.queues)]
+        await queue.put((sensor_identifier, decode, process, payload))
+
+    async def _work(self, queue, buffer, deduplicator):
+        while True:
+            sensor_identifier, decode, process, payload = await queue.get()
+            try:
+                rows = decode(sensor_identifier, payload)
+                elements = deduplicator.filter(rows)
+                if len(elements) < len(rows):
+                    logger.debug(
+                        f"Dropped {len(rows) - len(elements)} duplicate rows from"
+                        f" sensor {sensor_identifier}; {self.suppressed} in total"
+                    )
+                await buffer.put(process, elements)
+            # Errors are logged and ignored as we can't give feedback
+            except pydantic.ValidationError:
+                logger.warning(f"Malformed message: {payload!r}")
+            except Exception as e:  # pragma: no cover
+                logger.error(e, exc_info=True)
+            finally:
+                queue.task_done()
+
+    async def __aenter__(self):
+        async with contextlib.AsyncExitStack() as stack:
+            for buffer in self.buffers:
+                await stack.enter_async_context(buffer)
+            self.stack = stack.pop_all()
+        self.tasks = [
+            asyncio.create_task(self._work(*x))
+            for x in zip(self.queues, self.buffers, self.deduplicators)
+        ]
+        return self
+
+    async def __aexit__(self, *args):
+        # Process the messages that are still queued before stopping the workers
+        for queue in self.queues:
+            await queue.join()
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        # Flush the buffers
+        await self.stack.aclose()
+
+
+async def listen(mqttc, dbpool, registry):
     """Listen to and handle incoming MQTT messages from sensors."""
-    async with mqttc.messages() as messages:
+    async with Dispatcher(dbpool) as dispatcher, mqttc.messages() as messages:
         # ensure base topic ends with a trailing slash
         if len(settings.MQTT_BASE_TOPIC) > 0 and settings.MQTT_BASE_TOPIC[-1] != "/":
             settings.MQTT_BASE_TOPIC += "/"
@@ -191,19 +658,20 @@ async def listen(mqttc, dbpool):
                     f"Received message: {message.payload!r} on topic: {message.topic}"
                 )
             # Get sensor identifier from the topic
-            # TODO validate that identifier is a valid UUID format
             sensor_identifier = str(message.topic).split("/")[-1]
-            # Call the appropriate processor; First match wins
-            for wildcard, (process, validator) in SUBSCRIPTIONS.items():
+            # Malformed identifiers would fail the whole batch they're written with
+            if re.match(constants.Pattern.IDENTIFIER.value, sensor_identifier) is None:
+                logger.warning(f"Malformed sensor identifier: {message.topic}")
+                continue
+            if sensor_identifier not in registry:
+                logger.warning(f"Failed to process; Sensor not found: {message.topic}")
+                continue
+            # Queue the message for the appropriate processor; First match wins
+            for wildcard, (decode, process) in SUBSCRIPTIONS.items():
                 if message.topic.matches(settings.MQTT_BASE_TOPIC + wildcard):
-                    try:
-                        payload = validator.validate_json(message.payload)
-                        await process(sensor_identifier, payload, dbpool)
-                    # Errors are logged and ignored as we can't give feedback
-                    except pydantic.ValidationError:
-                        logger.warning(f"Malformed message: {message.payload!r}")
-                    except Exception as e:  # pragma: no cover
-                        logger.error(e, exc_info=True)
+                    await dispatcher.put(
+                        sensor_identifier, decode, process, message.payload
+                    )
                     break
             else:  # Executed if no break is called
                 logger.warning(f"Failed to match topic: {message.topic}")
@@ -5,27 +5,132 @@ SELECT
         jsonb_build_object('bucket_timestamp', bucket_timestamp, 'average', average)
         ORDER BY bucket_timestamp ASC
     ) AS values
-FROM measurement_aggregation_1_hour
+FROM measurement_bucket_1_hour
 WHERE
     sensor_identifier = ${sensor_identifier}
     AND bucket_timestamp > now() - INTERVAL '4 weeks'
 GROUP BY attribute;
 
 
--- name: aggregate-logs
+-- name: read-measurements-aggregates-1-minute
+-- The resolution is chosen by the server, which reads the view of this resolution.
+-- The aggregates are only materialized up to an hour or more ago, so the buckets after
+-- the newest one are aggregated from the raw measurements afterwards.
 SELECT
-    severity,
-    message,
-    first(revision, creation_timestamp) AS min_revision,
-    last(revision, creation_timestamp) AS max_revision,
-    min(creation_timestamp) AS min_creation_timestamp,
-    max(creation_timestamp) AS max_creation_timestamp,
-    count(*) AS count
-FROM log
+    attribute,
+    bucket_timestamp,
+    minimum,
+    maximum,
+    average,
+    count
+FROM measurement_bucket_1_minute
+WHERE
+    sensor_identifier = ${sensor_identifier}
+    AND bucket_timestamp >= ${start_timestamp}
+    AND bucket_timestamp < ${end_timestamp}
+ORDER BY attribute ASC, bucket_timestamp ASC;
+
+
+-- name: read-measurements-aggregates-10-minutes
+SELECT
+    attribute,
+    bucket_timestamp,
+    minimum,
+    maximum,
+    average,
+    count
+FROM measurement_bucket_10_minutes
+WHERE
+    sensor_identifier = ${sensor_identifier}
+    AND bucket_timestamp >= ${start_timestamp}
+    AND bucket_timestamp < ${end_timestamp}
+ORDER BY attribute ASC, bucket_timestamp ASC;
+
+
+-- name: read-measurements-aggregates-1-hour
+SELECT
+    attribute,
+    bucket_timestamp,
+    minimum,
+    maximum,
+    average,
+    count
+FROM measurement_bucket_1_hour
+WHERE
+    sensor_identifier = ${sensor_identifier}
+    AND bucket_timestamp >= ${start_timestamp}
+    AND bucket_timestamp < ${end_timestamp}
+ORDER BY attribute ASC, bucket_timestamp ASC;
+
+
+-- name: read-measurements-aggregates-1-day
+SELECT
+    attribute,
+    bucket_timestamp,
+    minimum,
+    maximum,
+    average,
+    count
+FROM measurement_bucket_1_day
 WHERE
     sensor_identifier = ${sensor_identifier}
-    AND severity = any(ARRAY['warning', 'error'])
-GROUP BY sensor_identifier, severity, message
+    AND bucket_timestamp >= ${start_timestamp}
+    AND bucket_timestamp < ${end_timestamp}
+ORDER BY attribute ASC, bucket_timestamp ASC;
+
+
+-- name: read-measurements-aggregates-tail
+-- Aggregates the buckets that are not materialized yet, which touches only the sensor's
+-- most recent chunks. Buckets that begin before the start are only partially covered.
+SELECT *
+FROM (
+    SELECT
+        attribute,
+        time_bucket(${resolution}::TEXT::INTERVAL, creation_timestamp) AS bucket_timestamp,
+        min(value) AS minimum,
+        max(value) AS maximum,
+        avg(value) AS average,
+        count(*) AS count
+    FROM measurement_value
+    WHERE
+        sensor_identifier = ${sensor_identifier}
+        AND creation_timestamp >= ${start_timestamp}
+        AND creation_timestamp < ${end_timestamp}
+    GROUP BY attribute, 2
+) AS tail
+WHERE bucket_timestamp >= ${start_timestamp}
+ORDER BY attribute ASC, bucket_timestamp ASC;
+
+
+-- name: aggregate-logs
+SELECT
+    severity,
+    message AS subject,
+    first(min_revision, min_creation_timestamp) AS min_revision,
+    last(max_revision, max_creation_timestamp) AS max_revision,
+    min(min_creation_timestamp) AS min_creation_timestamp,
+    max(max_creation_timestamp) AS max_creation_timestamp,
+    sum(count)::BIGINT AS count
+FROM log_aggregation
+WHERE sensor_identifier = ${sensor_identifier}
+GROUP BY severity, message
+ORDER BY max_creation_timestamp ASC;
+
+
+-- name: aggregate-network-logs
+SELECT
+    log_aggregation.sensor_identifier,
+    severity,
+    message AS subject,
+    first(min_revision, min_creation_timestamp) AS min_revision,
+    last(max_revision, max_creation_timestamp) AS max_revision,
+    min(min_creation_timestamp) AS min_creation_timestamp,
+    max(max_creation_timestamp) AS max_creation_timestamp,
+    sum(count)::BIGINT AS count
+FROM log_aggregation
+JOIN sensor ON sensor.identifier = log_aggregation.sensor_identifier
+WHERE sensor.network_identifier = ${network_identifier}
+GROUP BY log_aggregation.sensor_identifier, severity, message
 ORDER BY max_creation_timestamp ASC;
 
 
@@ -37,6 +142,71 @@ FROM sensor
 WHERE sensor.network_identifier = ${network_identifier};
 
 
+-- name: read-network-sensors
+-- Return no elements if the network doesn't exist and NULL if it has no sensors
+SELECT sensor.identifier AS sensor_identifier
+FROM network
+LEFT JOIN sensor ON network.identifier = sensor.network_identifier
+WHERE network.identifier = ${network_identifier};
+
+
+-- name: read-latest
+SELECT
+    sensor.identifier AS sensor_identifier,
+    sensor.name AS sensor_name,
+    coalesce(sensor_latest.measurements, '{}') AS measurements,
+    sensor_latest.log_severity,
+    sensor_latest.log_message,
+    sensor_latest.log_revision,
+    sensor_latest.log_creation_timestamp,
+    sensor_latest.acknowledgment_revision,
+    sensor_latest.acknowledgment_timestamp,
+    sensor_latest.acknowledgment_success
+FROM sensor
+LEFT JOIN sensor_latest ON sensor.identifier = sensor_latest.sensor_identifier
+WHERE sensor.network_identifier = ${network_identifier};
+
+
+-- name: read-health
+SELECT
+    sensor.identifier AS sensor_identifier,
+    sensor.name AS sensor_name,
+    (
+        SELECT max((x.value ->> 'creation_timestamp')::DOUBLE PRECISION)
+        FROM jsonb_each(sensor_latest.measurements) AS x
+    ) AS measurement_timestamp,
+    sensor_latest.log_creation_timestamp AS log_timestamp
+FROM sensor
+LEFT JOIN sensor_latest ON sensor.identifier = sensor_latest.sensor_identifier
+WHERE sensor.network_identifier = ${network_identifier};
+
+
+-- name: read-sensor-identifiers
+SELECT identifier AS sensor_identifier
+FROM sensor;
+
+
+-- name: create-attributes
+-- Return the codes of the given attribute names, adding the ones that don't exist yet.
+-- Names that are added concurrently by another transaction can be missing.
+WITH inserted AS (
+    INSERT INTO attribute (name)
+    SELECT unnest(${attribute_names}::TEXT[])
+    ON CONFLICT (name) DO NOTHING
+    RETURNING identifier, name
+)
+SELECT
+    identifier AS attribute_identifier,
+    name AS attribute_name
+FROM inserted
+UNION ALL
+SELECT
+    identifier AS attribute_identifier,
+    name AS attribute_name
+FROM attribute
+WHERE name = any(${attribute_names}::TEXT[]);
+
+
 -- name: create-network
 INSERT INTO network (
     identifier,
@@ -73,44 +243,6 @@ VALUES (
 );
 
 
--- name: create-log
-INSERT INTO log (
-    sensor_identifier,
-    severity,
-    message,
-    revision,
-    creation_timestamp,
-    receipt_timestamp
-)
-VALUES (
-    ${sensor_identifier},
-    ${severity},
-    ${message},
-    ${revision},
-    ${creation_timestamp},
-    now()
-);
-
-
--- name: create-measurement
-INSERT INTO measurement (
-    sensor_identifier,
-    attribute,
-    value,
-    revision,
-    creation_timestamp,
-    receipt_timestamp
-)
-VALUES (
-    ${sensor_identifier},
-    ${attribute},
-    ${value},
-    ${revision},
-    ${creation_timestamp},
-    now()
-);
-
-
 -- name: create-sensor
 INSERT INTO sensor (
     identifier,
@@ -187,62 +319,137 @@ ORDER BY
 LIMIT 64;
 
 
--- name: read-measurements
--- Assemble data points that have the same timestamp and revision
--- back into measurements, then sort and paginate
+-- name: read-measurements-next
+-- Pages are read with one statement per direction so that the cursor is a plain range
+-- over the (sensor_identifier, creation_timestamp) index. The ordered scan stops after
+-- the first page and only touches the chunks it needs, also without a cursor.
 SELECT
     revision,
     creation_timestamp,
-    jsonb_object_agg(attribute, value) AS value
-FROM measurement
+    value
+FROM measurement_sample
 WHERE
     sensor_identifier = ${sensor_identifier}
-    AND CASE
-        WHEN ${creation_timestamp}::TIMESTAMPTZ IS NOT NULL
-            THEN (
-                CASE
-                    WHEN ${direction} = 'next'
-                        THEN creation_timestamp > ${creation_timestamp}
-                    WHEN ${direction} = 'previous'
-                        THEN creation_timestamp < ${creation_timestamp}
-                    ELSE TRUE
-                END
-            )
-        ELSE TRUE
-    END
-GROUP BY revision, creation_timestamp
-ORDER BY
-    CASE WHEN ${direction} = 'next' THEN creation_timestamp END ASC,
-    CASE WHEN ${direction} = 'previous' THEN creation_timestamp END DESC
-LIMIT 64;
+    AND creation_timestamp > coalesce(${creation_timestamp}::TIMESTAMPTZ, '-infinity')
+    AND creation_timestamp >= coalesce(${start_timestamp}::TIMESTAMPTZ, '-infinity')
+    AND creation_timestamp < coalesce(${end_timestamp}::TIMESTAMPTZ, 'infinity')
+ORDER BY creation_timestamp ASC
+LIMIT ${limit};
+
+
+-- name: read-measurements-previous
+SELECT
+    revision,
+    creation_timestamp,
+    value
+FROM measurement_sample
+WHERE
+    sensor_identifier = ${sensor_identifier}
+    AND creation_timestamp < coalesce(${creation_timestamp}::TIMESTAMPTZ, 'infinity')
+    AND creation_timestamp >= coalesce(${start_timestamp}::TIMESTAMPTZ, '-infinity')
+    AND creation_timestamp < coalesce(${end_timestamp}::TIMESTAMPTZ, 'infinity')
+ORDER BY creation_timestamp DESC
+LIMIT ${limit};
+
+
+-- name: read-measurements-attribute-next
+-- Samples with a given attribute are selected in the base tables before anything is
+-- grouped: by the attribute code in the generic storage mode and by the attribute's
+-- column being set in the wide storage mode. The conditions on the sensor and the time
+-- range are pushed down into both branches and use their indexes as above.
+SELECT
+    revision,
+    creation_timestamp,
+    jsonb_build_object(${attribute}::TEXT, value) AS value
+FROM (
+    SELECT sensor_identifier, revision, creation_timestamp, value
+    FROM measurement
+    WHERE attribute_identifier = (SELECT identifier FROM attribute WHERE name = ${attribute}::TEXT)
+    UNION ALL
+    SELECT sensor_identifier, revision, creation_timestamp, value
+    FROM measurement_family_value
+    WHERE attribute = ${attribute}::TEXT
+) AS sample
+WHERE
+    sensor_identifier = ${sensor_identifier}
+    AND creation_timestamp > coalesce(${creation_timestamp}::TIMESTAMPTZ, '-infinity')
+    AND creation_timestamp >= coalesce(${start_timestamp}::TIMESTAMPTZ, '-infinity')
+    AND creation_timestamp < coalesce(${end_timestamp}::TIMESTAMPTZ, 'infinity')
+ORDER BY creation_timestamp ASC
+LIMIT ${limit};
 
 
--- name: read-logs
+-- name: read-measurements-attribute-previous
+SELECT
+    revision,
+    creation_timestamp,
+    jsonb_build_object(${attribute}::TEXT, value) AS value
+FROM (
+    SELECT sensor_identifier, revision, creation_timestamp, value
+    FROM measurement
+    WHERE attribute_identifier = (SELECT identifier FROM attribute WHERE name = ${attribute}::TEXT)
+    UNION ALL
+    SELECT sensor_identifier, revision, creation_timestamp, value
+    FROM measurement_family_value
+    WHERE attribute = ${attribute}::TEXT
+) AS sample
+WHERE
+    sensor_identifier = ${sensor_identifier}
+    AND creation_timestamp < coalesce(${creation_timestamp}::TIMESTAMPTZ, 'infinity')
+    AND creation_timestamp >= coalesce(${start_timestamp}::TIMESTAMPTZ, '-infinity')
+    AND creation_timestamp < coalesce(${end_timestamp}::TIMESTAMPTZ, 'infinity')
+ORDER BY creation_timestamp DESC
+LIMIT ${limit};
+
+
+-- name: export-measurements
+SELECT
+    sensor_identifier,
+    revision,
+    creation_timestamp,
+    value
+FROM measurement_sample
+WHERE
+    sensor_identifier = ${sensor_identifier}
+    AND creation_timestamp >= ${start_timestamp}
+    AND creation_timestamp < ${end_timestamp}
+ORDER BY creation_timestamp ASC;
+
+
+-- name: read-logs-next
 SELECT
     severity,
-    message,
+    message AS subject,
+    '' AS details,
     revision,
     creation_timestamp
 FROM log
 WHERE
     sensor_identifier = ${sensor_identifier}
-    AND CASE
-        WHEN ${creation_timestamp}::TIMESTAMPTZ IS NOT NULL
-            THEN (
-                CASE
-                    WHEN ${direction} = 'next'
-                        THEN creation_timestamp > ${creation_timestamp}
-                    WHEN ${direction} = 'previous'
-                        THEN creation_timestamp < ${creation_timestamp}
-                    ELSE TRUE
-                END
-            )
-        ELSE TRUE
-    END
-ORDER BY
-    CASE WHEN ${direction} = 'next' THEN creation_timestamp END ASC,
-    CASE WHEN ${direction} = 'previous' THEN creation_timestamp END DESC
-LIMIT 64;
+    AND creation_timestamp > coalesce(${creation_timestamp}::TIMESTAMPTZ, '-infinity')
+    AND creation_timestamp >= coalesce(${start_timestamp}::TIMESTAMPTZ, '-infinity')
+    AND creation_timestamp < coalesce(${end_timestamp}::TIMESTAMPTZ, 'infinity')
+    AND (${severity}::TEXT IS NULL OR severity = ${severity}::TEXT)
+ORDER BY creation_timestamp ASC
+LIMIT ${limit};
+
+
+-- name: read-logs-previous
+SELECT
+    severity,
+    message AS subject,
+    '' AS details,
+    revision,
+    creation_timestamp
+FROM log
+WHERE
+    sensor_identifier = ${sensor_identifier}
+    AND creation_timestamp < coalesce(${creation_timestamp}::TIMESTAMPTZ, 'infinity')
+    AND creation_timestamp >= coalesce(${start_timestamp}::TIMESTAMPTZ, '-infinity')
+    AND creation_timestamp < coalesce(${end_timestamp}::TIMESTAMPTZ, 'infinity')
+    AND (${severity}::TEXT IS NULL OR severity = ${severity}::TEXT)
+ORDER BY creation_timestamp DESC
+LIMIT ${limit};
 
 
 -- name: read-user
@@ -254,9 +461,17 @@ WHERE name = ${user_name};
 
 
 -- name: authenticate
-SELECT user_identifier
+-- Sessions older than the lifetime in seconds are expired; NULL means they don't expire
+SELECT
+    user_identifier,
+    creation_timestamp
 FROM session
-WHERE access_token_hash = ${access_token_hash};
+WHERE
+    access_token_hash = ${access_token_hash}
+    AND (
+        ${session_lifetime}::DOUBLE PRECISION IS NULL
+        OR creation_timestamp > now() - make_interval(secs => ${session_lifetime}::DOUBLE PRECISION)
+    );
 
 
 -- name: authorize-resource-network
@@ -336,6 +551,97 @@ WHERE
     AND acknowledgment_timestamp IS NULL;
 
 
+-- name: update-latest-measurements
+-- Merge the newest values into the sensor's latest values; Values that are older than
+-- the stored value of the same attribute are ignored
+INSERT INTO sensor_latest (sensor_identifier, measurements)
+VALUES (${sensor_identifier}, ${measurements})
+ON CONFLICT (sensor_identifier) DO UPDATE
+SET measurements = sensor_latest.measurements || coalesce(
+    (
+        SELECT jsonb_object_agg(x.key, x.value)
+        FROM jsonb_each(excluded.measurements) AS x
+        WHERE
+            (x.value ->> 'creation_timestamp')::DOUBLE PRECISION
+            >= coalesce(
+                (sensor_latest.measurements -> x.key ->> 'creation_timestamp')::DOUBLE PRECISION,
+                '-infinity'
+            )
+    ),
+    '{}'
+);
+
+
+-- name: update-latest-log
+INSERT INTO sensor_latest (
+    sensor_identifier,
+    log_severity,
+    log_message,
+    log_revision,
+    log_creation_timestamp
+)
+VALUES (
+    ${sensor_identifier},
+    ${severity},
+    ${message},
+    ${revision},
+    ${creation_timestamp}
+)
+ON CONFLICT (sensor_identifier) DO UPDATE
+SET
+    log_severity = excluded.log_severity,
+    log_message = excluded.log_message,
+    log_revision = excluded.log_revision,
+    log_creation_timestamp = excluded.log_creation_timestamp
+WHERE
+    sensor_latest.log_creation_timestamp IS NULL
+    OR sensor_latest.log_creation_timestamp <= excluded.log_creation_timestamp;
+
+
+-- name: update-latest-acknowledgment
+INSERT INTO sensor_latest (
+    sensor_identifier,
+    acknowledgment_revision,
+    acknowledgment_timestamp,
+    acknowledgment_success
+)
+VALUES (
+    ${sensor_identifier},
+    ${revision},
+    ${acknowledgment_timestamp},
+    ${success}
+)
+ON CONFLICT (sensor_identifier) DO UPDATE
+SET
+    acknowledgment_revision = excluded.acknowledgment_revision,
+    acknowledgment_timestamp = excluded.acknowledgment_timestamp,
+    acknowledgment_success = excluded.acknowledgment_success
+WHERE
+    sensor_latest.acknowledgment_timestamp IS NULL
+    OR sensor_latest.acknowledgment_timestamp <= excluded.acknowledgment_timestamp;
+
+
+-- name: update-measurement-retention
+SELECT alter_job(
+    job_id,
+    scheduled => ${drop_after}::TEXT::INTERVAL IS NOT NULL,
+    -- Keep the horizon that the job remembers between runs
+    config => config || jsonb_build_object('drop_after', ${drop_after}::TEXT::INTERVAL)
+)
+FROM timescaledb_information.jobs
+WHERE proc_name = 'retain_measurements';
+
+
+-- name: update-session-lifetime
+SELECT alter_job(
+    job_id,
+    scheduled => ${session_lifetime}::DOUBLE PRECISION IS NOT NULL,
+    config => jsonb_build_object('lifetime', ${session_lifetime}::DOUBLE PRECISION)
+)
+FROM timescaledb_information.jobs
+WHERE proc_name = 'expire_sessions';
+
+
 -- name: update-sensor
 UPDATE sensor
 SET name = ${sensor_name}
@@ -27,3 +27,59 @@ MQTT_USERNAME = os.environ["HERMES_MQTT_USERNAME"]
 MQTT_PASSWORD = os.environ["HERMES_MQTT_PASSWORD"]
 MQTT_BASE_TOPIC = os.environ.get("HERMES_MQTT_BASE_TOPIC") or ""
 MQTT_CERT_REQUIREMENTS = os.environ.get("HERMES_MQTT_CERT_REQUIREMENTS") or "none"  # none [default], verify
+
+# Storage of measurements: narrow [default] stores one row per attribute; wide stores
+# samples of the well-known measurement families as one row in the family's own table
+MEASUREMENT_STORAGE = os.environ.get("HERMES_MEASUREMENT_STORAGE") or "narrow"
+# Retention of raw measurements as PostgreSQL interval, e.g. "6 months"; Older raw
+# measurements are dropped, their aggregates are kept. Unset [default] keeps everything
+MEASUREMENT_RETENTION = os.environ.get("HERMES_MEASUREMENT_RETENTION") or None
+# Ingest buffering: Rows from many messages are written to the database in bulk, once
+# the buffer holds this many rows or its oldest row has waited for this many seconds
+INGEST_BUFFER_SIZE = int(os.environ.get("HERMES_INGEST_BUFFER_SIZE") or 4096)
+INGEST_BUFFER_LATENCY = float(os.environ.get("HERMES_INGEST_BUFFER_LATENCY") or 0.25)
+# Ingest workers: Messages are sharded by sensor over this many workers that write to
+# the database concurrently; Each worker queues at most this many messages
+INGEST_WORKERS = int(os.environ.get("HERMES_INGEST_WORKERS") or 2)
+INGEST_QUEUE_SIZE = int(os.environ.get("HERMES_INGEST_QUEUE_SIZE") or 1024)
+# Deduplication: Each ingest worker remembers the rows it received during the last
+# this many seconds, but no more than this many rows, and drops exact redeliveries
+INGEST_DEDUPLICATION_WINDOW = float(
+    os.environ.get("HERMES_INGEST_DEDUPLICATION_WINDOW") or 900
+)
+INGEST_DEDUPLICATION_SIZE = int(
+    os.environ.get("HERMES_INGEST_DEDUPLICATION_SIZE") or 131072
+)
+# Sessions expire this many seconds after they were created and are then deleted;
+# Defaults to 30 days, "none" keeps sessions forever
+SESSION_LIFETIME = (
+    None
+    if os.environ.get("HERMES_SESSION_LIFETIME") == "none"
+    else float(os.environ.get("HERMES_SESSION_LIFETIME") or 2592000)
+)
+# Authentication cache: Each server process remembers valid and invalid access tokens
+# for this many seconds, but no more than this many tokens
+AUTHENTICATION_CACHE_TTL = float(
+    os.environ.get("HERMES_AUTHENTICATION_CACHE_TTL") or 60
+)
+AUTHENTICATION_CACHE_SIZE = int(
+    os.environ.get("HERMES_AUTHENTICATION_CACHE_SIZE") or 4096
+)
+# Authorization cache: Each server process remembers the users' relationships with
+# networks and which sensors exist for this many seconds, but no more than this many
+# of each; Changes made through the same process are visible right away
+AUTHORIZATION_CACHE_TTL = float(os.environ.get("HERMES_AUTHORIZATION_CACHE_TTL") or 30)
+AUTHORIZATION_CACHE_SIZE = int(
+    os.environ.get("HERMES_AUTHORIZATION_CACHE_SIZE") or 4096
+)
+# Interval in seconds in which the in-memory registry of sensors is reloaded
+SENSOR_REGISTRY_INTERVAL = float(
+    os.environ.get("HERMES_SENSOR_REGISTRY_INTERVAL") or 60
+)
+# Sensor health: A sensor is online if it sent measurements within the last this many
+# seconds and unstable (or in error, without measurements) if it also sent logs within
+# the last this many seconds; Both can be overridden per request
+HEALTH_MEASUREMENT_WINDOW = float(
+    os.environ.get("HERMES_HEALTH_MEASUREMENT_WINDOW") or 1800
+)
+HEALTH_LOG_WINDOW = float(os.environ.get("HERMES_HEALTH_LOG_WINDOW") or 1800)
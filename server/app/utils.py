@@ -1,6 +1,31 @@
+import json
 import time
 
+import asyncpg
+import starlette.responses
+
 
 def timestamp():
     """Return current UTC time as unixtime float."""
     return time.time()
+
+
+# Encoder with the same settings as starlette's JSONResponse
+_encoder = json.JSONEncoder(ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+
+
+def _encode(x):
+    """Serialize to JSON, writing database records' items without copying them first."""
+    if isinstance(x, asyncpg.Record):
+        items = (f"{_encoder.encode(k)}:{_encode(v)}" for k, v in x.items())
+        return "{" + ",".join(items) + "}"
+    if isinstance(x, list):
+        return "[" + ",".join(map(_encode, x)) + "]"
+    return _encoder.encode(x)
+
+
+class JSONResponse(starlette.responses.JSONResponse):
+    """JSON response that serializes database records without copying them first."""
+
+    def render(self, content):
+        return _encode(content).encode("utf-8")
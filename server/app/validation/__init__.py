@@ -1,14 +1,27 @@
-from .mqtt import AcknowledgmentsValidator, LogsValidator, MeasurementsValidator
+from .mqtt import (
+    AcknowledgmentsDictValidator,
+    AcknowledgmentsValidator,
+    LogsDictValidator,
+    LogsValidator,
+    MeasurementsDictValidator,
+    MeasurementsValidator,
+)
 from .routes import (
     CreateConfigurationRequest,
     CreateNetworkRequest,
     CreateSensorRequest,
     CreateSessionRequest,
     CreateUserRequest,
+    ExportMeasurementsRequest,
+    ExportNetworkMeasurementsRequest,
     ReadConfigurationsRequest,
+    ReadHealthRequest,
+    ReadLatestRequest,
     ReadLogsAggregatesRequest,
     ReadLogsRequest,
+    ReadMeasurementsAggregatesRequest,
     ReadMeasurementsRequest,
+    ReadNetworkLogsAggregatesRequest,
     ReadNetworksRequest,
     ReadSensorsRequest,
     ReadStatusRequest,
@@ -21,18 +34,27 @@ __all__ = [
     "AcknowledgmentsValidator",
     "MeasurementsValidator",
     "LogsValidator",
+    "AcknowledgmentsDictValidator",
+    "MeasurementsDictValidator",
+    "LogsDictValidator",
     "CreateSensorRequest",
     "CreateUserRequest",
     "CreateSessionRequest",
     "CreateConfigurationRequest",
     "ReadLogsAggregatesRequest",
+    "ReadNetworkLogsAggregatesRequest",
     "ReadLogsRequest",
     "ReadConfigurationsRequest",
     "CreateNetworkRequest",
+    "ReadMeasurementsAggregatesRequest",
     "ReadMeasurementsRequest",
     "ReadStatusRequest",
     "ReadSensorsRequest",
+    "ReadLatestRequest",
+    "ReadHealthRequest",
     "ReadNetworksRequest",
     "UpdateSensorRequest",
+    "ExportMeasurementsRequest",
+    "ExportNetworkMeasurementsRequest",
     "validate",
 ]
@@ -1,8 +1,8 @@
 import typing
 
 import pydantic
+import typing_extensions
 
-import app.validation.constants as constants
 import app.validation.types as types
 
 
@@ -27,11 +27,40 @@ class Log(types.StrictModel):
     timestamp: types.Timestamp
     revision: types.Revision | None = None
     severity: typing.Literal["info", "warning", "error"]
-    message: str  # Can be empty, but must not be None
+    message: types.Message
 
-    @pydantic.field_validator("message")
-    def trim(cls, v):
-        return v[: constants.Limit.LARGE]
+
+########################################################################################
+# Dictionary types
+#
+# These mirror the base types but validate into plain dictionaries. This skips building
+# model instances, which makes a noticeable difference when sensors flush a backlog.
+# Pydantic only accepts the TypedDict of typing_extensions before Python 3.12.
+########################################################################################
+
+_DICT_CONFIG = pydantic.ConfigDict(strict=True, extra="forbid")
+
+
+class AcknowledgmentDict(typing_extensions.TypedDict):
+    __pydantic_config__ = _DICT_CONFIG
+    timestamp: types.Timestamp
+    revision: types.Revision
+    success: bool
+
+
+class MeasurementDict(typing_extensions.TypedDict):
+    __pydantic_config__ = _DICT_CONFIG
+    timestamp: types.Timestamp
+    revision: typing.NotRequired[types.Revision | None]
+    value: types.Measurement
+
+
+class LogDict(typing_extensions.TypedDict):
+    __pydantic_config__ = _DICT_CONFIG
+    timestamp: types.Timestamp
+    revision: typing.NotRequired[types.Revision | None]
+    severity: typing.Literal["info", "warning", "error"]
+    message: types.Message
 
 
 ########################################################################################
@@ -47,3 +76,13 @@ MeasurementsValidator = pydantic.TypeAdapter(
 LogsValidator = pydantic.TypeAdapter(
     pydantic.conlist(item_type=Log, min_length=1),
 )
+
+AcknowledgmentsDictValidator = pydantic.TypeAdapter(
+    pydantic.conlist(item_type=AcknowledgmentDict, min_length=1),
+)
+MeasurementsDictValidator = pydantic.TypeAdapter(
+    pydantic.conlist(item_type=MeasurementDict, min_length=1),
+)
+LogsDictValidator = pydantic.TypeAdapter(
+    pydantic.conlist(item_type=LogDict, min_length=1),
+)
@@ -4,6 +4,7 @@ import logging
 import typing
 
 import app.errors as errors
+import app.validation.constants as constants
 import app.validation.types as types
 
 
@@ -79,6 +80,14 @@ class _ReadSensorsRequestPath(types.StrictModel):
     network_identifier: types.Identifier
 
 
+class _ReadLatestRequestPath(types.StrictModel):
+    network_identifier: types.Identifier
+
+
+class _ReadHealthRequestPath(types.StrictModel):
+    network_identifier: types.Identifier
+
+
 class _UpdateSensorRequestPath(types.StrictModel):
     network_identifier: types.Identifier
     sensor_identifier: types.Identifier
@@ -104,11 +113,29 @@ class _ReadLogsRequestPath(types.StrictModel):
     sensor_identifier: types.Identifier
 
 
+class _ReadMeasurementsAggregatesRequestPath(types.StrictModel):
+    network_identifier: types.Identifier
+    sensor_identifier: types.Identifier
+
+
 class _ReadLogsAggregatesRequestPath(types.StrictModel):
     network_identifier: types.Identifier
     sensor_identifier: types.Identifier
 
 
+class _ReadNetworkLogsAggregatesRequestPath(types.StrictModel):
+    network_identifier: types.Identifier
+
+
+class _ExportNetworkMeasurementsRequestPath(types.StrictModel):
+    network_identifier: types.Identifier
+
+
+class _ExportMeasurementsRequestPath(types.StrictModel):
+    network_identifier: types.Identifier
+    sensor_identifier: types.Identifier
+
+
 ########################################################################################
 # Query models
 ########################################################################################
@@ -142,6 +169,15 @@ class _ReadSensorsRequestQuery(types.LooseModel):
     pass
 
 
+class _ReadLatestRequestQuery(types.LooseModel):
+    pass
+
+
+class _ReadHealthRequestQuery(types.LooseModel):
+    measurement_window: types.Duration = None
+    log_window: types.Duration = None
+
+
 class _UpdateSensorRequestQuery(types.LooseModel):
     pass
 
@@ -158,18 +194,50 @@ class _ReadConfigurationsRequestQuery(types.LooseModel):
 class _ReadMeasurementsRequestQuery(types.LooseModel):
     creation_timestamp: types.Timestamp = None
     direction: typing.Literal["next", "previous"] = "next"
+    start: types.Timestamp = None
+    end: types.Timestamp = None
+    limit: types.PageSize = constants.Limit.SMALL
+    attribute: types.Key = None
     aggregate: bool = False
+    layout: typing.Literal["rows", "columns"] = "rows"
 
 
 class _ReadLogsRequestQuery(types.LooseModel):
     creation_timestamp: types.Timestamp = None
     direction: typing.Literal["next", "previous"] = "next"
+    start: types.Timestamp = None
+    end: types.Timestamp = None
+    limit: types.PageSize = constants.Limit.SMALL
+    severity: typing.Literal["info", "warning", "error"] = None
+
+
+class _ReadMeasurementsAggregatesRequestQuery(types.LooseModel):
+    start: types.Timestamp = None
+    end: types.Timestamp = None
+    points: types.PageSize = constants.Limit.MEDIUM
+    layout: typing.Literal["rows", "columns"] = "rows"
 
 
 class _ReadLogsAggregatesRequestQuery(types.LooseModel):
     pass
 
 
+class _ReadNetworkLogsAggregatesRequestQuery(types.LooseModel):
+    pass
+
+
+class _ExportNetworkMeasurementsRequestQuery(types.LooseModel):
+    start: types.Timestamp
+    end: types.Timestamp
+    format: typing.Literal["ndjson", "csv"] = "ndjson"
+
+
+class _ExportMeasurementsRequestQuery(types.LooseModel):
+    start: types.Timestamp
+    end: types.Timestamp
+    format: typing.Literal["ndjson", "csv"] = "ndjson"
+
+
 ########################################################################################
 # Body models
 ########################################################################################
@@ -205,6 +273,14 @@ class _ReadSensorsRequestBody(types.StrictModel):
     pass
 
 
+class _ReadLatestRequestBody(types.StrictModel):
+    pass
+
+
+class _ReadHealthRequestBody(types.StrictModel):
+    pass
+
+
 class _UpdateSensorRequestBody(types.StrictModel):
     sensor_name: types.Name
 
@@ -225,10 +301,26 @@ class _ReadLogsRequestBody(types.StrictModel):
     pass
 
 
+class _ReadMeasurementsAggregatesRequestBody(types.StrictModel):
+    pass
+
+
 class _ReadLogsAggregatesRequestBody(types.StrictModel):
     pass
 
 
+class _ReadNetworkLogsAggregatesRequestBody(types.StrictModel):
+    pass
+
+
+class _ExportNetworkMeasurementsRequestBody(types.StrictModel):
+    pass
+
+
+class _ExportMeasurementsRequestBody(types.StrictModel):
+    pass
+
+
 ########################################################################################
 # Request models
 # TODO Can we generate these automatically?
@@ -277,6 +369,18 @@ class ReadSensorsRequest(types.StrictModel):
     body: _ReadSensorsRequestBody
 
 
+class ReadLatestRequest(types.StrictModel):
+    path: _ReadLatestRequestPath
+    query: _ReadLatestRequestQuery
+    body: _ReadLatestRequestBody
+
+
+class ReadHealthRequest(types.StrictModel):
+    path: _ReadHealthRequestPath
+    query: _ReadHealthRequestQuery
+    body: _ReadHealthRequestBody
+
+
 class UpdateSensorRequest(types.StrictModel):
     path: _UpdateSensorRequestPath
     query: _UpdateSensorRequestQuery
@@ -307,7 +411,31 @@ class ReadLogsRequest(types.StrictModel):
     body: _ReadLogsRequestBody
 
 
+class ReadMeasurementsAggregatesRequest(types.StrictModel):
+    path: _ReadMeasurementsAggregatesRequestPath
+    query: _ReadMeasurementsAggregatesRequestQuery
+    body: _ReadMeasurementsAggregatesRequestBody
+
+
 class ReadLogsAggregatesRequest(types.StrictModel):
     path: _ReadLogsAggregatesRequestPath
     query: _ReadLogsAggregatesRequestQuery
     body: _ReadLogsAggregatesRequestBody
+
+
+class ReadNetworkLogsAggregatesRequest(types.StrictModel):
+    path: _ReadNetworkLogsAggregatesRequestPath
+    query: _ReadNetworkLogsAggregatesRequestQuery
+    body: _ReadNetworkLogsAggregatesRequestBody
+
+
+class ExportNetworkMeasurementsRequest(types.StrictModel):
+    path: _ExportNetworkMeasurementsRequestPath
+    query: _ExportNetworkMeasurementsRequestQuery
+    body: _ExportNetworkMeasurementsRequestBody
+
+
+class ExportMeasurementsRequest(types.StrictModel):
+    path: _ExportMeasurementsRequestPath
+    query: _ExportMeasurementsRequestQuery
+    body: _ExportMeasurementsRequestBody
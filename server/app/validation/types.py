@@ -1,3 +1,5 @@
+import typing
+
 import pydantic
 
 import app.validation.constants as constants
@@ -37,4 +39,10 @@ Key = pydantic.constr(max_length=64, pattern=constants.Pattern.KEY.value)
 # During validation somehow, or by handling the database error?
 Revision = pydantic.conint(ge=0, lt=constants.Limit.MAXINT4)
 Timestamp = pydantic.confloat(ge=0, lt=constants.Limit.MAXINT4)
+PageSize = pydantic.conint(ge=1, le=constants.Limit.LARGE)
+Duration = pydantic.confloat(gt=0, lt=constants.Limit.MAXINT4)
 Measurement = dict[Key, float]
+# Can be empty, but must not be None; Overly long messages are trimmed
+Message = typing.Annotated[
+    str, pydantic.AfterValidator(lambda v: v[: constants.Limit.LARGE])
+]
@@ -0,0 +1,1912 @@
+-- Generated by scripts/generate from the measurement families in app/mqtt.py; Don't
+-- edit this file by hand. It's executed after schema.sql.
+
+-- The measurements are aggregated into a ladder of resolutions. Each level is computed
+-- from the next finer level, so refreshes never read more than the finest level's rows.
+-- Averages are weighted by the number of values they summarize.
+CREATE MATERIALIZED VIEW measurement_aggregation_1_minute
+WITH (timescaledb.continuous, timescaledb.materialized_only = true, timescaledb.create_group_indexes = false) AS
+    SELECT
+        sensor_identifier,
+        attribute_identifier,
+        time_bucket('1 minute', creation_timestamp) AS bucket_timestamp,
+        min(value) AS minimum,
+        max(value) AS maximum,
+        avg(value) AS average,
+        count(*) AS count
+    FROM measurement
+    GROUP BY sensor_identifier, attribute_identifier, bucket_timestamp
+WITH NO DATA;
+
+CREATE INDEX ON measurement_aggregation_1_minute (sensor_identifier ASC, bucket_timestamp ASC, attribute_identifier ASC);
+
+SELECT add_continuous_aggregate_policy(
+    continuous_aggregate => 'measurement_aggregation_1_minute',
+    start_offset => '10 days',
+    end_offset => '1 minute',
+    schedule_interval => '1 minute');
+
+
+CREATE MATERIALIZED VIEW measurement_aggregation_10_minutes
+WITH (timescaledb.continuous, timescaledb.materialized_only = true, timescaledb.create_group_indexes = false) AS
+    SELECT
+        sensor_identifier,
+        attribute_identifier,
+        time_bucket('10 minutes', bucket_timestamp) AS bucket_timestamp,
+        min(minimum) AS minimum,
+        max(maximum) AS maximum,
+        sum(average * count) / sum(count) AS average,
+        sum(count)::BIGINT AS count
+    FROM measurement_aggregation_1_minute
+    GROUP BY sensor_identifier, attribute_identifier, time_bucket('10 minutes', bucket_timestamp)
+WITH NO DATA;
+
+CREATE INDEX ON measurement_aggregation_10_minutes (sensor_identifier ASC, bucket_timestamp ASC, attribute_identifier ASC);
+
+SELECT add_continuous_aggregate_policy(
+    continuous_aggregate => 'measurement_aggregation_10_minutes',
+    start_offset => '10 days',
+    end_offset => '10 minutes',
+    schedule_interval => '10 minutes');
+
+
+CREATE MATERIALIZED VIEW measurement_aggregation_1_hour
+WITH (timescaledb.continuous, timescaledb.materialized_only = true, timescaledb.create_group_indexes = false) AS
+    SELECT
+        sensor_identifier,
+        attribute_identifier,
+        time_bucket('1 hour', bucket_timestamp) AS bucket_timestamp,
+        min(minimum) AS minimum,
+        max(maximum) AS maximum,
+        sum(average * count) / sum(count) AS average,
+        sum(count)::BIGINT AS count
+    FROM measurement_aggregation_10_minutes
+    GROUP BY sensor_identifier, attribute_identifier, time_bucket('1 hour', bucket_timestamp)
+WITH NO DATA;
+
+CREATE INDEX ON measurement_aggregation_1_hour (sensor_identifier ASC, bucket_timestamp ASC, attribute_identifier ASC);
+
+SELECT add_continuous_aggregate_policy(
+    continuous_aggregate => 'measurement_aggregation_1_hour',
+    start_offset => '10 days',
+    end_offset => '1 hour',
+    schedule_interval => '1 hour');
+
+
+CREATE MATERIALIZED VIEW measurement_aggregation_1_day
+WITH (timescaledb.continuous, timescaledb.materialized_only = true, timescaledb.create_group_indexes = false) AS
+    SELECT
+        sensor_identifier,
+        attribute_identifier,
+        time_bucket('1 day', bucket_timestamp) AS bucket_timestamp,
+        min(minimum) AS minimum,
+        max(maximum) AS maximum,
+        sum(average * count) / sum(count) AS average,
+        sum(count)::BIGINT AS count
+    FROM measurement_aggregation_1_hour
+    GROUP BY sensor_identifier, attribute_identifier, time_bucket('1 day', bucket_timestamp)
+WITH NO DATA;
+
+CREATE INDEX ON measurement_aggregation_1_day (sensor_identifier ASC, bucket_timestamp ASC, attribute_identifier ASC);
+
+SELECT add_continuous_aggregate_policy(
+    continuous_aggregate => 'measurement_aggregation_1_day',
+    start_offset => '10 days',
+    end_offset => '1 day',
+    schedule_interval => '1 day');
+
+
+-- With the wide storage mode (see HERMES_MEASUREMENT_STORAGE), samples of the well-known
+-- measurement families of the edge nodes are stored as a single row with one column per
+-- attribute instead of one row per attribute. Attributes that a sample doesn't contain
+-- are NULL. Samples with other attributes fall back to the generic table.
+CREATE TABLE measurement_co2 (
+    sensor_identifier UUID NOT NULL REFERENCES sensor (identifier) ON DELETE CASCADE,
+    revision INT,
+    creation_timestamp TIMESTAMPTZ NOT NULL,
+    receipt_timestamp TIMESTAMPTZ NOT NULL DEFAULT now(),
+    gmp343_raw DOUBLE PRECISION,
+    gmp343_compensated DOUBLE PRECISION,
+    gmp343_filtered DOUBLE PRECISION,
+    gmp343_temperature DOUBLE PRECISION,
+    bme280_temperature DOUBLE PRECISION,
+    bme280_humidity DOUBLE PRECISION,
+    bme280_pressure DOUBLE PRECISION,
+    sht45_temperature DOUBLE PRECISION,
+    sht45_humidity DOUBLE PRECISION
+);
+
+-- The family tables hold one row per sample instead of one row per attribute, so their
+-- chunks can span a longer time; They are compressed the same way as the generic table
+SELECT create_hypertable('measurement_co2', 'creation_timestamp', chunk_time_interval => INTERVAL '1 week');
+
+CREATE INDEX ON measurement_co2 (sensor_identifier ASC, creation_timestamp DESC);
+
+ALTER TABLE measurement_co2 SET (
+    timescaledb.compress,
+    timescaledb.compress_segmentby = 'sensor_identifier',
+    timescaledb.compress_orderby = 'creation_timestamp DESC'
+);
+
+SELECT add_compression_policy('measurement_co2', compress_after => INTERVAL '2 weeks');
+
+
+CREATE TABLE measurement_calibration (
+    sensor_identifier UUID NOT NULL REFERENCES sensor (identifier) ON DELETE CASCADE,
+    revision INT,
+    creation_timestamp TIMESTAMPTZ NOT NULL,
+    receipt_timestamp TIMESTAMPTZ NOT NULL DEFAULT now(),
+    cal_bottle_id DOUBLE PRECISION,
+    cal_gmp343_raw DOUBLE PRECISION,
+    cal_gmp343_compensated DOUBLE PRECISION,
+    cal_gmp343_filtered DOUBLE PRECISION,
+    cal_gmp343_temperature DOUBLE PRECISION,
+    cal_bme280_temperature DOUBLE PRECISION,
+    cal_bme280_humidity DOUBLE PRECISION,
+    cal_bme280_pressure DOUBLE PRECISION,
+    cal_sht45_temperature DOUBLE PRECISION,
+    cal_sht45_humidity DOUBLE PRECISION
+);
+
+SELECT create_hypertable('measurement_calibration', 'creation_timestamp', chunk_time_interval => INTERVAL '1 week');
+
+CREATE INDEX ON measurement_calibration (sensor_identifier ASC, creation_timestamp DESC);
+
+ALTER TABLE measurement_calibration SET (
+    timescaledb.compress,
+    timescaledb.compress_segmentby = 'sensor_identifier',
+    timescaledb.compress_orderby = 'creation_timestamp DESC'
+);
+
+SELECT add_compression_policy('measurement_calibration', compress_after => INTERVAL '2 weeks');
+
+
+CREATE TABLE measurement_system (
+    sensor_identifier UUID NOT NULL REFERENCES sensor (identifier) ON DELETE CASCADE,
+    revision INT,
+    creation_timestamp TIMESTAMPTZ NOT NULL,
+    receipt_timestamp TIMESTAMPTZ NOT NULL DEFAULT now(),
+    enclosure_bme280_temperature DOUBLE PRECISION,
+    enclosure_bme280_humidity DOUBLE PRECISION,
+    enclosure_bme280_pressure DOUBLE PRECISION,
+    raspi_cpu_temperature DOUBLE PRECISION,
+    raspi_disk_usage DOUBLE PRECISION,
+    raspi_cpu_usage DOUBLE PRECISION,
+    raspi_memory_usage DOUBLE PRECISION,
+    ups_powered_by_grid DOUBLE PRECISION,
+    ups_battery_is_fully_charged DOUBLE PRECISION,
+    ups_battery_error_detected DOUBLE PRECISION,
+    ups_battery_above_voltage_threshold DOUBLE PRECISION
+);
+
+SELECT create_hypertable('measurement_system', 'creation_timestamp', chunk_time_interval => INTERVAL '1 week');
+
+CREATE INDEX ON measurement_system (sensor_identifier ASC, creation_timestamp DESC);
+
+ALTER TABLE measurement_system SET (
+    timescaledb.compress,
+    timescaledb.compress_segmentby = 'sensor_identifier',
+    timescaledb.compress_orderby = 'creation_timestamp DESC'
+);
+
+SELECT add_compression_policy('measurement_system', compress_after => INTERVAL '2 weeks');
+
+
+CREATE TABLE measurement_wind (
+    sensor_identifier UUID NOT NULL REFERENCES sensor (identifier) ON DELETE CASCADE,
+    revision INT,
+    creation_timestamp TIMESTAMPTZ NOT NULL,
+    receipt_timestamp TIMESTAMPTZ NOT NULL DEFAULT now(),
+    wxt532_direction_min DOUBLE PRECISION,
+    wxt532_direction_avg DOUBLE PRECISION,
+    wxt532_direction_max DOUBLE PRECISION,
+    wxt532_speed_min DOUBLE PRECISION,
+    wxt532_speed_avg DOUBLE PRECISION,
+    wxt532_speed_max DOUBLE PRECISION,
+    wxt532_last_update_time DOUBLE PRECISION
+);
+
+SELECT create_hypertable('measurement_wind', 'creation_timestamp', chunk_time_interval => INTERVAL '1 week');
+
+CREATE INDEX ON measurement_wind (sensor_identifier ASC, creation_timestamp DESC);
+
+ALTER TABLE measurement_wind SET (
+    timescaledb.compress,
+    timescaledb.compress_segmentby = 'sensor_identifier',
+    timescaledb.compress_orderby = 'creation_timestamp DESC'
+);
+
+SELECT add_compression_policy('measurement_wind', compress_after => INTERVAL '2 weeks');
+
+
+CREATE TABLE measurement_wind_sensor (
+    sensor_identifier UUID NOT NULL REFERENCES sensor (identifier) ON DELETE CASCADE,
+    revision INT,
+    creation_timestamp TIMESTAMPTZ NOT NULL,
+    receipt_timestamp TIMESTAMPTZ NOT NULL DEFAULT now(),
+    wxt532_temperature DOUBLE PRECISION,
+    wxt532_heating_voltage DOUBLE PRECISION,
+    wxt532_supply_voltage DOUBLE PRECISION,
+    wxt532_reference_voltage DOUBLE PRECISION,
+    wxt532_last_update_time DOUBLE PRECISION
+);
+
+SELECT create_hypertable('measurement_wind_sensor', 'creation_timestamp', chunk_time_interval => INTERVAL '1 week');
+
+CREATE INDEX ON measurement_wind_sensor (sensor_identifier ASC, creation_timestamp DESC);
+
+ALTER TABLE measurement_wind_sensor SET (
+    timescaledb.compress,
+    timescaledb.compress_segmentby = 'sensor_identifier',
+    timescaledb.compress_orderby = 'creation_timestamp DESC'
+);
+
+SELECT add_compression_policy('measurement_wind_sensor', compress_after => INTERVAL '2 weeks');
+
+
+CREATE MATERIALIZED VIEW measurement_co2_aggregation_1_minute
+WITH (timescaledb.continuous, timescaledb.materialized_only = true) AS
+    SELECT
+        sensor_identifier,
+        time_bucket('1 minute', creation_timestamp) AS bucket_timestamp,
+        min(gmp343_raw) AS gmp343_raw_minimum,
+        max(gmp343_raw) AS gmp343_raw_maximum,
+        avg(gmp343_raw) AS gmp343_raw_average,
+        count(gmp343_raw) AS gmp343_raw_count,
+        min(gmp343_compensated) AS gmp343_compensated_minimum,
+        max(gmp343_compensated) AS gmp343_compensated_maximum,
+        avg(gmp343_compensated) AS gmp343_compensated_average,
+        count(gmp343_compensated) AS gmp343_compensated_count,
+        min(gmp343_filtered) AS gmp343_filtered_minimum,
+        max(gmp343_filtered) AS gmp343_filtered_maximum,
+        avg(gmp343_filtered) AS gmp343_filtered_average,
+        count(gmp343_filtered) AS gmp343_filtered_count,
+        min(gmp343_temperature) AS gmp343_temperature_minimum,
+        max(gmp343_temperature) AS gmp343_temperature_maximum,
+        avg(gmp343_temperature) AS gmp343_temperature_average,
+        count(gmp343_temperature) AS gmp343_temperature_count,
+        min(bme280_temperature) AS bme280_temperature_minimum,
+        max(bme280_temperature) AS bme280_temperature_maximum,
+        avg(bme280_temperature) AS bme280_temperature_average,
+        count(bme280_temperature) AS bme280_temperature_count,
+        min(bme280_humidity) AS bme280_humidity_minimum,
+        max(bme280_humidity) AS bme280_humidity_maximum,
+        avg(bme280_humidity) AS bme280_humidity_average,
+        count(bme280_humidity) AS bme280_humidity_count,
+        min(bme280_pressure) AS bme280_pressure_minimum,
+        max(bme280_pressure) AS bme280_pressure_maximum,
+        avg(bme280_pressure) AS bme280_pressure_average,
+        count(bme280_pressure) AS bme280_pressure_count,
+        min(sht45_temperature) AS sht45_temperature_minimum,
+        max(sht45_temperature) AS sht45_temperature_maximum,
+        avg(sht45_temperature) AS sht45_temperature_average,
+        count(sht45_temperature) AS sht45_temperature_count,
+        min(sht45_humidity) AS sht45_humidity_minimum,
+        max(sht45_humidity) AS sht45_humidity_maximum,
+        avg(sht45_humidity) AS sht45_humidity_average,
+        count(sht45_humidity) AS sht45_humidity_count
+    FROM measurement_co2
+    GROUP BY sensor_identifier, bucket_timestamp
+WITH NO DATA;
+
+SELECT add_continuous_aggregate_policy(
+    continuous_aggregate => 'measurement_co2_aggregation_1_minute',
+    start_offset => '10 days',
+    end_offset => '1 minute',
+    schedule_interval => '1 minute');
+
+
+CREATE MATERIALIZED VIEW measurement_co2_aggregation_10_minutes
+WITH (timescaledb.continuous, timescaledb.materialized_only = true) AS
+    SELECT
+        sensor_identifier,
+        time_bucket('10 minutes', bucket_timestamp) AS bucket_timestamp,
+        min(gmp343_raw_minimum) AS gmp343_raw_minimum,
+        max(gmp343_raw_maximum) AS gmp343_raw_maximum,
+        sum(gmp343_raw_average * gmp343_raw_count) / nullif(sum(gmp343_raw_count), 0) AS gmp343_raw_average,
+        sum(gmp343_raw_count)::BIGINT AS gmp343_raw_count,
+        min(gmp343_compensated_minimum) AS gmp343_compensated_minimum,
+        max(gmp343_compensated_maximum) AS gmp343_compensated_maximum,
+        sum(gmp343_compensated_average * gmp343_compensated_count) / nullif(sum(gmp343_compensated_count), 0) AS gmp343_compensated_average,
+        sum(gmp343_compensated_count)::BIGINT AS gmp343_compensated_count,
+        min(gmp343_filtered_minimum) AS gmp343_filtered_minimum,
+        max(gmp343_filtered_maximum) AS gmp343_filtered_maximum,
+        sum(gmp343_filtered_average * gmp343_filtered_count) / nullif(sum(gmp343_filtered_count), 0) AS gmp343_filtered_average,
+        sum(gmp343_filtered_count)::BIGINT AS gmp343_filtered_count,
+        min(gmp343_temperature_minimum) AS gmp343_temperature_minimum,
+        max(gmp343_temperature_maximum) AS gmp343_temperature_maximum,
+        sum(gmp343_temperature_average * gmp343_temperature_count) / nullif(sum(gmp343_temperature_count), 0) AS gmp343_temperature_average,
+        sum(gmp343_temperature_count)::BIGINT AS gmp343_temperature_count,
+        min(bme280_temperature_minimum) AS bme280_temperature_minimum,
+        max(bme280_temperature_maximum) AS bme280_temperature_maximum,
+        sum(bme280_temperature_average * bme280_temperature_count) / nullif(sum(bme280_temperature_count), 0) AS bme280_temperature_average,
+        sum(bme280_temperature_count)::BIGINT AS bme280_temperature_count,
+        min(bme280_humidity_minimum) AS bme280_humidity_minimum,
+        max(bme280_humidity_maximum) AS bme280_humidity_maximum,
+        sum(bme280_humidity_average * bme280_humidity_count) / nullif(sum(bme280_humidity_count), 0) AS bme280_humidity_average,
+        sum(bme280_humidity_count)::BIGINT AS bme280_humidity_count,
+        min(bme280_pressure_minimum) AS bme280_pressure_minimum,
+        max(bme280_pressure_maximum) AS bme280_pressure_maximum,
+        sum(bme280_pressure_average * bme280_pressure_count) / nullif(sum(bme280_pressure_count), 0) AS bme280_pressure_average,
+        sum(bme280_pressure_count)::BIGINT AS bme280_pressure_count,
+        min(sht45_temperature_minimum) AS sht45_temperature_minimum,
+        max(sht45_temperature_maximum) AS sht45_temperature_maximum,
+        sum(sht45_temperature_average * sht45_temperature_count) / nullif(sum(sht45_temperature_count), 0) AS sht45_temperature_average,
+        sum(sht45_temperature_count)::BIGINT AS sht45_temperature_count,
+        min(sht45_humidity_minimum) AS sht45_humidity_minimum,
+        max(sht45_humidity_maximum) AS sht45_humidity_maximum,
+        sum(sht45_humidity_average * sht45_humidity_count) / nullif(sum(sht45_humidity_count), 0) AS sht45_humidity_average,
+        sum(sht45_humidity_count)::BIGINT AS sht45_humidity_count
+    FROM measurement_co2_aggregation_1_minute
+    GROUP BY sensor_identifier, time_bucket('10 minutes', bucket_timestamp)
+WITH NO DATA;
+
+SELECT add_continuous_aggregate_policy(
+    continuous_aggregate => 'measurement_co2_aggregation_10_minutes',
+    start_offset => '10 days',
+    end_offset => '10 minutes',
+    schedule_interval => '10 minutes');
+
+
+CREATE MATERIALIZED VIEW measurement_co2_aggregation_1_hour
+WITH (timescaledb.continuous, timescaledb.materialized_only = true) AS
+    SELECT
+        sensor_identifier,
+        time_bucket('1 hour', bucket_timestamp) AS bucket_timestamp,
+        min(gmp343_raw_minimum) AS gmp343_raw_minimum,
+        max(gmp343_raw_maximum) AS gmp343_raw_maximum,
+        sum(gmp343_raw_average * gmp343_raw_count) / nullif(sum(gmp343_raw_count), 0) AS gmp343_raw_average,
+        sum(gmp343_raw_count)::BIGINT AS gmp343_raw_count,
+        min(gmp343_compensated_minimum) AS gmp343_compensated_minimum,
+        max(gmp343_compensated_maximum) AS gmp343_compensated_maximum,
+        sum(gmp343_compensated_average * gmp343_compensated_count) / nullif(sum(gmp343_compensated_count), 0) AS gmp343_compensated_average,
+        sum(gmp343_compensated_count)::BIGINT AS gmp343_compensated_count,
+        min(gmp343_filtered_minimum) AS gmp343_filtered_minimum,
+        max(gmp343_filtered_maximum) AS gmp343_filtered_maximum,
+        sum(gmp343_filtered_average * gmp343_filtered_count) / nullif(sum(gmp343_filtered_count), 0) AS gmp343_filtered_average,
+        sum(gmp343_filtered_count)::BIGINT AS gmp343_filtered_count,
+        min(gmp343_temperature_minimum) AS gmp343_temperature_minimum,
+        max(gmp343_temperature_maximum) AS gmp343_temperature_maximum,
+        sum(gmp343_temperature_average * gmp343_temperature_count) / nullif(sum(gmp343_temperature_count), 0) AS gmp343_temperature_average,
+        sum(gmp343_temperature_count)::BIGINT AS gmp343_temperature_count,
+        min(bme280_temperature_minimum) AS bme280_temperature_minimum,
+        max(bme280_temperature_maximum) AS bme280_temperature_maximum,
+        sum(bme280_temperature_average * bme280_temperature_count) / nullif(sum(bme280_temperature_count), 0) AS bme280_temperature_average,
+        sum(bme280_temperature_count)::BIGINT AS bme280_temperature_count,
+        min(bme280_humidity_minimum) AS bme280_humidity_minimum,
+        max(bme280_humidity_maximum) AS bme280_humidity_maximum,
+        sum(bme280_humidity_average * bme280_humidity_count) / nullif(sum(bme280_humidity_count), 0) AS bme280_humidity_average,
+        sum(bme280_humidity_count)::BIGINT AS bme280_humidity_count,
+        min(bme280_pressure_minimum) AS bme280_pressure_minimum,
+        max(bme280_pressure_maximum) AS bme280_pressure_maximum,
+        sum(bme280_pressure_average * bme280_pressure_count) / nullif(sum(bme280_pressure_count), 0) AS bme280_pressure_average,
+        sum(bme280_pressure_count)::BIGINT AS bme280_pressure_count,
+        min(sht45_temperature_minimum) AS sht45_temperature_minimum,
+        max(sht45_temperature_maximum) AS sht45_temperature_maximum,
+        sum(sht45_temperature_average * sht45_temperature_count) / nullif(sum(sht45_temperature_count), 0) AS sht45_temperature_average,
+        sum(sht45_temperature_count)::BIGINT AS sht45_temperature_count,
+        min(sht45_humidity_minimum) AS sht45_humidity_minimum,
+        max(sht45_humidity_maximum) AS sht45_humidity_maximum,
+        sum(sht45_humidity_average * sht45_humidity_count) / nullif(sum(sht45_humidity_count), 0) AS sht45_humidity_average,
+        sum(sht45_humidity_count)::BIGINT AS sht45_humidity_count
+    FROM measurement_co2_aggregation_10_minutes
+    GROUP BY sensor_identifier, time_bucket('1 hour', bucket_timestamp)
+WITH NO DATA;
+
+SELECT add_continuous_aggregate_policy(
+    continuous_aggregate => 'measurement_co2_aggregation_1_hour',
+    start_offset => '10 days',
+    end_offset => '1 hour',
+    schedule_interval => '1 hour');
+
+
+CREATE MATERIALIZED VIEW measurement_co2_aggregation_1_day
+WITH (timescaledb.continuous, timescaledb.materialized_only = true) AS
+    SELECT
+        sensor_identifier,
+        time_bucket('1 day', bucket_timestamp) AS bucket_timestamp,
+        min(gmp343_raw_minimum) AS gmp343_raw_minimum,
+        max(gmp343_raw_maximum) AS gmp343_raw_maximum,
+        sum(gmp343_raw_average * gmp343_raw_count) / nullif(sum(gmp343_raw_count), 0) AS gmp343_raw_average,
+        sum(gmp343_raw_count)::BIGINT AS gmp343_raw_count,
+        min(gmp343_compensated_minimum) AS gmp343_compensated_minimum,
+        max(gmp343_compensated_maximum) AS gmp343_compensated_maximum,
+        sum(gmp343_compensated_average * gmp343_compensated_count) / nullif(sum(gmp343_compensated_count), 0) AS gmp343_compensated_average,
+        sum(gmp343_compensated_count)::BIGINT AS gmp343_compensated_count,
+        min(gmp343_filtered_minimum) AS gmp343_filtered_minimum,
+        max(gmp343_filtered_maximum) AS gmp343_filtered_maximum,
+        sum(gmp343_filtered_average * gmp343_filtered_count) / nullif(sum(gmp343_filtered_count), 0) AS gmp343_filtered_average,
+        sum(gmp343_filtered_count)::BIGINT AS gmp343_filtered_count,
+        min(gmp343_temperature_minimum) AS gmp343_temperature_minimum,
+        max(gmp343_temperature_maximum) AS gmp343_temperature_maximum,
+        sum(gmp343_temperature_average * gmp343_temperature_count) / nullif(sum(gmp343_temperature_count), 0) AS gmp343_temperature_average,
+        sum(gmp343_temperature_count)::BIGINT AS gmp343_temperature_count,
+        min(bme280_temperature_minimum) AS bme280_temperature_minimum,
+        max(bme280_temperature_maximum) AS bme280_temperature_maximum,
+        sum(bme280_temperature_average * bme280_temperature_count) / nullif(sum(bme280_temperature_count), 0) AS bme280_temperature_average,
+        sum(bme280_temperature_count)::BIGINT AS bme280_temperature_count,
+        min(bme280_humidity_minimum) AS bme280_humidity_minimum,
+        max(bme280_humidity_maximum) AS bme280_humidity_maximum,
+        sum(bme280_humidity_average * bme280_humidity_count) / nullif(sum(bme280_humidity_count), 0) AS bme280_humidity_average,
+        sum(bme280_humidity_count)::BIGINT AS bme280_humidity_count,
+        min(bme280_pressure_minimum) AS bme280_pressure_minimum,
+        max(bme280_pressure_maximum) AS bme280_pressure_maximum,
+        sum(bme280_pressure_average * bme280_pressure_count) / nullif(sum(bme280_pressure_count), 0) AS bme280_pressure_average,
+        sum(bme280_pressure_count)::BIGINT AS bme280_pressure_count,
+        min(sht45_temperature_minimum) AS sht45_temperature_minimum,
+        max(sht45_temperature_maximum) AS sht45_temperature_maximum,
+        sum(sht45_temperature_average * sht45_temperature_count) / nullif(sum(sht45_temperature_count), 0) AS sht45_temperature_average,
+        sum(sht45_temperature_count)::BIGINT AS sht45_temperature_count,
+        min(sht45_humidity_minimum) AS sht45_humidity_minimum,
+        max(sht45_humidity_maximum) AS sht45_humidity_maximum,
+        sum(sht45_humidity_average * sht45_humidity_count) / nullif(sum(sht45_humidity_count), 0) AS sht45_humidity_average,
+        sum(sht45_humidity_count)::BIGINT AS sht45_humidity_count
+    FROM measurement_co2_aggregation_1_hour
+    GROUP BY sensor_identifier, time_bucket('1 day', bucket_timestamp)
+WITH NO DATA;
+
+SELECT add_continuous_aggregate_policy(
+    continuous_aggregate => 'measurement_co2_aggregation_1_day',
+    start_offset => '10 days',
+    end_offset => '1 day',
+    schedule_interval => '1 day');
+
+
+CREATE MATERIALIZED VIEW measurement_calibration_aggregation_1_minute
+WITH (timescaledb.continuous, timescaledb.materialized_only = true) AS
+    SELECT
+        sensor_identifier,
+        time_bucket('1 minute', creation_timestamp) AS bucket_timestamp,
+        min(cal_bottle_id) AS cal_bottle_id_minimum,
+        max(cal_bottle_id) AS cal_bottle_id_maximum,
+        avg(cal_bottle_id) AS cal_bottle_id_average,
+        count(cal_bottle_id) AS cal_bottle_id_count,
+        min(cal_gmp343_raw) AS cal_gmp343_raw_minimum,
+        max(cal_gmp343_raw) AS cal_gmp343_raw_maximum,
+        avg(cal_gmp343_raw) AS cal_gmp343_raw_average,
+        count(cal_gmp343_raw) AS cal_gmp343_raw_count,
+        min(cal_gmp343_compensated) AS cal_gmp343_compensated_minimum,
+        max(cal_gmp343_compensated) AS cal_gmp343_compensated_maximum,
+        avg(cal_gmp343_compensated) AS cal_gmp343_compensated_average,
+        count(cal_gmp343_compensated) AS cal_gmp343_compensated_count,
+        min(cal_gmp343_filtered) AS cal_gmp343_filtered_minimum,
+        max(cal_gmp343_filtered) AS cal_gmp343_filtered_maximum,
+        avg(cal_gmp343_filtered) AS cal_gmp343_filtered_average,
+        count(cal_gmp343_filtered) AS cal_gmp343_filtered_count,
+        min(cal_gmp343_temperature) AS cal_gmp343_temperature_minimum,
+        max(cal_gmp343_temperature) AS cal_gmp343_temperature_maximum,
+        avg(cal_gmp343_temperature) AS cal_gmp343_temperature_average,
+        count(cal_gmp343_temperature) AS cal_gmp343_temperature_count,
+        min(cal_bme280_temperature) AS cal_bme280_temperature_minimum,
+        max(cal_bme280_temperature) AS cal_bme280_temperature_maximum,
+        avg(cal_bme280_temperature) AS cal_bme280_temperature_average,
+        count(cal_bme280_temperature) AS cal_bme280_temperature_count,
+        min(cal_bme280_humidity) AS cal_bme280_humidity_minimum,
+        max(cal_bme280_humidity) AS cal_bme280_humidity_maximum,
+        avg(cal_bme280_humidity) AS cal_bme280_humidity_average,
+        count(cal_bme280_humidity) AS cal_bme280_humidity_count,
+        min(cal_bme280_pressure) AS cal_bme280_pressure_minimum,
+        max(cal_bme280_pressure) AS cal_bme280_pressure_maximum,
+        avg(cal_bme280_pressure) AS cal_bme280_pressure_average,
+        count(cal_bme280_pressure) AS cal_bme280_pressure_count,
+        min(cal_sht45_temperature) AS cal_sht45_temperature_minimum,
+        max(cal_sht45_temperature) AS cal_sht45_temperature_maximum,
+        avg(cal_sht45_temperature) AS cal_sht45_temperature_average,
+        count(cal_sht45_temperature) AS cal_sht45_temperature_count,
+        min(cal_sht45_humidity) AS cal_sht45_humidity_minimum,
+        max(cal_sht45_humidity) AS cal_sht45_humidity_maximum,
+        avg(cal_sht45_humidity) AS cal_sht45_humidity_average,
+        count(cal_sht45_humidity) AS cal_sht45_humidity_count
+    FROM measurement_calibration
+    GROUP BY sensor_identifier, bucket_timestamp
+WITH NO DATA;
+
+SELECT add_continuous_aggregate_policy(
+    continuous_aggregate => 'measurement_calibration_aggregation_1_minute',
+    start_offset => '10 days',
+    end_offset => '1 minute',
+    schedule_interval => '1 minute');
+
+
+CREATE MATERIALIZED VIEW measurement_calibration_aggregation_10_minutes
+WITH (timescaledb.continuous, timescaledb.materialized_only = true) AS
+    SELECT
+        sensor_identifier,
+        time_bucket('10 minutes', bucket_timestamp) AS bucket_timestamp,
+        min(cal_bottle_id_minimum) AS cal_bottle_id_minimum,
+        max(cal_bottle_id_maximum) AS cal_bottle_id_maximum,
+        sum(cal_bottle_id_average * cal_bottle_id_count) / nullif(sum(cal_bottle_id_count), 0) AS cal_bottle_id_average,
+        sum(cal_bottle_id_count)::BIGINT AS cal_bottle_id_count,
+        min(cal_gmp343_raw_minimum) AS cal_gmp343_raw_minimum,
+        max(cal_gmp343_raw_maximum) AS cal_gmp343_raw_maximum,
+        sum(cal_gmp343_raw_average * cal_gmp343_raw_count) / nullif(sum(cal_gmp343_raw_count), 0) AS cal_gmp343_raw_average,
+        sum(cal_gmp343_raw_count)::BIGINT AS cal_gmp343_raw_count,
+        min(cal_gmp343_compensated_minimum) AS cal_gmp343_compensated_minimum,
+        max(cal_gmp343_compensated_maximum) AS cal_gmp343_compensated_maximum,
+        sum(cal_gmp343_compensated_average * cal_gmp343_compensated_count) / nullif(sum(cal_gmp343_compensated_count), 0) AS cal_gmp343_compensated_average,
+        sum(cal_gmp343_compensated_count)::BIGINT AS cal_gmp343_compensated_count,
+        min(cal_gmp343_filtered_minimum) AS cal_gmp343_filtered_minimum,
+        max(cal_gmp343_filtered_maximum) AS cal_gmp343_filtered_maximum,
+        sum(cal_gmp343_filtered_average * cal_gmp343_filtered_count) / nullif(sum(cal_gmp343_filtered_count), 0) AS cal_gmp343_filtered_average,
+        sum(cal_gmp343_filtered_count)::BIGINT AS cal_gmp343_filtered_count,
+        min(cal_gmp343_temperature_minimum) AS cal_gmp343_temperature_minimum,
+        max(cal_gmp343_temperature_maximum) AS cal_gmp343_temperature_maximum,
+        sum(cal_gmp343_temperature_average * cal_gmp343_temperature_count) / nullif(sum(cal_gmp343_temperature_count), 0) AS cal_gmp343_temperature_average,
+        sum(cal_gmp343_temperature_count)::BIGINT AS cal_gmp343_temperature_count,
+        min(cal_bme280_temperature_minimum) AS cal_bme280_temperature_minimum,
+        max(cal_bme280_temperature_maximum) AS cal_bme280_temperature_maximum,
+        sum(cal_bme280_temperature_average * cal_bme280_temperature_count) / nullif(sum(cal_bme280_temperature_count), 0) AS cal_bme280_temperature_average,
+        sum(cal_bme280_temperature_count)::BIGINT AS cal_bme280_temperature_count,
+        min(cal_bme280_humidity_minimum) AS cal_bme280_humidity_minimum,
+        max(cal_bme280_humidity_maximum) AS cal_bme280_humidity_maximum,
+        sum(cal_bme280_humidity_average * cal_bme280_humidity_count) / nullif(sum(cal_bme280_humidity_count), 0) AS cal_bme280_humidity_average,
+        sum(cal_bme280_humidity_count)::BIGINT AS cal_bme280_humidity_count,
+        min(cal_bme280_pressure_minimum) AS cal_bme280_pressure_minimum,
+        max(cal_bme280_pressure_maximum) AS cal_bme280_pressure_maximum,
+        sum(cal_bme280_pressure_average * cal_bme280_pressure_count) / nullif(sum(cal_bme280_pressure_count), 0) AS cal_bme280_pressure_average,
+        sum(cal_bme280_pressure_count)::BIGINT AS cal_bme280_pressure_count,
+        min(cal_sht45_temperature_minimum) AS cal_sht45_temperature_minimum,
+        max(cal_sht45_temperature_maximum) AS cal_sht45_temperature_maximum,
+        sum(cal_sht45_temperature_average * cal_sht45_temperature_count) / nullif(sum(cal_sht45_temperature_count), 0) AS cal_sht45_temperature_average,
+        sum(cal_sht45_temperature_count)::BIGINT AS cal_sht45_temperature_count,
+        min(cal_sht45_humidity_minimum) AS cal_sht45_humidity_minimum,
+        max(cal_sht45_humidity_maximum) AS cal_sht45_humidity_maximum,
+        sum(cal_sht45_humidity_average * cal_sht45_humidity_count) / nullif(sum(cal_sht45_humidity_count), 0) AS cal_sht45_humidity_average,
+        sum(cal_sht45_humidity_count)::BIGINT AS cal_sht45_humidity_count
+    FROM measurement_calibration_aggregation_1_minute
+    GROUP BY sensor_identifier, time_bucket('10 minutes', bucket_timestamp)
+WITH NO DATA;
+
+SELECT add_continuous_aggregate_policy(
+    continuous_aggregate => 'measurement_calibration_aggregation_10_minutes',
+    start_offset => '10 days',
+    end_offset => '10 minutes',
+    schedule_interval => '10 minutes');
+
+
+CREATE MATERIALIZED VIEW measurement_calibration_aggregation_1_hour
+WITH (timescaledb.continuous, timescaledb.materialized_only = true) AS
+    SELECT
+        sensor_identifier,
+        time_bucket('1 hour', bucket_timestamp) AS bucket_timestamp,
+        min(cal_bottle_id_minimum) AS cal_bottle_id_minimum,
+        max(cal_bottle_id_maximum) AS cal_bottle_id_maximum,
+        sum(cal_bottle_id_average * cal_bottle_id_count) / nullif(sum(cal_bottle_id_count), 0) AS cal_bottle_id_average,
+        sum(cal_bottle_id_count)::BIGINT AS cal_bottle_id_count,
+        min(cal_gmp343_raw_minimum) AS cal_gmp343_raw_minimum,
+        max(cal_gmp343_raw_maximum) AS cal_gmp343_raw_maximum,
+        sum(cal_gmp343_raw_average * cal_gmp343_raw_count) / nullif(sum(cal_gmp343_raw_count), 0) AS cal_gmp343_raw_average,
+        sum(cal_gmp343_raw_count)::BIGINT AS cal_gmp343_raw_count,
+        min(cal_gmp343_compensated_minimum) AS cal_gmp343_compensated_minimum,
+        max(cal_gmp343_compensated_maximum) AS cal_gmp343_compensated_maximum,
+        sum(cal_gmp343_compensated_average * cal_gmp343_compensated_count) / nullif(sum(cal_gmp343_compensated_count), 0) AS cal_gmp343_compensated_average,
+        sum(cal_gmp343_compensated_count)::BIGINT AS cal_gmp343_compensated_count,
+        min(cal_gmp343_filtered_minimum) AS cal_gmp343_filtered_minimum,
+        max(cal_gmp343_filtered_maximum) AS cal_gmp343_filtered_maximum,
+        sum(cal_gmp343_filtered_average * cal_gmp343_filtered_count) / nullif(sum(cal_gmp343_filtered_count), 0) AS cal_gmp343_filtered_average,
+        sum(cal_gmp343_filtered_count)::BIGINT AS cal_gmp343_filtered_count,
+        min(cal_gmp343_temperature_minimum) AS cal_gmp343_temperature_minimum,
+        max(cal_gmp343_temperature_maximum) AS cal_gmp343_temperature_maximum,
+        sum(cal_gmp343_temperature_average * cal_gmp343_temperature_count) / nullif(sum(cal_gmp343_temperature_count), 0) AS cal_gmp343_temperature_average,
+        sum(cal_gmp343_temperature_count)::BIGINT AS cal_gmp343_temperature_count,
+        min(cal_bme280_temperature_minimum) AS cal_bme280_temperature_minimum,
+        max(cal_bme280_temperature_maximum) AS cal_bme280_temperature_maximum,
+        sum(cal_bme280_temperature_average * cal_bme280_temperature_count) / nullif(sum(cal_bme280_temperature_count), 0) AS cal_bme280_temperature_average,
+        sum(cal_bme280_temperature_count)::BIGINT AS cal_bme280_temperature_count,
+        min(cal_bme280_humidity_minimum) AS cal_bme280_humidity_minimum,
+        max(cal_bme280_humidity_maximum) AS cal_bme280_humidity_maximum,
+        sum(cal_bme280_humidity_average * cal_bme280_humidity_count) / nullif(sum(cal_bme280_humidity_count), 0) AS cal_bme280_humidity_average,
+        sum(cal_bme280_humidity_count)::BIGINT AS cal_bme280_humidity_count,
+        min(cal_bme280_pressure_minimum) AS cal_bme280_pressure_minimum,
+        max(cal_bme280_pressure_maximum) AS cal_bme280_pressure_maximum,
+        sum(cal_bme280_pressure_average * cal_bme280_pressure_count) / nullif(sum(cal_bme280_pressure_count), 0) AS cal_bme280_pressure_average,
+        sum(cal_bme280_pressure_count)::BIGINT AS cal_bme280_pressure_count,
+        min(cal_sht45_temperature_minimum) AS cal_sht45_temperature_minimum,
+        max(cal_sht45_temperature_maximum) AS cal_sht45_temperature_maximum,
+        sum(cal_sht45_temperature_average * cal_sht45_temperature_count) / nullif(sum(cal_sht45_temperature_count), 0) AS cal_sht45_temperature_average,
+        sum(cal_sht45_temperature_count)::BIGINT AS cal_sht45_temperature_count,
+        min(cal_sht45_humidity_minimum) AS cal_sht45_humidity_minimum,
+        max(cal_sht45_humidity_maximum) AS cal_sht45_humidity_maximum,
+        sum(cal_sht45_humidity_average * cal_sht45_humidity_count) / nullif(sum(cal_sht45_humidity_count), 0) AS cal_sht45_humidity_average,
+        sum(cal_sht45_humidity_count)::BIGINT AS cal_sht45_humidity_count
+    FROM measurement_calibration_aggregation_10_minutes
+    GROUP BY sensor_identifier, time_bucket('1 hour', bucket_timestamp)
+WITH NO DATA;
+
+SELECT add_continuous_aggregate_policy(
+    continuous_aggregate => 'measurement_calibration_aggregation_1_hour',
+    start_offset => '10 days',
+    end_offset => '1 hour',
+    schedule_interval => '1 hour');
+
+
+CREATE MATERIALIZED VIEW measurement_calibration_aggregation_1_day
+WITH (timescaledb.continuous, timescaledb.materialized_only = true) AS
+    SELECT
+        sensor_identifier,
+        time_bucket('1 day', bucket_timestamp) AS bucket_timestamp,
+        min(cal_bottle_id_minimum) AS cal_bottle_id_minimum,
+        max(cal_bottle_id_maximum) AS cal_bottle_id_maximum,
+        sum(cal_bottle_id_average * cal_bottle_id_count) / nullif(sum(cal_bottle_id_count), 0) AS cal_bottle_id_average,
+        sum(cal_bottle_id_count)::BIGINT AS cal_bottle_id_count,
+        min(cal_gmp343_raw_minimum) AS cal_gmp343_raw_minimum,
+        max(cal_gmp343_raw_maximum) AS cal_gmp343_raw_maximum,
+        sum(cal_gmp343_raw_average * cal_gmp343_raw_count) / nullif(sum(cal_gmp343_raw_count), 0) AS cal_gmp343_raw_average,
+        sum(cal_gmp343_raw_count)::BIGINT AS cal_gmp343_raw_count,
+        min(cal_gmp343_compensated_minimum) AS cal_gmp343_compensated_minimum,
+        max(cal_gmp343_compensated_maximum) AS cal_gmp343_compensated_maximum,
+        sum(cal_gmp343_compensated_average * cal_gmp343_compensated_count) / nullif(sum(cal_gmp343_compensated_count), 0) AS cal_gmp343_compensated_average,
+        sum(cal_gmp343_compensated_count)::BIGINT AS cal_gmp343_compensated_count,
+        min(cal_gmp343_filtered_minimum) AS cal_gmp343_filtered_minimum,
+        max(cal_gmp343_filtered_maximum) AS cal_gmp343_filtered_maximum,
+        sum(cal_gmp343_filtered_average * cal_gmp343_filtered_count) / nullif(sum(cal_gmp343_filtered_count), 0) AS cal_gmp343_filtered_average,
+        sum(cal_gmp343_filtered_count)::BIGINT AS cal_gmp343_filtered_count,
+        min(cal_gmp343_temperature_minimum) AS cal_gmp343_temperature_minimum,
+        max(cal_gmp343_temperature_maximum) AS cal_gmp343_temperature_maximum,
+        sum(cal_gmp343_temperature_average * cal_gmp343_temperature_count) / nullif(sum(cal_gmp343_temperature_count), 0) AS cal_gmp343_temperature_average,
+        sum(cal_gmp343_temperature_count)::BIGINT AS cal_gmp343_temperature_count,
+        min(cal_bme280_temperature_minimum) AS cal_bme280_temperature_minimum,
+        max(cal_bme280_temperature_maximum) AS cal_bme280_temperature_maximum,
+        sum(cal_bme280_temperature_average * cal_bme280_temperature_count) / nullif(sum(cal_bme280_temperature_count), 0) AS cal_bme280_temperature_average,
+        sum(cal_bme280_temperature_count)::BIGINT AS cal_bme280_temperature_count,
+        min(cal_bme280_humidity_minimum) AS cal_bme280_humidity_minimum,
+        max(cal_bme280_humidity_maximum) AS cal_bme280_humidity_maximum,
+        sum(cal_bme280_humidity_average * cal_bme280_humidity_count) / nullif(sum(cal_bme280_humidity_count), 0) AS cal_bme280_humidity_average,
+        sum(cal_bme280_humidity_count)::BIGINT AS cal_bme280_humidity_count,
+        min(cal_bme280_pressure_minimum) AS cal_bme280_pressure_minimum,
+        max(cal_bme280_pressure_maximum) AS cal_bme280_pressure_maximum,
+        sum(cal_bme280_pressure_average * cal_bme280_pressure_count) / nullif(sum(cal_bme280_pressure_count), 0) AS cal_bme280_pressure_average,
+        sum(cal_bme280_pressure_count)::BIGINT AS cal_bme280_pressure_count,
+        min(cal_sht45_temperature_minimum) AS cal_sht45_temperature_minimum,
+        max(cal_sht45_temperature_maximum) AS cal_sht45_temperature_maximum,
+        sum(cal_sht45_temperature_average * cal_sht45_temperature_count) / nullif(sum(cal_sht45_temperature_count), 0) AS cal_sht45_temperature_average,
+        sum(cal_sht45_temperature_count)::BIGINT AS cal_sht45_temperature_count,
+        min(cal_sht45_humidity_minimum) AS cal_sht45_humidity_minimum,
+        max(cal_sht45_humidity_maximum) AS cal_sht45_humidity_maximum,
+        sum(cal_sht45_humidity_average * cal_sht45_humidity_count) / nullif(sum(cal_sht45_humidity_count), 0) AS cal_sht45_humidity_average,
+        sum(cal_sht45_humidity_count)::BIGINT AS cal_sht45_humidity_count
+    FROM measurement_calibration_aggregation_1_hour
+    GROUP BY sensor_identifier, time_bucket('1 day', bucket_timestamp)
+WITH NO DATA;
+
+SELECT add_continuous_aggregate_policy(
+    continuous_aggregate => 'measurement_calibration_aggregation_1_day',
+    start_offset => '10 days',
+    end_offset => '1 day',
+    schedule_interval => '1 day');
+
+
+CREATE MATERIALIZED VIEW measurement_system_aggregation_1_minute
+WITH (timescaledb.continuous, timescaledb.materialized_only = true) AS
+    SELECT
+        sensor_identifier,
+        time_bucket('1 minute', creation_timestamp) AS bucket_timestamp,
+        min(enclosure_bme280_temperature) AS enclosure_bme280_temperature_minimum,
+        max(enclosure_bme280_temperature) AS enclosure_bme280_temperature_maximum,
+        avg(enclosure_bme280_temperature) AS enclosure_bme280_temperature_average,
+        count(enclosure_bme280_temperature) AS enclosure_bme280_temperature_count,
+        min(enclosure_bme280_humidity) AS enclosure_bme280_humidity_minimum,
+        max(enclosure_bme280_humidity) AS enclosure_bme280_humidity_maximum,
+        avg(enclosure_bme280_humidity) AS enclosure_bme280_humidity_average,
+        count(enclosure_bme280_humidity) AS enclosure_bme280_humidity_count,
+        min(enclosure_bme280_pressure) AS enclosure_bme280_pressure_minimum,
+        max(enclosure_bme280_pressure) AS enclosure_bme280_pressure_maximum,
+        avg(enclosure_bme280_pressure) AS enclosure_bme280_pressure_average,
+        count(enclosure_bme280_pressure) AS enclosure_bme280_pressure_count,
+        min(raspi_cpu_temperature) AS raspi_cpu_temperature_minimum,
+        max(raspi_cpu_temperature) AS raspi_cpu_temperature_maximum,
+        avg(raspi_cpu_temperature) AS raspi_cpu_temperature_average,
+        count(raspi_cpu_temperature) AS raspi_cpu_temperature_count,
+        min(raspi_disk_usage) AS raspi_disk_usage_minimum,
+        max(raspi_disk_usage) AS raspi_disk_usage_maximum,
+        avg(raspi_disk_usage) AS raspi_disk_usage_average,
+        count(raspi_disk_usage) AS raspi_disk_usage_count,
+        min(raspi_cpu_usage) AS raspi_cpu_usage_minimum,
+        max(raspi_cpu_usage) AS raspi_cpu_usage_maximum,
+        avg(raspi_cpu_usage) AS raspi_cpu_usage_average,
+        count(raspi_cpu_usage) AS raspi_cpu_usage_count,
+        min(raspi_memory_usage) AS raspi_memory_usage_minimum,
+        max(raspi_memory_usage) AS raspi_memory_usage_maximum,
+        avg(raspi_memory_usage) AS raspi_memory_usage_average,
+        count(raspi_memory_usage) AS raspi_memory_usage_count,
+        min(ups_powered_by_grid) AS ups_powered_by_grid_minimum,
+        max(ups_powered_by_grid) AS ups_powered_by_grid_maximum,
+        avg(ups_powered_by_grid) AS ups_powered_by_grid_average,
+        count(ups_powered_by_grid) AS ups_powered_by_grid_count,
+        min(ups_battery_is_fully_charged) AS ups_battery_is_fully_charged_minimum,
+        max(ups_battery_is_fully_charged) AS ups_battery_is_fully_charged_maximum,
+        avg(ups_battery_is_fully_charged) AS ups_battery_is_fully_charged_average,
+        count(ups_battery_is_fully_charged) AS ups_battery_is_fully_charged_count,
+        min(ups_battery_error_detected) AS ups_battery_error_detected_minimum,
+        max(ups_battery_error_detected) AS ups_battery_error_detected_maximum,
+        avg(ups_battery_error_detected) AS ups_battery_error_detected_average,
+        count(ups_battery_error_detected) AS ups_battery_error_detected_count,
+        min(ups_battery_above_voltage_threshold) AS ups_battery_above_voltage_threshold_minimum,
+        max(ups_battery_above_voltage_threshold) AS ups_battery_above_voltage_threshold_maximum,
+        avg(ups_battery_above_voltage_threshold) AS ups_battery_above_voltage_threshold_average,
+        count(ups_battery_above_voltage_threshold) AS ups_battery_above_voltage_threshold_count
+    FROM measurement_system
+    GROUP BY sensor_identifier, bucket_timestamp
+WITH NO DATA;
+
+SELECT add_continuous_aggregate_policy(
+    continuous_aggregate => 'measurement_system_aggregation_1_minute',
+    start_offset => '10 days',
+    end_offset => '1 minute',
+    schedule_interval => '1 minute');
+
+
+CREATE MATERIALIZED VIEW measurement_system_aggregation_10_minutes
+WITH (timescaledb.continuous, timescaledb.materialized_only = true) AS
+    SELECT
+        sensor_identifier,
+        time_bucket('10 minutes', bucket_timestamp) AS bucket_timestamp,
+        min(enclosure_bme280_temperature_minimum) AS enclosure_bme280_temperature_minimum,
+        max(enclosure_bme280_temperature_maximum) AS enclosure_bme280_temperature_maximum,
+        sum(enclosure_bme280_temperature_average * enclosure_bme280_temperature_count) / nullif(sum(enclosure_bme280_temperature_count), 0) AS enclosure_bme280_temperature_average,
+        sum(enclosure_bme280_temperature_count)::BIGINT AS enclosure_bme280_temperature_count,
+        min(enclosure_bme280_humidity_minimum) AS enclosure_bme280_humidity_minimum,
+        max(enclosure_bme280_humidity_maximum) AS enclosure_bme280_humidity_maximum,
+        sum(enclosure_bme280_humidity_average * enclosure_bme280_humidity_count) / nullif(sum(enclosure_bme280_humidity_count), 0) AS enclosure_bme280_humidity_average,
+        sum(enclosure_bme280_humidity_count)::BIGINT AS enclosure_bme280_humidity_count,
+        min(enclosure_bme280_pressure_minimum) AS enclosure_bme280_pressure_minimum,
+        max(enclosure_bme280_pressure_maximum) AS enclosure_bme280_pressure_maximum,
+        sum(enclosure_bme280_pressure_average * enclosure_bme280_pressure_count) / nullif(sum(enclosure_bme280_pressure_count), 0) AS enclosure_bme280_pressure_average,
+        sum(enclosure_bme280_pressure_count)::BIGINT AS enclosure_bme280_pressure_count,
+        min(raspi_cpu_temperature_minimum) AS raspi_cpu_temperature_minimum,
+        max(raspi_cpu_temperature_maximum) AS raspi_cpu_temperature_maximum,
+        sum(raspi_cpu_temperature_average * raspi_cpu_temperature_count) / nullif(sum(raspi_cpu_temperature_count), 0) AS raspi_cpu_temperature_average,
+        sum(raspi_cpu_temperature_count)::BIGINT AS raspi_cpu_temperature_count,
+        min(raspi_disk_usage_minimum) AS raspi_disk_usage_minimum,
+        max(raspi_disk_usage_maximum) AS raspi_disk_usage_maximum,
+        sum(raspi_disk_usage_average * raspi_disk_usage_count) / nullif(sum(raspi_disk_usage_count), 0) AS raspi_disk_usage_average,
+        sum(raspi_disk_usage_count)::BIGINT AS raspi_disk_usage_count,
+        min(raspi_cpu_usage_minimum) AS raspi_cpu_usage_minimum,
+        max(raspi_cpu_usage_maximum) AS raspi_cpu_usage_maximum,
+        sum(raspi_cpu_usage_average * raspi_cpu_usage_count) / nullif(sum(raspi_cpu_usage_count), 0) AS raspi_cpu_usage_average,
+        sum(raspi_cpu_usage_count)::BIGINT AS raspi_cpu_usage_count,
+        min(raspi_memory_usage_minimum) AS raspi_memory_usage_minimum,
+        max(raspi_memory_usage_maximum) AS raspi_memory_usage_maximum,
+        sum(raspi_memory_usage_average * raspi_memory_usage_count) / nullif(sum(raspi_memory_usage_count), 0) AS raspi_memory_usage_average,
+        sum(raspi_memory_usage_count)::BIGINT AS raspi_memory_usage_count,
+        min(ups_powered_by_grid_minimum) AS ups_powered_by_grid_minimum,
+        max(ups_powered_by_grid_maximum) AS ups_powered_by_grid_maximum,
+        sum(ups_powered_by_grid_average * ups_powered_by_grid_count) / nullif(sum(ups_powered_by_grid_count), 0) AS ups_powered_by_grid_average,
+        sum(ups_powered_by_grid_count)::BIGINT AS ups_powered_by_grid_count,
+        min(ups_battery_is_fully_charged_minimum) AS ups_battery_is_fully_charged_minimum,
+        max(ups_battery_is_fully_charged_maximum) AS ups_battery_is_fully_charged_maximum,
+        sum(ups_battery_is_fully_charged_average * ups_battery_is_fully_charged_count) / nullif(sum(ups_battery_is_fully_charged_count), 0) AS ups_battery_is_fully_charged_average,
+        sum(ups_battery_is_fully_charged_count)::BIGINT AS ups_battery_is_fully_charged_count,
+        min(ups_battery_error_detected_minimum) AS ups_battery_error_detected_minimum,
+        max(ups_battery_error_detected_maximum) AS ups_battery_error_detected_maximum,
+        sum(ups_battery_error_detected_average * ups_battery_error_detected_count) / nullif(sum(ups_battery_error_detected_count), 0) AS ups_battery_error_detected_average,
+        sum(ups_battery_error_detected_count)::BIGINT AS ups_battery_error_detected_count,
+        min(ups_battery_above_voltage_threshold_minimum) AS ups_battery_above_voltage_threshold_minimum,
+        max(ups_battery_above_voltage_threshold_maximum) AS ups_battery_above_voltage_threshold_maximum,
+        sum(ups_battery_above_voltage_threshold_average * ups_battery_above_voltage_threshold_count) / nullif(sum(ups_battery_above_voltage_threshold_count), 0) AS ups_battery_above_voltage_threshold_average,
+        sum(ups_battery_above_voltage_threshold_count)::BIGINT AS ups_battery_above_voltage_threshold_count
+    FROM measurement_system_aggregation_1_minute
+    GROUP BY sensor_identifier, time_bucket('10 minutes', bucket_timestamp)
+WITH NO DATA;
+
+SELECT add_continuous_aggregate_policy(
+    continuous_aggregate => 'measurement_system_aggregation_10_minutes',
+    start_offset => '10 days',
+    end_offset => '10 minutes',
+    schedule_interval => '10 minutes');
+
+
+CREATE MATERIALIZED VIEW measurement_system_aggregation_1_hour
+WITH (timescaledb.continuous, timescaledb.materialized_only = true) AS
+    SELECT
+        sensor_identifier,
+        time_bucket('1 hour', bucket_timestamp) AS bucket_timestamp,
+        min(enclosure_bme280_temperature_minimum) AS enclosure_bme280_temperature_minimum,
+        max(enclosure_bme280_temperature_maximum) AS enclosure_bme280_temperature_maximum,
+        sum(enclosure_bme280_temperature_average * enclosure_bme280_temperature_count) / nullif(sum(enclosure_bme280_temperature_count), 0) AS enclosure_bme280_temperature_average,
+        sum(enclosure_bme280_temperature_count)::BIGINT AS enclosure_bme280_temperature_count,
+        min(enclosure_bme280_humidity_minimum) AS enclosure_bme280_humidity_minimum,
+        max(enclosure_bme280_humidity_maximum) AS enclosure_bme280_humidity_maximum,
+        sum(enclosure_bme280_humidity_average * enclosure_bme280_humidity_count) / nullif(sum(enclosure_bme280_humidity_count), 0) AS enclosure_bme280_humidity_average,
+        sum(enclosure_bme280_humidity_count)::BIGINT AS enclosure_bme280_humidity_count,
+        min(enclosure_bme280_pressure_minimum) AS enclosure_bme280_pressure_minimum,
+        max(enclosure_bme280_pressure_maximum) AS enclosure_bme280_pressure_maximum,
+        sum(enclosure_bme280_pressure_average * enclosure_bme280_pressure_count) / nullif(sum(enclosure_bme280_pressure_count), 0) AS enclosure_bme280_pressure_average,
+        sum(enclosure_bme280_pressure_count)::BIGINT AS enclosure_bme280_pressure_count,
+        min(raspi_cpu_temperature_minimum) AS raspi_cpu_temperature_minimum,
+        max(raspi_cpu_temperature_maximum) AS raspi_cpu_temperature_maximum,
+        sum(raspi_cpu_temperature_average * raspi_cpu_temperature_count) / nullif(sum(raspi_cpu_temperature_count), 0) AS raspi_cpu_temperature_average,
+        sum(raspi_cpu_temperature_count)::BIGINT AS raspi_cpu_temperature_count,
+        min(raspi_disk_usage_minimum) AS raspi_disk_usage_minimum,
+        max(raspi_disk_usage_maximum) AS raspi_disk_usage_maximum,
+        sum(raspi_disk_usage_average * raspi_disk_usage_count) / nullif(sum(raspi_disk_usage_count), 0) AS raspi_disk_usage_average,
+        sum(raspi_disk_usage_count)::BIGINT AS raspi_disk_usage_count,
+        min(raspi_cpu_usage_minimum) AS raspi_cpu_usage_minimum,
+        max(raspi_cpu_usage_maximum) AS raspi_cpu_usage_maximum,
+        sum(raspi_cpu_usage_average * raspi_cpu_usage_count) / nullif(sum(raspi_cpu_usage_count), 0) AS raspi_cpu_usage_average,
+        sum(raspi_cpu_usage_count)::BIGINT AS raspi_cpu_usage_count,
+        min(raspi_memory_usage_minimum) AS raspi_memory_usage_minimum,
+        max(raspi_memory_usage_maximum) AS raspi_memory_usage_maximum,
+        sum(raspi_memory_usage_average * raspi_memory_usage_count) / nullif(sum(raspi_memory_usage_count), 0) AS raspi_memory_usage_average,
+        sum(raspi_memory_usage_count)::BIGINT AS raspi_memory_usage_count,
+        min(ups_powered_by_grid_minimum) AS ups_powered_by_grid_minimum,
+        max(ups_powered_by_grid_maximum) AS ups_powered_by_grid_maximum,
+        sum(ups_powered_by_grid_average * ups_powered_by_grid_count) / nullif(sum(ups_powered_by_grid_count), 0) AS ups_powered_by_grid_average,
+        sum(ups_powered_by_grid_count)::BIGINT AS ups_powered_by_grid_count,
+        min(ups_battery_is_fully_charged_minimum) AS ups_battery_is_fully_charged_minimum,
+        max(ups_battery_is_fully_charged_maximum) AS ups_battery_is_fully_charged_maximum,
+        sum(ups_battery_is_fully_charged_average * ups_battery_is_fully_charged_count) / nullif(sum(ups_battery_is_fully_charged_count), 0) AS ups_battery_is_fully_charged_average,
+        sum(ups_battery_is_fully_charged_count)::BIGINT AS ups_battery_is_fully_charged_count,
+        min(ups_battery_error_detected_minimum) AS ups_battery_error_detected_minimum,
+        max(ups_battery_error_detected_maximum) AS ups_battery_error_detected_maximum,
+        sum(ups_battery_error_detected_average * ups_battery_error_detected_count) / nullif(sum(ups_battery_error_detected_count), 0) AS ups_battery_error_detected_average,
+        sum(ups_battery_error_detected_count)::BIGINT AS ups_battery_error_detected_count,
+        min(ups_battery_above_voltage_threshold_minimum) AS ups_battery_above_voltage_threshold_minimum,
+        max(ups_battery_above_voltage_threshold_maximum) AS ups_battery_above_voltage_threshold_maximum,
+        sum(ups_battery_above_voltage_threshold_average * ups_battery_above_voltage_threshold_count) / nullif(sum(ups_battery_above_voltage_threshold_count), 0) AS ups_battery_above_voltage_threshold_average,
+        sum(ups_battery_above_voltage_threshold_count)::BIGINT AS ups_battery_above_voltage_threshold_count
+    FROM measurement_system_aggregation_10_minutes
+    GROUP BY sensor_identifier, time_bucket('1 hour', bucket_timestamp)
+WITH NO DATA;
+
+SELECT add_continuous_aggregate_policy(
+    continuous_aggregate => 'measurement_system_aggregation_1_hour',
+    start_offset => '10 days',
+    end_offset => '1 hour',
+    schedule_interval => '1 hour');
+
+
+CREATE MATERIALIZED VIEW measurement_system_aggregation_1_day
+WITH (timescaledb.continuous, timescaledb.materialized_only = true) AS
+    SELECT
+        sensor_identifier,
+        time_bucket('1 day', bucket_timestamp) AS bucket_timestamp,
+        min(enclosure_bme280_temperature_minimum) AS enclosure_bme280_temperature_minimum,
+        max(enclosure_bme280_temperature_maximum) AS enclosure_bme280_temperature_maximum,
+        sum(enclosure_bme280_temperature_average * enclosure_bme280_temperature_count) / nullif(sum(enclosure_bme280_temperature_count), 0) AS enclosure_bme280_temperature_average,
+        sum(enclosure_bme280_temperature_count)::BIGINT AS enclosure_bme280_temperature_count,
+        min(enclosure_bme280_humidity_minimum) AS enclosure_bme280_humidity_minimum,
+        max(enclosure_bme280_humidity_maximum) AS enclosure_bme280_humidity_maximum,
+        sum(enclosure_bme280_humidity_average * enclosure_bme280_humidity_count) / nullif(sum(enclosure_bme280_humidity_count), 0) AS enclosure_bme280_humidity_average,
+        sum(enclosure_bme280_humidity_count)::BIGINT AS enclosure_bme280_humidity_count,
+        min(enclosure_bme280_pressure_minimum) AS enclosure_bme280_pressure_minimum,
+        max(enclosure_bme280_pressure_maximum) AS enclosure_bme280_pressure_maximum,
+        sum(enclosure_bme280_pressure_average * enclosure_bme280_pressure_count) / nullif(sum(enclosure_bme280_pressure_count), 0) AS enclosure_bme280_pressure_average,
+        sum(enclosure_bme280_pressure_count)::BIGINT AS enclosure_bme280_pressure_count,
+        min(raspi_cpu_temperature_minimum) AS raspi_cpu_temperature_minimum,
+        max(raspi_cpu_temperature_maximum) AS raspi_cpu_temperature_maximum,
+        sum(raspi_cpu_temperature_average * raspi_cpu_temperature_count) / nullif(sum(raspi_cpu_temperature_count), 0) AS raspi_cpu_temperature_average,
+        sum(raspi_cpu_temperature_count)::BIGINT AS raspi_cpu_temperature_count,
+        min(raspi_disk_usage_minimum) AS raspi_disk_usage_minimum,
+        max(raspi_disk_usage_maximum) AS raspi_disk_usage_maximum,
+        sum(raspi_disk_usage_average * raspi_disk_usage_count) / nullif(sum(raspi_disk_usage_count), 0) AS raspi_disk_usage_average,
+        sum(raspi_disk_usage_count)::BIGINT AS raspi_disk_usage_count,
+        min(raspi_cpu_usage_minimum) AS raspi_cpu_usage_minimum,
+        max(raspi_cpu_usage_maximum) AS raspi_cpu_usage_maximum,
+        sum(raspi_cpu_usage_average * raspi_cpu_usage_count) / nullif(sum(raspi_cpu_usage_count), 0) AS raspi_cpu_usage_average,
+        sum(raspi_cpu_usage_count)::BIGINT AS raspi_cpu_usage_count,
+        min(raspi_memory_usage_minimum) AS raspi_memory_usage_minimum,
+        max(raspi_memory_usage_maximum) AS raspi_memory_usage_maximum,
+        sum(raspi_memory_usage_average * raspi_memory_usage_count) / nullif(sum(raspi_memory_usage_count), 0) AS raspi_memory_usage_average,
+        sum(raspi_memory_usage_count)::BIGINT AS raspi_memory_usage_count,
+        min(ups_powered_by_grid_minimum) AS ups_powered_by_grid_minimum,
+        max(ups_powered_by_grid_maximum) AS ups_powered_by_grid_maximum,
+        sum(ups_powered_by_grid_average * ups_powered_by_grid_count) / nullif(sum(ups_powered_by_grid_count), 0) AS ups_powered_by_grid_average,
+        sum(ups_powered_by_grid_count)::BIGINT AS ups_powered_by_grid_count,
+        min(ups_battery_is_fully_charged_minimum) AS ups_battery_is_fully_charged_minimum,
+        max(ups_battery_is_fully_charged_maximum) AS ups_battery_is_fully_charged_maximum,
+        sum(ups_battery_is_fully_charged_average * ups_battery_is_fully_charged_count) / nullif(sum(ups_battery_is_fully_charged_count), 0) AS ups_battery_is_fully_charged_average,
+        sum(ups_battery_is_fully_charged_count)::BIGINT AS ups_battery_is_fully_charged_count,
+        min(ups_battery_error_detected_minimum) AS ups_battery_error_detected_minimum,
+        max(ups_battery_error_detected_maximum) AS ups_battery_error_detected_maximum,
+        sum(ups_battery_error_detected_average * ups_battery_error_detected_count) / nullif(sum(ups_battery_error_detected_count), 0) AS ups_battery_error_detected_average,
+        sum(ups_battery_error_detected_count)::BIGINT AS ups_battery_error_detected_count,
+        min(ups_battery_above_voltage_threshold_minimum) AS ups_battery_above_voltage_threshold_minimum,
+        max(ups_battery_above_voltage_threshold_maximum) AS ups_battery_above_voltage_threshold_maximum,
+        sum(ups_battery_above_voltage_threshold_average * ups_battery_above_voltage_threshold_count) / nullif(sum(ups_battery_above_voltage_threshold_count), 0) AS ups_battery_above_voltage_threshold_average,
+        sum(ups_battery_above_voltage_threshold_count)::BIGINT AS ups_battery_above_voltage_threshold_count
+    FROM measurement_system_aggregation_1_hour
+    GROUP BY sensor_identifier, time_bucket('1 day', bucket_timestamp)
+WITH NO DATA;
+
+SELECT add_continuous_aggregate_policy(
+    continuous_aggregate => 'measurement_system_aggregation_1_day',
+    start_offset => '10 days',
+    end_offset => '1 day',
+    schedule_interval => '1 day');
+
+
+CREATE MATERIALIZED VIEW measurement_wind_aggregation_1_minute
+WITH (timescaledb.continuous, timescaledb.materialized_only = true) AS
+    SELECT
+        sensor_identifier,
+        time_bucket('1 minute', creation_timestamp) AS bucket_timestamp,
+        min(wxt532_direction_min) AS wxt532_direction_min_minimum,
+        max(wxt532_direction_min) AS wxt532_direction_min_maximum,
+        avg(wxt532_direction_min) AS wxt532_direction_min_average,
+        count(wxt532_direction_min) AS wxt532_direction_min_count,
+        min(wxt532_direction_avg) AS wxt532_direction_avg_minimum,
+        max(wxt532_direction_avg) AS wxt532_direction_avg_maximum,
+        avg(wxt532_direction_avg) AS wxt532_direction_avg_average,
+        count(wxt532_direction_avg) AS wxt532_direction_avg_count,
+        min(wxt532_direction_max) AS wxt532_direction_max_minimum,
+        max(wxt532_direction_max) AS wxt532_direction_max_maximum,
+        avg(wxt532_direction_max) AS wxt532_direction_max_average,
+        count(wxt532_direction_max) AS wxt532_direction_max_count,
+        min(wxt532_speed_min) AS wxt532_speed_min_minimum,
+        max(wxt532_speed_min) AS wxt532_speed_min_maximum,
+        avg(wxt532_speed_min) AS wxt532_speed_min_average,
+        count(wxt532_speed_min) AS wxt532_speed_min_count,
+        min(wxt532_speed_avg) AS wxt532_speed_avg_minimum,
+        max(wxt532_speed_avg) AS wxt532_speed_avg_maximum,
+        avg(wxt532_speed_avg) AS wxt532_speed_avg_average,
+        count(wxt532_speed_avg) AS wxt532_speed_avg_count,
+        min(wxt532_speed_max) AS wxt532_speed_max_minimum,
+        max(wxt532_speed_max) AS wxt532_speed_max_maximum,
+        avg(wxt532_speed_max) AS wxt532_speed_max_average,
+        count(wxt532_speed_max) AS wxt532_speed_max_count,
+        min(wxt532_last_update_time) AS wxt532_last_update_time_minimum,
+        max(wxt532_last_update_time) AS wxt532_last_update_time_maximum,
+        avg(wxt532_last_update_time) AS wxt532_last_update_time_average,
+        count(wxt532_last_update_time) AS wxt532_last_update_time_count
+    FROM measurement_wind
+    GROUP BY sensor_identifier, bucket_timestamp
+WITH NO DATA;
+
+SELECT add_continuous_aggregate_policy(
+    continuous_aggregate => 'measurement_wind_aggregation_1_minute',
+    start_offset => '10 days',
+    end_offset => '1 minute',
+    schedule_interval => '1 minute');
+
+
+CREATE MATERIALIZED VIEW measurement_wind_aggregation_10_minutes
+WITH (timescaledb.continuous, timescaledb.materialized_only = true) AS
+    SELECT
+        sensor_identifier,
+        time_bucket('10 minutes', bucket_timestamp) AS bucket_timestamp,
+        min(wxt532_direction_min_minimum) AS wxt532_direction_min_minimum,
+        max(wxt532_direction_min_maximum) AS wxt532_direction_min_maximum,
+        sum(wxt532_direction_min_average * wxt532_direction_min_count) / nullif(sum(wxt532_direction_min_count), 0) AS wxt532_direction_min_average,
+        sum(wxt532_direction_min_count)::BIGINT AS wxt532_direction_min_count,
+        min(wxt532_direction_avg_minimum) AS wxt532_direction_avg_minimum,
+        max(wxt532_direction_avg_maximum) AS wxt532_direction_avg_maximum,
+        sum(wxt532_direction_avg_average * wxt532_direction_avg_count) / nullif(sum(wxt532_direction_avg_count), 0) AS wxt532_direction_avg_average,
+        sum(wxt532_direction_avg_count)::BIGINT AS wxt532_direction_avg_count,
+        min(wxt532_direction_max_minimum) AS wxt532_direction_max_minimum,
+        max(wxt532_direction_max_maximum) AS wxt532_direction_max_maximum,
+        sum(wxt532_direction_max_average * wxt532_direction_max_count) / nullif(sum(wxt532_direction_max_count), 0) AS wxt532_direction_max_average,
+        sum(wxt532_direction_max_count)::BIGINT AS wxt532_direction_max_count,
+        min(wxt532_speed_min_minimum) AS wxt532_speed_min_minimum,
+        max(wxt532_speed_min_maximum) AS wxt532_speed_min_maximum,
+        sum(wxt532_speed_min_average * wxt532_speed_min_count) / nullif(sum(wxt532_speed_min_count), 0) AS wxt532_speed_min_average,
+        sum(wxt532_speed_min_count)::BIGINT AS wxt532_speed_min_count,
+        min(wxt532_speed_avg_minimum) AS wxt532_speed_avg_minimum,
+        max(wxt532_speed_avg_maximum) AS wxt532_speed_avg_maximum,
+        sum(wxt532_speed_avg_average * wxt532_speed_avg_count) / nullif(sum(wxt532_speed_avg_count), 0) AS wxt532_speed_avg_average,
+        sum(wxt532_speed_avg_count)::BIGINT AS wxt532_speed_avg_count,
+        min(wxt532_speed_max_minimum) AS wxt532_speed_max_minimum,
+        max(wxt532_speed_max_maximum) AS wxt532_speed_max_maximum,
+        sum(wxt532_speed_max_average * wxt532_speed_max_count) / nullif(sum(wxt532_speed_max_count), 0) AS wxt532_speed_max_average,
+        sum(wxt532_speed_max_count)::BIGINT AS wxt532_speed_max_count,
+        min(wxt532_last_update_time_minimum) AS wxt532_last_update_time_minimum,
+        max(wxt532_last_update_time_maximum) AS wxt532_last_update_time_maximum,
+        sum(wxt532_last_update_time_average * wxt532_last_update_time_count) / nullif(sum(wxt532_last_update_time_count), 0) AS wxt532_last_update_time_average,
+        sum(wxt532_last_update_time_count)::BIGINT AS wxt532_last_update_time_count
+    FROM measurement_wind_aggregation_1_minute
+    GROUP BY sensor_identifier, time_bucket('10 minutes', bucket_timestamp)
+WITH NO DATA;
+
+SELECT add_continuous_aggregate_policy(
+    continuous_aggregate => 'measurement_wind_aggregation_10_minutes',
+    start_offset => '10 days',
+    end_offset => '10 minutes',
+    schedule_interval => '10 minutes');
+
+
+CREATE MATERIALIZED VIEW measurement_wind_aggregation_1_hour
+WITH (timescaledb.continuous, timescaledb.materialized_only = true) AS
+    SELECT
+        sensor_identifier,
+        time_bucket('1 hour', bucket_timestamp) AS bucket_timestamp,
+        min(wxt532_direction_min_minimum) AS wxt532_direction_min_minimum,
+        max(wxt532_direction_min_maximum) AS wxt532_direction_min_maximum,
+        sum(wxt532_direction_min_average * wxt532_direction_min_count) / nullif(sum(wxt532_direction_min_count), 0) AS wxt532_direction_min_average,
+        sum(wxt532_direction_min_count)::BIGINT AS wxt532_direction_min_count,
+        min(wxt532_direction_avg_minimum) AS wxt532_direction_avg_minimum,
+        max(wxt532_direction_avg_maximum) AS wxt532_direction_avg_maximum,
+        sum(wxt532_direction_avg_average * wxt532_direction_avg_count) / nullif(sum(wxt532_direction_avg_count), 0) AS wxt532_direction_avg_average,
+        sum(wxt532_direction_avg_count)::BIGINT AS wxt532_direction_avg_count,
+        min(wxt532_direction_max_minimum) AS wxt532_direction_max_minimum,
+        max(wxt532_direction_max_maximum) AS wxt532_direction_max_maximum,
+        sum(wxt532_direction_max_average * wxt532_direction_max_count) / nullif(sum(wxt532_direction_max_count), 0) AS wxt532_direction_max_average,
+        sum(wxt532_direction_max_count)::BIGINT AS wxt532_direction_max_count,
+        min(wxt532_speed_min_minimum) AS wxt532_speed_min_minimum,
+        max(wxt532_speed_min_maximum) AS wxt532_speed_min_maximum,
+        sum(wxt532_speed_min_average * wxt532_speed_min_count) / nullif(sum(wxt532_speed_min_count), 0) AS wxt532_speed_min_average,
+        sum(wxt532_speed_min_count)::BIGINT AS wxt532_speed_min_count,
+        min(wxt532_speed_avg_minimum) AS wxt532_speed_avg_minimum,
+        max(wxt532_speed_avg_maximum) AS wxt532_speed_avg_maximum,
+        sum(wxt532_speed_avg_average * wxt532_speed_avg_count) / nullif(sum(wxt532_speed_avg_count), 0) AS wxt532_speed_avg_average,
+        sum(wxt532_speed_avg_count)::BIGINT AS wxt532_speed_avg_count,
+        min(wxt532_speed_max_minimum) AS wxt532_speed_max_minimum,
+        max(wxt532_speed_max_maximum) AS wxt532_speed_max_maximum,
+        sum(wxt532_speed_max_average * wxt532_speed_max_count) / nullif(sum(wxt532_speed_max_count), 0) AS wxt532_speed_max_average,
+        sum(wxt532_speed_max_count)::BIGINT AS wxt532_speed_max_count,
+        min(wxt532_last_update_time_minimum) AS wxt532_last_update_time_minimum,
+        max(wxt532_last_update_time_maximum) AS wxt532_last_update_time_maximum,
+        sum(wxt532_last_update_time_average * wxt532_last_update_time_count) / nullif(sum(wxt532_last_update_time_count), 0) AS wxt532_last_update_time_average,
+        sum(wxt532_last_update_time_count)::BIGINT AS wxt532_last_update_time_count
+    FROM measurement_wind_aggregation_10_minutes
+    GROUP BY sensor_identifier, time_bucket('1 hour', bucket_timestamp)
+WITH NO DATA;
+
+SELECT add_continuous_aggregate_policy(
+    continuous_aggregate => 'measurement_wind_aggregation_1_hour',
+    start_offset => '10 days',
+    end_offset => '1 hour',
+    schedule_interval => '1 hour');
+
+
+CREATE MATERIALIZED VIEW measurement_wind_aggregation_1_day
+WITH (timescaledb.continuous, timescaledb.materialized_only = true) AS
+    SELECT
+        sensor_identifier,
+        time_bucket('1 day', bucket_timestamp) AS bucket_timestamp,
+        min(wxt532_direction_min_minimum) AS wxt532_direction_min_minimum,
+        max(wxt532_direction_min_maximum) AS wxt532_direction_min_maximum,
+        sum(wxt532_direction_min_average * wxt532_direction_min_count) / nullif(sum(wxt532_direction_min_count), 0) AS wxt532_direction_min_average,
+        sum(wxt532_direction_min_count)::BIGINT AS wxt532_direction_min_count,
+        min(wxt532_direction_avg_minimum) AS wxt532_direction_avg_minimum,
+        max(wxt532_direction_avg_maximum) AS wxt532_direction_avg_maximum,
+        sum(wxt532_direction_avg_average * wxt532_direction_avg_count) / nullif(sum(wxt532_direction_avg_count), 0) AS wxt532_direction_avg_average,
+        sum(wxt532_direction_avg_count)::BIGINT AS wxt532_direction_avg_count,
+        min(wxt532_direction_max_minimum) AS wxt532_direction_max_minimum,
+        max(wxt532_direction_max_maximum) AS wxt532_direction_max_maximum,
+        sum(wxt532_direction_max_average * wxt532_direction_max_count) / nullif(sum(wxt532_direction_max_count), 0) AS wxt532_direction_max_average,
+        sum(wxt532_direction_max_count)::BIGINT AS wxt532_direction_max_count,
+        min(wxt532_speed_min_minimum) AS wxt532_speed_min_minimum,
+        max(wxt532_speed_min_maximum) AS wxt532_speed_min_maximum,
+        sum(wxt532_speed_min_average * wxt532_speed_min_count) / nullif(sum(wxt532_speed_min_count), 0) AS wxt532_speed_min_average,
+        sum(wxt532_speed_min_count)::BIGINT AS wxt532_speed_min_count,
+        min(wxt532_speed_avg_minimum) AS wxt532_speed_avg_minimum,
+        max(wxt532_speed_avg_maximum) AS wxt532_speed_avg_maximum,
+        sum(wxt532_speed_avg_average * wxt532_speed_avg_count) / nullif(sum(wxt532_speed_avg_count), 0) AS wxt532_speed_avg_average,
+        sum(wxt532_speed_avg_count)::BIGINT AS wxt532_speed_avg_count,
+        min(wxt532_speed_max_minimum) AS wxt532_speed_max_minimum,
+        max(wxt532_speed_max_maximum) AS wxt532_speed_max_maximum,
+        sum(wxt532_speed_max_average * wxt532_speed_max_count) / nullif(sum(wxt532_speed_max_count), 0) AS wxt532_speed_max_average,
+        sum(wxt532_speed_max_count)::BIGINT AS wxt532_speed_max_count,
+        min(wxt532_last_update_time_minimum) AS wxt532_last_update_time_minimum,
+        max(wxt532_last_update_time_maximum) AS wxt532_last_update_time_maximum,
+        sum(wxt532_last_update_time_average * wxt532_last_update_time_count) / nullif(sum(wxt532_last_update_time_count), 0) AS wxt532_last_update_time_average,
+        sum(wxt532_last_update_time_count)::BIGINT AS wxt532_last_update_time_count
+    FROM measurement_wind_aggregation_1_hour
+    GROUP BY sensor_identifier, time_bucket('1 day', bucket_timestamp)
+WITH NO DATA;
+
+SELECT add_continuous_aggregate_policy(
+    continuous_aggregate => 'measurement_wind_aggregation_1_day',
+    start_offset => '10 days',
+    end_offset => '1 day',
+    schedule_interval => '1 day');
+
+
+CREATE MATERIALIZED VIEW measurement_wind_sensor_aggregation_1_minute
+WITH (timescaledb.continuous, timescaledb.materialized_only = true) AS
+    SELECT
+        sensor_identifier,
+        time_bucket('1 minute', creation_timestamp) AS bucket_timestamp,
+        min(wxt532_temperature) AS wxt532_temperature_minimum,
+        max(wxt532_temperature) AS wxt532_temperature_maximum,
+        avg(wxt532_temperature) AS wxt532_temperature_average,
+        count(wxt532_temperature) AS wxt532_temperature_count,
+        min(wxt532_heating_voltage) AS wxt532_heating_voltage_minimum,
+        max(wxt532_heating_voltage) AS wxt532_heating_voltage_maximum,
+        avg(wxt532_heating_voltage) AS wxt532_heating_voltage_average,
+        count(wxt532_heating_voltage) AS wxt532_heating_voltage_count,
+        min(wxt532_supply_voltage) AS wxt532_supply_voltage_minimum,
+        max(wxt532_supply_voltage) AS wxt532_supply_voltage_maximum,
+        avg(wxt532_supply_voltage) AS wxt532_supply_voltage_average,
+        count(wxt532_supply_voltage) AS wxt532_supply_voltage_count,
+        min(wxt532_reference_voltage) AS wxt532_reference_voltage_minimum,
+        max(wxt532_reference_voltage) AS wxt532_reference_voltage_maximum,
+        avg(wxt532_reference_voltage) AS wxt532_reference_voltage_average,
+        count(wxt532_reference_voltage) AS wxt532_reference_voltage_count,
+        min(wxt532_last_update_time) AS wxt532_last_update_time_minimum,
+        max(wxt532_last_update_time) AS wxt532_last_update_time_maximum,
+        avg(wxt532_last_update_time) AS wxt532_last_update_time_average,
+        count(wxt532_last_update_time) AS wxt532_last_update_time_count
+    FROM measurement_wind_sensor
+    GROUP BY sensor_identifier, bucket_timestamp
+WITH NO DATA;
+
+SELECT add_continuous_aggregate_policy(
+    continuous_aggregate => 'measurement_wind_sensor_aggregation_1_minute',
+    start_offset => '10 days',
+    end_offset => '1 minute',
+    schedule_interval => '1 minute');
+
+
+CREATE MATERIALIZED VIEW measurement_wind_sensor_aggregation_10_minutes
+WITH (timescaledb.continuous, timescaledb.materialized_only = true) AS
+    SELECT
+        sensor_identifier,
+        time_bucket('10 minutes', bucket_timestamp) AS bucket_timestamp,
+        min(wxt532_temperature_minimum) AS wxt532_temperature_minimum,
+        max(wxt532_temperature_maximum) AS wxt532_temperature_maximum,
+        sum(wxt532_temperature_average * wxt532_temperature_count) / nullif(sum(wxt532_temperature_count), 0) AS wxt532_temperature_average,
+        sum(wxt532_temperature_count)::BIGINT AS wxt532_temperature_count,
+        min(wxt532_heating_voltage_minimum) AS wxt532_heating_voltage_minimum,
+        max(wxt532_heating_voltage_maximum) AS wxt532_heating_voltage_maximum,
+        sum(wxt532_heating_voltage_average * wxt532_heating_voltage_count) / nullif(sum(wxt532_heating_voltage_count), 0) AS wxt532_heating_voltage_average,
+        sum(wxt532_heating_voltage_count)::BIGINT AS wxt532_heating_voltage_count,
+        min(wxt532_supply_voltage_minimum) AS wxt532_supply_voltage_minimum,
+        max(wxt532_supply_voltage_maximum) AS wxt532_supply_voltage_maximum,
+        sum(wxt532_supply_voltage_average * wxt532_supply_voltage_count) / nullif(sum(wxt532_supply_voltage_count), 0) AS wxt532_supply_voltage_average,
+        sum(wxt532_supply_voltage_count)::BIGINT AS wxt532_supply_voltage_count,
+        min(wxt532_reference_voltage_minimum) AS wxt532_reference_voltage_minimum,
+        max(wxt532_reference_voltage_maximum) AS wxt532_reference_voltage_maximum,
+        sum(wxt532_reference_voltage_average * wxt532_reference_voltage_count) / nullif(sum(wxt532_reference_voltage_count), 0) AS wxt532_reference_voltage_average,
+        sum(wxt532_reference_voltage_count)::BIGINT AS wxt532_reference_voltage_count,
+        min(wxt532_last_update_time_minimum) AS wxt532_last_update_time_minimum,
+        max(wxt532_last_update_time_maximum) AS wxt532_last_update_time_maximum,
+        sum(wxt532_last_update_time_average * wxt532_last_update_time_count) / nullif(sum(wxt532_last_update_time_count), 0) AS wxt532_last_update_time_average,
+        sum(wxt532_last_update_time_count)::BIGINT AS wxt532_last_update_time_count
+    FROM measurement_wind_sensor_aggregation_1_minute
+    GROUP BY sensor_identifier, time_bucket('10 minutes', bucket_timestamp)
+WITH NO DATA;
+
+SELECT add_continuous_aggregate_policy(
+    continuous_aggregate => 'measurement_wind_sensor_aggregation_10_minutes',
+    start_offset => '10 days',
+    end_offset => '10 minutes',
+    schedule_interval => '10 minutes');
+
+
+CREATE MATERIALIZED VIEW measurement_wind_sensor_aggregation_1_hour
+WITH (timescaledb.continuous, timescaledb.materialized_only = true) AS
+    SELECT
+        sensor_identifier,
+        time_bucket('1 hour', bucket_timestamp) AS bucket_timestamp,
+        min(wxt532_temperature_minimum) AS wxt532_temperature_minimum,
+        max(wxt532_temperature_maximum) AS wxt532_temperature_maximum,
+        sum(wxt532_temperature_average * wxt532_temperature_count) / nullif(sum(wxt532_temperature_count), 0) AS wxt532_temperature_average,
+        sum(wxt532_temperature_count)::BIGINT AS wxt532_temperature_count,
+        min(wxt532_heating_voltage_minimum) AS wxt532_heating_voltage_minimum,
+        max(wxt532_heating_voltage_maximum) AS wxt532_heating_voltage_maximum,
+        sum(wxt532_heating_voltage_average * wxt532_heating_voltage_count) / nullif(sum(wxt532_heating_voltage_count), 0) AS wxt532_heating_voltage_average,
+        sum(wxt532_heating_voltage_count)::BIGINT AS wxt532_heating_voltage_count,
+        min(wxt532_supply_voltage_minimum) AS wxt532_supply_voltage_minimum,
+        max(wxt532_supply_voltage_maximum) AS wxt532_supply_voltage_maximum,
+        sum(wxt532_supply_voltage_average * wxt532_supply_voltage_count) / nullif(sum(wxt532_supply_voltage_count), 0) AS wxt532_supply_voltage_average,
+        sum(wxt532_supply_voltage_count)::BIGINT AS wxt532_supply_voltage_count,
+        min(wxt532_reference_voltage_minimum) AS wxt532_reference_voltage_minimum,
+        max(wxt532_reference_voltage_maximum) AS wxt532_reference_voltage_maximum,
+        sum(wxt532_reference_voltage_average * wxt532_reference_voltage_count) / nullif(sum(wxt532_reference_voltage_count), 0) AS wxt532_reference_voltage_average,
+        sum(wxt532_reference_voltage_count)::BIGINT AS wxt532_reference_voltage_count,
+        min(wxt532_last_update_time_minimum) AS wxt532_last_update_time_minimum,
+        max(wxt532_last_update_time_maximum) AS wxt532_last_update_time_maximum,
+        sum(wxt532_last_update_time_average * wxt532_last_update_time_count) / nullif(sum(wxt532_last_update_time_count), 0) AS wxt532_last_update_time_average,
+        sum(wxt532_last_update_time_count)::BIGINT AS wxt532_last_update_time_count
+    FROM measurement_wind_sensor_aggregation_10_minutes
+    GROUP BY sensor_identifier, time_bucket('1 hour', bucket_timestamp)
+WITH NO DATA;
+
+SELECT add_continuous_aggregate_policy(
+    continuous_aggregate => 'measurement_wind_sensor_aggregation_1_hour',
+    start_offset => '10 days',
+    end_offset => '1 hour',
+    schedule_interval => '1 hour');
+
+
+CREATE MATERIALIZED VIEW measurement_wind_sensor_aggregation_1_day
+WITH (timescaledb.continuous, timescaledb.materialized_only = true) AS
+    SELECT
+        sensor_identifier,
+        time_bucket('1 day', bucket_timestamp) AS bucket_timestamp,
+        min(wxt532_temperature_minimum) AS wxt532_temperature_minimum,
+        max(wxt532_temperature_maximum) AS wxt532_temperature_maximum,
+        sum(wxt532_temperature_average * wxt532_temperature_count) / nullif(sum(wxt532_temperature_count), 0) AS wxt532_temperature_average,
+        sum(wxt532_temperature_count)::BIGINT AS wxt532_temperature_count,
+        min(wxt532_heating_voltage_minimum) AS wxt532_heating_voltage_minimum,
+        max(wxt532_heating_voltage_maximum) AS wxt532_heating_voltage_maximum,
+        sum(wxt532_heating_voltage_average * wxt532_heating_voltage_count) / nullif(sum(wxt532_heating_voltage_count), 0) AS wxt532_heating_voltage_average,
+        sum(wxt532_heating_voltage_count)::BIGINT AS wxt532_heating_voltage_count,
+        min(wxt532_supply_voltage_minimum) AS wxt532_supply_voltage_minimum,
+        max(wxt532_supply_voltage_maximum) AS wxt532_supply_voltage_maximum,
+        sum(wxt532_supply_voltage_average * wxt532_supply_voltage_count) / nullif(sum(wxt532_supply_voltage_count), 0) AS wxt532_supply_voltage_average,
+        sum(wxt532_supply_voltage_count)::BIGINT AS wxt532_supply_voltage_count,
+        min(wxt532_reference_voltage_minimum) AS wxt532_reference_voltage_minimum,
+        max(wxt532_reference_voltage_maximum) AS wxt532_reference_voltage_maximum,
+        sum(wxt532_reference_voltage_average * wxt532_reference_voltage_count) / nullif(sum(wxt532_reference_voltage_count), 0) AS wxt532_reference_voltage_average,
+        sum(wxt532_reference_voltage_count)::BIGINT AS wxt532_reference_voltage_count,
+        min(wxt532_last_update_time_minimum) AS wxt532_last_update_time_minimum,
+        max(wxt532_last_update_time_maximum) AS wxt532_last_update_time_maximum,
+        sum(wxt532_last_update_time_average * wxt532_last_update_time_count) / nullif(sum(wxt532_last_update_time_count), 0) AS wxt532_last_update_time_average,
+        sum(wxt532_last_update_time_count)::BIGINT AS wxt532_last_update_time_count
+    FROM measurement_wind_sensor_aggregation_1_hour
+    GROUP BY sensor_identifier, time_bucket('1 day', bucket_timestamp)
+WITH NO DATA;
+
+SELECT add_continuous_aggregate_policy(
+    continuous_aggregate => 'measurement_wind_sensor_aggregation_1_day',
+    start_offset => '10 days',
+    end_offset => '1 day',
+    schedule_interval => '1 day');
+
+
+-- Measurements of both storage modes with one row per sample; Data points in the generic
+-- table with the same timestamp and revision are assembled back into samples
+CREATE VIEW measurement_sample AS
+    SELECT
+        measurement.sensor_identifier,
+        measurement.revision,
+        measurement.creation_timestamp,
+        jsonb_object_agg(attribute.name, measurement.value) AS value
+    FROM measurement
+    JOIN attribute ON attribute.identifier = measurement.attribute_identifier
+    -- Grouping in the order of the index lets pages stream from an index scan
+    GROUP BY
+        measurement.sensor_identifier,
+        measurement.creation_timestamp,
+        measurement.revision
+    UNION ALL
+    SELECT
+        sensor_identifier,
+        revision,
+        creation_timestamp,
+        jsonb_strip_nulls(to_jsonb(x) - ARRAY['sensor_identifier', 'revision', 'creation_timestamp', 'receipt_timestamp']) AS value
+    FROM measurement_co2 AS x
+    UNION ALL
+    SELECT
+        sensor_identifier,
+        revision,
+        creation_timestamp,
+        jsonb_strip_nulls(to_jsonb(x) - ARRAY['sensor_identifier', 'revision', 'creation_timestamp', 'receipt_timestamp']) AS value
+    FROM measurement_calibration AS x
+    UNION ALL
+    SELECT
+        sensor_identifier,
+        revision,
+        creation_timestamp,
+        jsonb_strip_nulls(to_jsonb(x) - ARRAY['sensor_identifier', 'revision', 'creation_timestamp', 'receipt_timestamp']) AS value
+    FROM measurement_system AS x
+    UNION ALL
+    SELECT
+        sensor_identifier,
+        revision,
+        creation_timestamp,
+        jsonb_strip_nulls(to_jsonb(x) - ARRAY['sensor_identifier', 'revision', 'creation_timestamp', 'receipt_timestamp']) AS value
+    FROM measurement_wind AS x
+    UNION ALL
+    SELECT
+        sensor_identifier,
+        revision,
+        creation_timestamp,
+        jsonb_strip_nulls(to_jsonb(x) - ARRAY['sensor_identifier', 'revision', 'creation_timestamp', 'receipt_timestamp']) AS value
+    FROM measurement_wind_sensor AS x;
+
+
+-- Aggregates of both storage modes in buckets of 1 minute with one row per attribute
+CREATE VIEW measurement_bucket_1_minute AS
+    SELECT
+        x.sensor_identifier,
+        attribute.name AS attribute,
+        x.bucket_timestamp,
+        x.minimum,
+        x.maximum,
+        x.average,
+        x.count
+    FROM measurement_aggregation_1_minute AS x
+    JOIN attribute ON attribute.identifier = x.attribute_identifier
+    UNION ALL
+    SELECT
+        x.sensor_identifier,
+        y.attribute,
+        x.bucket_timestamp,
+        y.minimum,
+        y.maximum,
+        y.average,
+        y.count
+    FROM measurement_co2_aggregation_1_minute AS x
+    CROSS JOIN LATERAL (
+        VALUES
+            ('gmp343_raw', x.gmp343_raw_minimum, x.gmp343_raw_maximum, x.gmp343_raw_average, x.gmp343_raw_count),
+            ('gmp343_compensated', x.gmp343_compensated_minimum, x.gmp343_compensated_maximum, x.gmp343_compensated_average, x.gmp343_compensated_count),
+            ('gmp343_filtered', x.gmp343_filtered_minimum, x.gmp343_filtered_maximum, x.gmp343_filtered_average, x.gmp343_filtered_count),
+            ('gmp343_temperature', x.gmp343_temperature_minimum, x.gmp343_temperature_maximum, x.gmp343_temperature_average, x.gmp343_temperature_count),
+            ('bme280_temperature', x.bme280_temperature_minimum, x.bme280_temperature_maximum, x.bme280_temperature_average, x.bme280_temperature_count),
+            ('bme280_humidity', x.bme280_humidity_minimum, x.bme280_humidity_maximum, x.bme280_humidity_average, x.bme280_humidity_count),
+            ('bme280_pressure', x.bme280_pressure_minimum, x.bme280_pressure_maximum, x.bme280_pressure_average, x.bme280_pressure_count),
+            ('sht45_temperature', x.sht45_temperature_minimum, x.sht45_temperature_maximum, x.sht45_temperature_average, x.sht45_temperature_count),
+            ('sht45_humidity', x.sht45_humidity_minimum, x.sht45_humidity_maximum, x.sht45_humidity_average, x.sht45_humidity_count)
+    ) AS y (attribute, minimum, maximum, average, count)
+    WHERE y.count > 0
+    UNION ALL
+    SELECT
+        x.sensor_identifier,
+        y.attribute,
+        x.bucket_timestamp,
+        y.minimum,
+        y.maximum,
+        y.average,
+        y.count
+    FROM measurement_calibration_aggregation_1_minute AS x
+    CROSS JOIN LATERAL (
+        VALUES
+            ('cal_bottle_id', x.cal_bottle_id_minimum, x.cal_bottle_id_maximum, x.cal_bottle_id_average, x.cal_bottle_id_count),
+            ('cal_gmp343_raw', x.cal_gmp343_raw_minimum, x.cal_gmp343_raw_maximum, x.cal_gmp343_raw_average, x.cal_gmp343_raw_count),
+            ('cal_gmp343_compensated', x.cal_gmp343_compensated_minimum, x.cal_gmp343_compensated_maximum, x.cal_gmp343_compensated_average, x.cal_gmp343_compensated_count),
+            ('cal_gmp343_filtered', x.cal_gmp343_filtered_minimum, x.cal_gmp343_filtered_maximum, x.cal_gmp343_filtered_average, x.cal_gmp343_filtered_count),
+            ('cal_gmp343_temperature', x.cal_gmp343_temperature_minimum, x.cal_gmp343_temperature_maximum, x.cal_gmp343_temperature_average, x.cal_gmp343_temperature_count),
+            ('cal_bme280_temperature', x.cal_bme280_temperature_minimum, x.cal_bme280_temperature_maximum, x.cal_bme280_temperature_average, x.cal_bme280_temperature_count),
+            ('cal_bme280_humidity', x.cal_bme280_humidity_minimum, x.cal_bme280_humidity_maximum, x.cal_bme280_humidity_average, x.cal_bme280_humidity_count),
+            ('cal_bme280_pressure', x.cal_bme280_pressure_minimum, x.cal_bme280_pressure_maximum, x.cal_bme280_pressure_average, x.cal_bme280_pressure_count),
+            ('cal_sht45_temperature', x.cal_sht45_temperature_minimum, x.cal_sht45_temperature_maximum, x.cal_sht45_temperature_average, x.cal_sht45_temperature_count),
+            ('cal_sht45_humidity', x.cal_sht45_humidity_minimum, x.cal_sht45_humidity_maximum, x.cal_sht45_humidity_average, x.cal_sht45_humidity_count)
+    ) AS y (attribute, minimum, maximum, average, count)
+    WHERE y.count > 0
+    UNION ALL
+    SELECT
+        x.sensor_identifier,
+        y.attribute,
+        x.bucket_timestamp,
+        y.minimum,
+        y.maximum,
+        y.average,
+        y.count
+    FROM measurement_system_aggregation_1_minute AS x
+    CROSS JOIN LATERAL (
+        VALUES
+            ('enclosure_bme280_temperature', x.enclosure_bme280_temperature_minimum, x.enclosure_bme280_temperature_maximum, x.enclosure_bme280_temperature_average, x.enclosure_bme280_temperature_count),
+            ('enclosure_bme280_humidity', x.enclosure_bme280_humidity_minimum, x.enclosure_bme280_humidity_maximum, x.enclosure_bme280_humidity_average, x.enclosure_bme280_humidity_count),
+            ('enclosure_bme280_pressure', x.enclosure_bme280_pressure_minimum, x.enclosure_bme280_pressure_maximum, x.enclosure_bme280_pressure_average, x.enclosure_bme280_pressure_count),
+            ('raspi_cpu_temperature', x.raspi_cpu_temperature_minimum, x.raspi_cpu_temperature_maximum, x.raspi_cpu_temperature_average, x.raspi_cpu_temperature_count),
+            ('raspi_disk_usage', x.raspi_disk_usage_minimum, x.raspi_disk_usage_maximum, x.raspi_disk_usage_average, x.raspi_disk_usage_count),
+            ('raspi_cpu_usage', x.raspi_cpu_usage_minimum, x.raspi_cpu_usage_maximum, x.raspi_cpu_usage_average, x.raspi_cpu_usage_count),
+            ('raspi_memory_usage', x.raspi_memory_usage_minimum, x.raspi_memory_usage_maximum, x.raspi_memory_usage_average, x.raspi_memory_usage_count),
+            ('ups_powered_by_grid', x.ups_powered_by_grid_minimum, x.ups_powered_by_grid_maximum, x.ups_powered_by_grid_average, x.ups_powered_by_grid_count),
+            ('ups_battery_is_fully_charged', x.ups_battery_is_fully_charged_minimum, x.ups_battery_is_fully_charged_maximum, x.ups_battery_is_fully_charged_average, x.ups_battery_is_fully_charged_count),
+            ('ups_battery_error_detected', x.ups_battery_error_detected_minimum, x.ups_battery_error_detected_maximum, x.ups_battery_error_detected_average, x.ups_battery_error_detected_count),
+            ('ups_battery_above_voltage_threshold', x.ups_battery_above_voltage_threshold_minimum, x.ups_battery_above_voltage_threshold_maximum, x.ups_battery_above_voltage_threshold_average, x.ups_battery_above_voltage_threshold_count)
+    ) AS y (attribute, minimum, maximum, average, count)
+    WHERE y.count > 0
+    UNION ALL
+    SELECT
+        x.sensor_identifier,
+        y.attribute,
+        x.bucket_timestamp,
+        y.minimum,
+        y.maximum,
+        y.average,
+        y.count
+    FROM measurement_wind_aggregation_1_minute AS x
+    CROSS JOIN LATERAL (
+        VALUES
+            ('wxt532_direction_min', x.wxt532_direction_min_minimum, x.wxt532_direction_min_maximum, x.wxt532_direction_min_average, x.wxt532_direction_min_count),
+            ('wxt532_direction_avg', x.wxt532_direction_avg_minimum, x.wxt532_direction_avg_maximum, x.wxt532_direction_avg_average, x.wxt532_direction_avg_count),
+            ('wxt532_direction_max', x.wxt532_direction_max_minimum, x.wxt532_direction_max_maximum, x.wxt532_direction_max_average, x.wxt532_direction_max_count),
+            ('wxt532_speed_min', x.wxt532_speed_min_minimum, x.wxt532_speed_min_maximum, x.wxt532_speed_min_average, x.wxt532_speed_min_count),
+            ('wxt532_speed_avg', x.wxt532_speed_avg_minimum, x.wxt532_speed_avg_maximum, x.wxt532_speed_avg_average, x.wxt532_speed_avg_count),
+            ('wxt532_speed_max', x.wxt532_speed_max_minimum, x.wxt532_speed_max_maximum, x.wxt532_speed_max_average, x.wxt532_speed_max_count),
+            ('wxt532_last_update_time', x.wxt532_last_update_time_minimum, x.wxt532_last_update_time_maximum, x.wxt532_last_update_time_average, x.wxt532_last_update_time_count)
+    ) AS y (attribute, minimum, maximum, average, count)
+    WHERE y.count > 0
+    UNION ALL
+    SELECT
+        x.sensor_identifier,
+        y.attribute,
+        x.bucket_timestamp,
+        y.minimum,
+        y.maximum,
+        y.average,
+        y.count
+    FROM measurement_wind_sensor_aggregation_1_minute AS x
+    CROSS JOIN LATERAL (
+        VALUES
+            ('wxt532_temperature', x.wxt532_temperature_minimum, x.wxt532_temperature_maximum, x.wxt532_temperature_average, x.wxt532_temperature_count),
+            ('wxt532_heating_voltage', x.wxt532_heating_voltage_minimum, x.wxt532_heating_voltage_maximum, x.wxt532_heating_voltage_average, x.wxt532_heating_voltage_count),
+            ('wxt532_supply_voltage', x.wxt532_supply_voltage_minimum, x.wxt532_supply_voltage_maximum, x.wxt532_supply_voltage_average, x.wxt532_supply_voltage_count),
+            ('wxt532_reference_voltage', x.wxt532_reference_voltage_minimum, x.wxt532_reference_voltage_maximum, x.wxt532_reference_voltage_average, x.wxt532_reference_voltage_count),
+            ('wxt532_last_update_time', x.wxt532_last_update_time_minimum, x.wxt532_last_update_time_maximum, x.wxt532_last_update_time_average, x.wxt532_last_update_time_count)
+    ) AS y (attribute, minimum, maximum, average, count)
+    WHERE y.count > 0;
+
+
+-- Aggregates of both storage modes in buckets of 10 minutes with one row per attribute
+CREATE VIEW measurement_bucket_10_minutes AS
+    SELECT
+        x.sensor_identifier,
+        attribute.name AS attribute,
+        x.bucket_timestamp,
+        x.minimum,
+        x.maximum,
+        x.average,
+        x.count
+    FROM measurement_aggregation_10_minutes AS x
+    JOIN attribute ON attribute.identifier = x.attribute_identifier
+    UNION ALL
+    SELECT
+        x.sensor_identifier,
+        y.attribute,
+        x.bucket_timestamp,
+        y.minimum,
+        y.maximum,
+        y.average,
+        y.count
+    FROM measurement_co2_aggregation_10_minutes AS x
+    CROSS JOIN LATERAL (
+        VALUES
+            ('gmp343_raw', x.gmp343_raw_minimum, x.gmp343_raw_maximum, x.gmp343_raw_average, x.gmp343_raw_count),
+            ('gmp343_compensated', x.gmp343_compensated_minimum, x.gmp343_compensated_maximum, x.gmp343_compensated_average, x.gmp343_compensated_count),
+            ('gmp343_filtered', x.gmp343_filtered_minimum, x.gmp343_filtered_maximum, x.gmp343_filtered_average, x.gmp343_filtered_count),
+            ('gmp343_temperature', x.gmp343_temperature_minimum, x.gmp343_temperature_maximum, x.gmp343_temperature_average, x.gmp343_temperature_count),
+            ('bme280_temperature', x.bme280_temperature_minimum, x.bme280_temperature_maximum, x.bme280_temperature_average, x.bme280_temperature_count),
+            ('bme280_humidity', x.bme280_humidity_minimum, x.bme280_humidity_maximum, x.bme280_humidity_average, x.bme280_humidity_count),
+            ('bme280_pressure', x.bme280_pressure_minimum, x.bme280_pressure_maximum, x.bme280_pressure_average, x.bme280_pressure_count),
+            ('sht45_temperature', x.sht45_temperature_minimum, x.sht45_temperature_maximum, x.sht45_temperature_average, x.sht45_temperature_count),
+            ('sht45_humidity', x.sht45_humidity_minimum, x.sht45_humidity_maximum, x.sht45_humidity_average, x.sht45_humidity_count)
+    ) AS y (attribute, minimum, maximum, average, count)
+    WHERE y.count > 0
+    UNION ALL
+    SELECT
+        x.sensor_identifier,
+        y.attribute,
+        x.bucket_timestamp,
+        y.minimum,
+        y.maximum,
+        y.average,
+        y.count
+    FROM measurement_calibration_aggregation_10_minutes AS x
+    CROSS JOIN LATERAL (
+        VALUES
+            ('cal_bottle_id', x.cal_bottle_id_minimum, x.cal_bottle_id_maximum, x.cal_bottle_id_average, x.cal_bottle_id_count),
+            ('cal_gmp343_raw', x.cal_gmp343_raw_minimum, x.cal_gmp343_raw_maximum, x.cal_gmp343_raw_average, x.cal_gmp343_raw_count),
+            ('cal_gmp343_compensated', x.cal_gmp343_compensated_minimum, x.cal_gmp343_compensated_maximum, x.cal_gmp343_compensated_average, x.cal_gmp343_compensated_count),
+            ('cal_gmp343_filtered', x.cal_gmp343_filtered_minimum, x.cal_gmp343_filtered_maximum, x.cal_gmp343_filtered_average, x.cal_gmp343_filtered_count),
+            ('cal_gmp343_temperature', x.cal_gmp343_temperature_minimum, x.cal_gmp343_temperature_maximum, x.cal_gmp343_temperature_average, x.cal_gmp343_temperature_count),
+            ('cal_bme280_temperature', x.cal_bme280_temperature_minimum, x.cal_bme280_temperature_maximum, x.cal_bme280_temperature_average, x.cal_bme280_temperature_count),
+            ('cal_bme280_humidity', x.cal_bme280_humidity_minimum, x.cal_bme280_humidity_maximum, x.cal_bme280_humidity_average, x.cal_bme280_humidity_count),
+            ('cal_bme280_pressure', x.cal_bme280_pressure_minimum, x.cal_bme280_pressure_maximum, x.cal_bme280_pressure_average, x.cal_bme280_pressure_count),
+            ('cal_sht45_temperature', x.cal_sht45_temperature_minimum, x.cal_sht45_temperature_maximum, x.cal_sht45_temperature_average, x.cal_sht45_temperature_count),
+            ('cal_sht45_humidity', x.cal_sht45_humidity_minimum, x.cal_sht45_humidity_maximum, x.cal_sht45_humidity_average, x.cal_sht45_humidity_count)
+    ) AS y (attribute, minimum, maximum, average, count)
+    WHERE y.count > 0
+    UNION ALL
+    SELECT
+        x.sensor_identifier,
+        y.attribute,
+        x.bucket_timestamp,
+        y.minimum,
+        y.maximum,
+        y.average,
+        y.count
+    FROM measurement_system_aggregation_10_minutes AS x
+    CROSS JOIN LATERAL (
+        VALUES
+            ('enclosure_bme280_temperature', x.enclosure_bme280_temperature_minimum, x.enclosure_bme280_temperature_maximum, x.enclosure_bme280_temperature_average, x.enclosure_bme280_temperature_count),
+            ('enclosure_bme280_humidity', x.enclosure_bme280_humidity_minimum, x.enclosure_bme280_humidity_maximum, x.enclosure_bme280_humidity_average, x.enclosure_bme280_humidity_count),
+            ('enclosure_bme280_pressure', x.enclosure_bme280_pressure_minimum, x.enclosure_bme280_pressure_maximum, x.enclosure_bme280_pressure_average, x.enclosure_bme280_pressure_count),
+            ('raspi_cpu_temperature', x.raspi_cpu_temperature_minimum, x.raspi_cpu_temperature_maximum, x.raspi_cpu_temperature_average, x.raspi_cpu_temperature_count),
+            ('raspi_disk_usage', x.raspi_disk_usage_minimum, x.raspi_disk_usage_maximum, x.raspi_disk_usage_average, x.raspi_disk_usage_count),
+            ('raspi_cpu_usage', x.raspi_cpu_usage_minimum, x.raspi_cpu_usage_maximum, x.raspi_cpu_usage_average, x.raspi_cpu_usage_count),
+            ('raspi_memory_usage', x.raspi_memory_usage_minimum, x.raspi_memory_usage_maximum, x.raspi_memory_usage_average, x.raspi_memory_usage_count),
+            ('ups_powered_by_grid', x.ups_powered_by_grid_minimum, x.ups_powered_by_grid_maximum, x.ups_powered_by_grid_average, x.ups_powered_by_grid_count),
+            ('ups_battery_is_fully_charged', x.ups_battery_is_fully_charged_minimum, x.ups_battery_is_fully_charged_maximum, x.ups_battery_is_fully_charged_average, x.ups_battery_is_fully_charged_count),
+            ('ups_battery_error_detected', x.ups_battery_error_detected_minimum, x.ups_battery_error_detected_maximum, x.ups_battery_error_detected_average, x.ups_battery_error_detected_count),
+            ('ups_battery_above_voltage_threshold', x.ups_battery_above_voltage_threshold_minimum, x.ups_battery_above_voltage_threshold_maximum, x.ups_battery_above_voltage_threshold_average, x.ups_battery_above_voltage_threshold_count)
+    ) AS y (attribute, minimum, maximum, average, count)
+    WHERE y.count > 0
+    UNION ALL
+    SELECT
+        x.sensor_identifier,
+        y.attribute,
+        x.bucket_timestamp,
+        y.minimum,
+        y.maximum,
+        y.average,
+        y.count
+    FROM measurement_wind_aggregation_10_minutes AS x
+    CROSS JOIN LATERAL (
+        VALUES
+            ('wxt532_direction_min', x.wxt532_direction_min_minimum, x.wxt532_direction_min_maximum, x.wxt532_direction_min_average, x.wxt532_direction_min_count),
+            ('wxt532_direction_avg', x.wxt532_direction_avg_minimum, x.wxt532_direction_avg_maximum, x.wxt532_direction_avg_average, x.wxt532_direction_avg_count),
+            ('wxt532_direction_max', x.wxt532_direction_max_minimum, x.wxt532_direction_max_maximum, x.wxt532_direction_max_average, x.wxt532_direction_max_count),
+            ('wxt532_speed_min', x.wxt532_speed_min_minimum, x.wxt532_speed_min_maximum, x.wxt532_speed_min_average, x.wxt532_speed_min_count),
+            ('wxt532_speed_avg', x.wxt532_speed_avg_minimum, x.wxt532_speed_avg_maximum, x.wxt532_speed_avg_average, x.wxt532_speed_avg_count),
+            ('wxt532_speed_max', x.wxt532_speed_max_minimum, x.wxt532_speed_max_maximum, x.wxt532_speed_max_average, x.wxt532_speed_max_count),
+            ('wxt532_last_update_time', x.wxt532_last_update_time_minimum, x.wxt532_last_update_time_maximum, x.wxt532_last_update_time_average, x.wxt532_last_update_time_count)
+    ) AS y (attribute, minimum, maximum, average, count)
+    WHERE y.count > 0
+    UNION ALL
+    SELECT
+        x.sensor_identifier,
+        y.attribute,
+        x.bucket_timestamp,
+        y.minimum,
+        y.maximum,
+        y.average,
+        y.count
+    FROM measurement_wind_sensor_aggregation_10_minutes AS x
+    CROSS JOIN LATERAL (
+        VALUES
+            ('wxt532_temperature', x.wxt532_temperature_minimum, x.wxt532_temperature_maximum, x.wxt532_temperature_average, x.wxt532_temperature_count),
+            ('wxt532_heating_voltage', x.wxt532_heating_voltage_minimum, x.wxt532_heating_voltage_maximum, x.wxt532_heating_voltage_average, x.wxt532_heating_voltage_count),
+            ('wxt532_supply_voltage', x.wxt532_supply_voltage_minimum, x.wxt532_supply_voltage_maximum, x.wxt532_supply_voltage_average, x.wxt532_supply_voltage_count),
+            ('wxt532_reference_voltage', x.wxt532_reference_voltage_minimum, x.wxt532_reference_voltage_maximum, x.wxt532_reference_voltage_average, x.wxt532_reference_voltage_count),
+            ('wxt532_last_update_time', x.wxt532_last_update_time_minimum, x.wxt532_last_update_time_maximum, x.wxt532_last_update_time_average, x.wxt532_last_update_time_count)
+    ) AS y (attribute, minimum, maximum, average, count)
+    WHERE y.count > 0;
+
+
+-- Aggregates of both storage modes in buckets of 1 hour with one row per attribute
+CREATE VIEW measurement_bucket_1_hour AS
+    SELECT
+        x.sensor_identifier,
+        attribute.name AS attribute,
+        x.bucket_timestamp,
+        x.minimum,
+        x.maximum,
+        x.average,
+        x.count
+    FROM measurement_aggregation_1_hour AS x
+    JOIN attribute ON attribute.identifier = x.attribute_identifier
+    UNION ALL
+    SELECT
+        x.sensor_identifier,
+        y.attribute,
+        x.bucket_timestamp,
+        y.minimum,
+        y.maximum,
+        y.average,
+        y.count
+    FROM measurement_co2_aggregation_1_hour AS x
+    CROSS JOIN LATERAL (
+        VALUES
+            ('gmp343_raw', x.gmp343_raw_minimum, x.gmp343_raw_maximum, x.gmp343_raw_average, x.gmp343_raw_count),
+            ('gmp343_compensated', x.gmp343_compensated_minimum, x.gmp343_compensated_maximum, x.gmp343_compensated_average, x.gmp343_compensated_count),
+            ('gmp343_filtered', x.gmp343_filtered_minimum, x.gmp343_filtered_maximum, x.gmp343_filtered_average, x.gmp343_filtered_count),
+            ('gmp343_temperature', x.gmp343_temperature_minimum, x.gmp343_temperature_maximum, x.gmp343_temperature_average, x.gmp343_temperature_count),
+            ('bme280_temperature', x.bme280_temperature_minimum, x.bme280_temperature_maximum, x.bme280_temperature_average, x.bme280_temperature_count),
+            ('bme280_humidity', x.bme280_humidity_minimum, x.bme280_humidity_maximum, x.bme280_humidity_average, x.bme280_humidity_count),
+            ('bme280_pressure', x.bme280_pressure_minimum, x.bme280_pressure_maximum, x.bme280_pressure_average, x.bme280_pressure_count),
+            ('sht45_temperature', x.sht45_temperature_minimum, x.sht45_temperature_maximum, x.sht45_temperature_average, x.sht45_temperature_count),
+            ('sht45_humidity', x.sht45_humidity_minimum, x.sht45_humidity_maximum, x.sht45_humidity_average, x.sht45_humidity_count)
+    ) AS y (attribute, minimum, maximum, average, count)
+    WHERE y.count > 0
+    UNION ALL
+    SELECT
+        x.sensor_identifier,
+        y.attribute,
+        x.bucket_timestamp,
+        y.minimum,
+        y.maximum,
+        y.average,
+        y.count
+    FROM measurement_calibration_aggregation_1_hour AS x
+    CROSS JOIN LATERAL (
+        VALUES
+            ('cal_bottle_id', x.cal_bottle_id_minimum, x.cal_bottle_id_maximum, x.cal_bottle_id_average, x.cal_bottle_id_count),
+            ('cal_gmp343_raw', x.cal_gmp343_raw_minimum, x.cal_gmp343_raw_maximum, x.cal_gmp343_raw_average, x.cal_gmp343_raw_count),
+            ('cal_gmp343_compensated', x.cal_gmp343_compensated_minimum, x.cal_gmp343_compensated_maximum, x.cal_gmp343_compensated_average, x.cal_gmp343_compensated_count),
+            ('cal_gmp343_filtered', x.cal_gmp343_filtered_minimum, x.cal_gmp343_filtered_maximum, x.cal_gmp343_filtered_average, x.cal_gmp343_filtered_count),
+            ('cal_gmp343_temperature', x.cal_gmp343_temperature_minimum, x.cal_gmp343_temperature_maximum, x.cal_gmp343_temperature_average, x.cal_gmp343_temperature_count),
+            ('cal_bme280_temperature', x.cal_bme280_temperature_minimum, x.cal_bme280_temperature_maximum, x.cal_bme280_temperature_average, x.cal_bme280_temperature_count),
+            ('cal_bme280_humidity', x.cal_bme280_humidity_minimum, x.cal_bme280_humidity_maximum, x.cal_bme280_humidity_average, x.cal_bme280_humidity_count),
+            ('cal_bme280_pressure', x.cal_bme280_pressure_minimum, x.cal_bme280_pressure_maximum, x.cal_bme280_pressure_average, x.cal_bme280_pressure_count),
+            ('cal_sht45_temperature', x.cal_sht45_temperature_minimum, x.cal_sht45_temperature_maximum, x.cal_sht45_temperature_average, x.cal_sht45_temperature_count),
+            ('cal_sht45_humidity', x.cal_sht45_humidity_minimum, x.cal_sht45_humidity_maximum, x.cal_sht45_humidity_average, x.cal_sht45_humidity_count)
+    ) AS y (attribute, minimum, maximum, average, count)
+    WHERE y.count > 0
+    UNION ALL
+    SELECT
+        x.sensor_identifier,
+        y.attribute,
+        x.bucket_timestamp,
+        y.minimum,
+        y.maximum,
+        y.average,
+        y.count
+    FROM measurement_system_aggregation_1_hour AS x
+    CROSS JOIN LATERAL (
+        VALUES
+            ('enclosure_bme280_temperature', x.enclosure_bme280_temperature_minimum, x.enclosure_bme280_temperature_maximum, x.enclosure_bme280_temperature_average, x.enclosure_bme280_temperature_count),
+            ('enclosure_bme280_humidity', x.enclosure_bme280_humidity_minimum, x.enclosure_bme280_humidity_maximum, x.enclosure_bme280_humidity_average, x.enclosure_bme280_humidity_count),
+            ('enclosure_bme280_pressure', x.enclosure_bme280_pressure_minimum, x.enclosure_bme280_pressure_maximum, x.enclosure_bme280_pressure_average, x.enclosure_bme280_pressure_count),
+            ('raspi_cpu_temperature', x.raspi_cpu_temperature_minimum, x.raspi_cpu_temperature_maximum, x.raspi_cpu_temperature_average, x.raspi_cpu_temperature_count),
+            ('raspi_disk_usage', x.raspi_disk_usage_minimum, x.raspi_disk_usage_maximum, x.raspi_disk_usage_average, x.raspi_disk_usage_count),
+            ('raspi_cpu_usage', x.raspi_cpu_usage_minimum, x.raspi_cpu_usage_maximum, x.raspi_cpu_usage_average, x.raspi_cpu_usage_count),
+            ('raspi_memory_usage', x.raspi_memory_usage_minimum, x.raspi_memory_usage_maximum, x.raspi_memory_usage_average, x.raspi_memory_usage_count),
+            ('ups_powered_by_grid', x.ups_powered_by_grid_minimum, x.ups_powered_by_grid_maximum, x.ups_powered_by_grid_average, x.ups_powered_by_grid_count),
+            ('ups_battery_is_fully_charged', x.ups_battery_is_fully_charged_minimum, x.ups_battery_is_fully_charged_maximum, x.ups_battery_is_fully_charged_average, x.ups_battery_is_fully_charged_count),
+            ('ups_battery_error_detected', x.ups_battery_error_detected_minimum, x.ups_battery_error_detected_maximum, x.ups_battery_error_detected_average, x.ups_battery_error_detected_count),
+            ('ups_battery_above_voltage_threshold', x.ups_battery_above_voltage_threshold_minimum, x.ups_battery_above_voltage_threshold_maximum, x.ups_battery_above_voltage_threshold_average, x.ups_battery_above_voltage_threshold_count)
+    ) AS y (attribute, minimum, maximum, average, count)
+    WHERE y.count > 0
+    UNION ALL
+    SELECT
+        x.sensor_identifier,
+        y.attribute,
+        x.bucket_timestamp,
+        y.minimum,
+        y.maximum,
+        y.average,
+        y.count
+    FROM measurement_wind_aggregation_1_hour AS x
+    CROSS JOIN LATERAL (
+        VALUES
+            ('wxt532_direction_min', x.wxt532_direction_min_minimum, x.wxt532_direction_min_maximum, x.wxt532_direction_min_average, x.wxt532_direction_min_count),
+            ('wxt532_direction_avg', x.wxt532_direction_avg_minimum, x.wxt532_direction_avg_maximum, x.wxt532_direction_avg_average, x.wxt532_direction_avg_count),
+            ('wxt532_direction_max', x.wxt532_direction_max_minimum, x.wxt532_direction_max_maximum, x.wxt532_direction_max_average, x.wxt532_direction_max_count),
+            ('wxt532_speed_min', x.wxt532_speed_min_minimum, x.wxt532_speed_min_maximum, x.wxt532_speed_min_average, x.wxt532_speed_min_count),
+            ('wxt532_speed_avg', x.wxt532_speed_avg_minimum, x.wxt532_speed_avg_maximum, x.wxt532_speed_avg_average, x.wxt532_speed_avg_count),
+            ('wxt532_speed_max', x.wxt532_speed_max_minimum, x.wxt532_speed_max_maximum, x.wxt532_speed_max_average, x.wxt532_speed_max_count),
+            ('wxt532_last_update_time', x.wxt532_last_update_time_minimum, x.wxt532_last_update_time_maximum, x.wxt532_last_update_time_average, x.wxt532_last_update_time_count)
+    ) AS y (attribute, minimum, maximum, average, count)
+    WHERE y.count > 0
+    UNION ALL
+    SELECT
+        x.sensor_identifier,
+        y.attribute,
+        x.bucket_timestamp,
+        y.minimum,
+        y.maximum,
+        y.average,
+        y.count
+    FROM measurement_wind_sensor_aggregation_1_hour AS x
+    CROSS JOIN LATERAL (
+        VALUES
+            ('wxt532_temperature', x.wxt532_temperature_minimum, x.wxt532_temperature_maximum, x.wxt532_temperature_average, x.wxt532_temperature_count),
+            ('wxt532_heating_voltage', x.wxt532_heating_voltage_minimum, x.wxt532_heating_voltage_maximum, x.wxt532_heating_voltage_average, x.wxt532_heating_voltage_count),
+            ('wxt532_supply_voltage', x.wxt532_supply_voltage_minimum, x.wxt532_supply_voltage_maximum, x.wxt532_supply_voltage_average, x.wxt532_supply_voltage_count),
+            ('wxt532_reference_voltage', x.wxt532_reference_voltage_minimum, x.wxt532_reference_voltage_maximum, x.wxt532_reference_voltage_average, x.wxt532_reference_voltage_count),
+            ('wxt532_last_update_time', x.wxt532_last_update_time_minimum, x.wxt532_last_update_time_maximum, x.wxt532_last_update_time_average, x.wxt532_last_update_time_count)
+    ) AS y (attribute, minimum, maximum, average, count)
+    WHERE y.count > 0;
+
+
+-- Aggregates of both storage modes in buckets of 1 day with one row per attribute
+CREATE VIEW measurement_bucket_1_day AS
+    SELECT
+        x.sensor_identifier,
+        attribute.name AS attribute,
+        x.bucket_timestamp,
+        x.minimum,
+        x.maximum,
+        x.average,
+        x.count
+    FROM measurement_aggregation_1_day AS x
+    JOIN attribute ON attribute.identifier = x.attribute_identifier
+    UNION ALL
+    SELECT
+        x.sensor_identifier,
+        y.attribute,
+        x.bucket_timestamp,
+        y.minimum,
+        y.maximum,
+        y.average,
+        y.count
+    FROM measurement_co2_aggregation_1_day AS x
+    CROSS JOIN LATERAL (
+        VALUES
+            ('gmp343_raw', x.gmp343_raw_minimum, x.gmp343_raw_maximum, x.gmp343_raw_average, x.gmp343_raw_count),
+            ('gmp343_compensated', x.gmp343_compensated_minimum, x.gmp343_compensated_maximum, x.gmp343_compensated_average, x.gmp343_compensated_count),
+            ('gmp343_filtered', x.gmp343_filtered_minimum, x.gmp343_filtered_maximum, x.gmp343_filtered_average, x.gmp343_filtered_count),
+            ('gmp343_temperature', x.gmp343_temperature_minimum, x.gmp343_temperature_maximum, x.gmp343_temperature_average, x.gmp343_temperature_count),
+            ('bme280_temperature', x.bme280_temperature_minimum, x.bme280_temperature_maximum, x.bme280_temperature_average, x.bme280_temperature_count),
+            ('bme280_humidity', x.bme280_humidity_minimum, x.bme280_humidity_maximum, x.bme280_humidity_average, x.bme280_humidity_count),
+            ('bme280_pressure', x.bme280_pressure_minimum, x.bme280_pressure_maximum, x.bme280_pressure_average, x.bme280_pressure_count),
+            ('sht45_temperature', x.sht45_temperature_minimum, x.sht45_temperature_maximum, x.sht45_temperature_average, x.sht45_temperature_count),
+            ('sht45_humidity', x.sht45_humidity_minimum, x.sht45_humidity_maximum, x.sht45_humidity_average, x.sht45_humidity_count)
+    ) AS y (attribute, minimum, maximum, average, count)
+    WHERE y.count > 0
+    UNION ALL
+    SELECT
+        x.sensor_identifier,
+        y.attribute,
+        x.bucket_timestamp,
+        y.minimum,
+        y.maximum,
+        y.average,
+        y.count
+    FROM measurement_calibration_aggregation_1_day AS x
+    CROSS JOIN LATERAL (
+        VALUES
+            ('cal_bottle_id', x.cal_bottle_id_minimum, x.cal_bottle_id_maximum, x.cal_bottle_id_average, x.cal_bottle_id_count),
+            ('cal_gmp343_raw', x.cal_gmp343_raw_minimum, x.cal_gmp343_raw_maximum, x.cal_gmp343_raw_average, x.cal_gmp343_raw_count),
+            ('cal_gmp343_compensated', x.cal_gmp343_compensated_minimum, x.cal_gmp343_compensated_maximum, x.cal_gmp343_compensated_average, x.cal_gmp343_compensated_count),
+            ('cal_gmp343_filtered', x.cal_gmp343_filtered_minimum, x.cal_gmp343_filtered_maximum, x.cal_gmp343_filtered_average, x.cal_gmp343_filtered_count),
+            ('cal_gmp343_temperature', x.cal_gmp343_temperature_minimum, x.cal_gmp343_temperature_maximum, x.cal_gmp343_temperature_average, x.cal_gmp343_temperature_count),
+            ('cal_bme280_temperature', x.cal_bme280_temperature_minimum, x.cal_bme280_temperature_maximum, x.cal_bme280_temperature_average, x.cal_bme280_temperature_count),
+            ('cal_bme280_humidity', x.cal_bme280_humidity_minimum, x.cal_bme280_humidity_maximum, x.cal_bme280_humidity_average, x.cal_bme280_humidity_count),
+            ('cal_bme280_pressure', x.cal_bme280_pressure_minimum, x.cal_bme280_pressure_maximum, x.cal_bme280_pressure_average, x.cal_bme280_pressure_count),
+            ('cal_sht45_temperature', x.cal_sht45_temperature_minimum, x.cal_sht45_temperature_maximum, x.cal_sht45_temperature_average, x.cal_sht45_temperature_count),
+            ('cal_sht45_humidity', x.cal_sht45_humidity_minimum, x.cal_sht45_humidity_maximum, x.cal_sht45_humidity_average, x.cal_sht45_humidity_count)
+    ) AS y (attribute, minimum, maximum, average, count)
+    WHERE y.count > 0
+    UNION ALL
+    SELECT
+        x.sensor_identifier,
+        y.attribute,
+        x.bucket_timestamp,
+        y.minimum,
+        y.maximum,
+        y.average,
+        y.count
+    FROM measurement_system_aggregation_1_day AS x
+    CROSS JOIN LATERAL (
+        VALUES
+            ('enclosure_bme280_temperature', x.enclosure_bme280_temperature_minimum, x.enclosure_bme280_temperature_maximum, x.enclosure_bme280_temperature_average, x.enclosure_bme280_temperature_count),
+            ('enclosure_bme280_humidity', x.enclosure_bme280_humidity_minimum, x.enclosure_bme280_humidity_maximum, x.enclosure_bme280_humidity_average, x.enclosure_bme280_humidity_count),
+            ('enclosure_bme280_pressure', x.enclosure_bme280_pressure_minimum, x.enclosure_bme280_pressure_maximum, x.enclosure_bme280_pressure_average, x.enclosure_bme280_pressure_count),
+            ('raspi_cpu_temperature', x.raspi_cpu_temperature_minimum, x.raspi_cpu_temperature_maximum, x.raspi_cpu_temperature_average, x.raspi_cpu_temperature_count),
+            ('raspi_disk_usage', x.raspi_disk_usage_minimum, x.raspi_disk_usage_maximum, x.raspi_disk_usage_average, x.raspi_disk_usage_count),
+            ('raspi_cpu_usage', x.raspi_cpu_usage_minimum, x.raspi_cpu_usage_maximum, x.raspi_cpu_usage_average, x.raspi_cpu_usage_count),
+            ('raspi_memory_usage', x.raspi_memory_usage_minimum, x.raspi_memory_usage_maximum, x.raspi_memory_usage_average, x.raspi_memory_usage_count),
+            ('ups_powered_by_grid', x.ups_powered_by_grid_minimum, x.ups_powered_by_grid_maximum, x.ups_powered_by_grid_average, x.ups_powered_by_grid_count),
+            ('ups_battery_is_fully_charged', x.ups_battery_is_fully_charged_minimum, x.ups_battery_is_fully_charged_maximum, x.ups_battery_is_fully_charged_average, x.ups_battery_is_fully_charged_count),
+            ('ups_battery_error_detected', x.ups_battery_error_detected_minimum, x.ups_battery_error_detected_maximum, x.ups_battery_error_detected_average, x.ups_battery_error_detected_count),
+            ('ups_battery_above_voltage_threshold', x.ups_battery_above_voltage_threshold_minimum, x.ups_battery_above_voltage_threshold_maximum, x.ups_battery_above_voltage_threshold_average, x.ups_battery_above_voltage_threshold_count)
+    ) AS y (attribute, minimum, maximum, average, count)
+    WHERE y.count > 0
+    UNION ALL
+    SELECT
+        x.sensor_identifier,
+        y.attribute,
+        x.bucket_timestamp,
+        y.minimum,
+        y.maximum,
+        y.average,
+        y.count
+    FROM measurement_wind_aggregation_1_day AS x
+    CROSS JOIN LATERAL (
+        VALUES
+            ('wxt532_direction_min', x.wxt532_direction_min_minimum, x.wxt532_direction_min_maximum, x.wxt532_direction_min_average, x.wxt532_direction_min_count),
+            ('wxt532_direction_avg', x.wxt532_direction_avg_minimum, x.wxt532_direction_avg_maximum, x.wxt532_direction_avg_average, x.wxt532_direction_avg_count),
+            ('wxt532_direction_max', x.wxt532_direction_max_minimum, x.wxt532_direction_max_maximum, x.wxt532_direction_max_average, x.wxt532_direction_max_count),
+            ('wxt532_speed_min', x.wxt532_speed_min_minimum, x.wxt532_speed_min_maximum, x.wxt532_speed_min_average, x.wxt532_speed_min_count),
+            ('wxt532_speed_avg', x.wxt532_speed_avg_minimum, x.wxt532_speed_avg_maximum, x.wxt532_speed_avg_average, x.wxt532_speed_avg_count),
+            ('wxt532_speed_max', x.wxt532_speed_max_minimum, x.wxt532_speed_max_maximum, x.wxt532_speed_max_average, x.wxt532_speed_max_count),
+            ('wxt532_last_update_time', x.wxt532_last_update_time_minimum, x.wxt532_last_update_time_maximum, x.wxt532_last_update_time_average, x.wxt532_last_update_time_count)
+    ) AS y (attribute, minimum, maximum, average, count)
+    WHERE y.count > 0
+    UNION ALL
+    SELECT
+        x.sensor_identifier,
+        y.attribute,
+        x.bucket_timestamp,
+        y.minimum,
+        y.maximum,
+        y.average,
+        y.count
+    FROM measurement_wind_sensor_aggregation_1_day AS x
+    CROSS JOIN LATERAL (
+        VALUES
+            ('wxt532_temperature', x.wxt532_temperature_minimum, x.wxt532_temperature_maximum, x.wxt532_temperature_average, x.wxt532_temperature_count),
+            ('wxt532_heating_voltage', x.wxt532_heating_voltage_minimum, x.wxt532_heating_voltage_maximum, x.wxt532_heating_voltage_average, x.wxt532_heating_voltage_count),
+            ('wxt532_supply_voltage', x.wxt532_supply_voltage_minimum, x.wxt532_supply_voltage_maximum, x.wxt532_supply_voltage_average, x.wxt532_supply_voltage_count),
+            ('wxt532_reference_voltage', x.wxt532_reference_voltage_minimum, x.wxt532_reference_voltage_maximum, x.wxt532_reference_voltage_average, x.wxt532_reference_voltage_count),
+            ('wxt532_last_update_time', x.wxt532_last_update_time_minimum, x.wxt532_last_update_time_maximum, x.wxt532_last_update_time_average, x.wxt532_last_update_time_count)
+    ) AS y (attribute, minimum, maximum, average, count)
+    WHERE y.count > 0;
+
+
+-- Measurements of the wide storage mode with one row per attribute
+CREATE VIEW measurement_family_value AS
+    SELECT
+        x.sensor_identifier,
+        y.attribute,
+        y.value,
+        x.revision,
+        x.creation_timestamp
+    FROM measurement_co2 AS x
+    CROSS JOIN LATERAL (
+        VALUES
+            ('gmp343_raw', x.gmp343_raw),
+            ('gmp343_compensated', x.gmp343_compensated),
+            ('gmp343_filtered', x.gmp343_filtered),
+            ('gmp343_temperature', x.gmp343_temperature),
+            ('bme280_temperature', x.bme280_temperature),
+            ('bme280_humidity', x.bme280_humidity),
+            ('bme280_pressure', x.bme280_pressure),
+            ('sht45_temperature', x.sht45_temperature),
+            ('sht45_humidity', x.sht45_humidity)
+    ) AS y (attribute, value)
+    WHERE y.value IS NOT NULL
+    UNION ALL
+    SELECT
+        x.sensor_identifier,
+        y.attribute,
+        y.value,
+        x.revision,
+        x.creation_timestamp
+    FROM measurement_calibration AS x
+    CROSS JOIN LATERAL (
+        VALUES
+            ('cal_bottle_id', x.cal_bottle_id),
+            ('cal_gmp343_raw', x.cal_gmp343_raw),
+            ('cal_gmp343_compensated', x.cal_gmp343_compensated),
+            ('cal_gmp343_filtered', x.cal_gmp343_filtered),
+            ('cal_gmp343_temperature', x.cal_gmp343_temperature),
+            ('cal_bme280_temperature', x.cal_bme280_temperature),
+            ('cal_bme280_humidity', x.cal_bme280_humidity),
+            ('cal_bme280_pressure', x.cal_bme280_pressure),
+            ('cal_sht45_temperature', x.cal_sht45_temperature),
+            ('cal_sht45_humidity', x.cal_sht45_humidity)
+    ) AS y (attribute, value)
+    WHERE y.value IS NOT NULL
+    UNION ALL
+    SELECT
+        x.sensor_identifier,
+        y.attribute,
+        y.value,
+        x.revision,
+        x.creation_timestamp
+    FROM measurement_system AS x
+    CROSS JOIN LATERAL (
+        VALUES
+            ('enclosure_bme280_temperature', x.enclosure_bme280_temperature),
+            ('enclosure_bme280_humidity', x.enclosure_bme280_humidity),
+            ('enclosure_bme280_pressure', x.enclosure_bme280_pressure),
+            ('raspi_cpu_temperature', x.raspi_cpu_temperature),
+            ('raspi_disk_usage', x.raspi_disk_usage),
+            ('raspi_cpu_usage', x.raspi_cpu_usage),
+            ('raspi_memory_usage', x.raspi_memory_usage),
+            ('ups_powered_by_grid', x.ups_powered_by_grid),
+            ('ups_battery_is_fully_charged', x.ups_battery_is_fully_charged),
+            ('ups_battery_error_detected', x.ups_battery_error_detected),
+            ('ups_battery_above_voltage_threshold', x.ups_battery_above_voltage_threshold)
+    ) AS y (attribute, value)
+    WHERE y.value IS NOT NULL
+    UNION ALL
+    SELECT
+        x.sensor_identifier,
+        y.attribute,
+        y.value,
+        x.revision,
+        x.creation_timestamp
+    FROM measurement_wind AS x
+    CROSS JOIN LATERAL (
+        VALUES
+            ('wxt532_direction_min', x.wxt532_direction_min),
+            ('wxt532_direction_avg', x.wxt532_direction_avg),
+            ('wxt532_direction_max', x.wxt532_direction_max),
+            ('wxt532_speed_min', x.wxt532_speed_min),
+            ('wxt532_speed_avg', x.wxt532_speed_avg),
+            ('wxt532_speed_max', x.wxt532_speed_max),
+            ('wxt532_last_update_time', x.wxt532_last_update_time)
+    ) AS y (attribute, value)
+    WHERE y.value IS NOT NULL
+    UNION ALL
+    SELECT
+        x.sensor_identifier,
+        y.attribute,
+        y.value,
+        x.revision,
+        x.creation_timestamp
+    FROM measurement_wind_sensor AS x
+    CROSS JOIN LATERAL (
+        VALUES
+            ('wxt532_temperature', x.wxt532_temperature),
+            ('wxt532_heating_voltage', x.wxt532_heating_voltage),
+            ('wxt532_supply_voltage', x.wxt532_supply_voltage),
+            ('wxt532_reference_voltage', x.wxt532_reference_voltage),
+            ('wxt532_last_update_time', x.wxt532_last_update_time)
+    ) AS y (attribute, value)
+    WHERE y.value IS NOT NULL;
+
+
+-- Measurements of both storage modes with one row per attribute
+CREATE VIEW measurement_value AS
+    SELECT
+        measurement.sensor_identifier,
+        attribute.name AS attribute,
+        measurement.value,
+        measurement.revision,
+        measurement.creation_timestamp
+    FROM measurement
+    JOIN attribute ON attribute.identifier = measurement.attribute_identifier
+    UNION ALL
+    SELECT sensor_identifier, attribute, value, revision, creation_timestamp
+    FROM measurement_family_value;
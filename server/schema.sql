@@ -45,6 +45,27 @@ CREATE TABLE session (
 );
 
 
+-- Sessions expire once they are older than the lifetime in seconds in the job's config,
+-- which the server sets from HERMES_SESSION_LIFETIME. Expired sessions are already
+-- rejected when authenticating; The job only removes them from the table.
+CREATE PROCEDURE expire_sessions(job_id INT, config JSONB)
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF config ->> 'lifetime' IS NULL THEN
+        RETURN;
+    END IF;
+    DELETE FROM session
+    WHERE creation_timestamp < now() - make_interval(secs => (config ->> 'lifetime')::DOUBLE PRECISION);
+END
+$$;
+
+SELECT add_job(
+    proc => 'expire_sessions',
+    schedule_interval => '1 hour',
+    config => '{"lifetime": null}',
+    scheduled => false);
+
+
 -- Contains only values that are actually sent to the sensor, not metadata
 CREATE TABLE configuration (
     sensor_identifier UUID NOT NULL REFERENCES sensor (identifier) ON DELETE CASCADE,
@@ -62,43 +83,116 @@ CREATE TABLE configuration (
 CREATE UNIQUE INDEX ON configuration (sensor_identifier ASC, revision DESC);
 
 
+-- Attribute names are stored once and referenced by their integer code in the generic
+-- measurement table and its aggregates. Codes are only ever added by the server, never
+-- changed or removed. The measurements don't reference them with a foreign key, which
+-- would cost an extra lookup for every ingested row.
+CREATE TABLE attribute (
+    identifier INT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL
+);
+
+
 -- Measurements don't have a unique primary key. Enforcing that the combination of
--- (sensor_identifier, creation_timestamp, attribute) is unique filters out duplicates
+-- (sensor_identifier, creation_timestamp, attribute_identifier) is unique filters out duplicates
 -- but having these duplicates usually means that something is wrong on the sensor.
 -- In this case, the server should store everything it receives and duplicates should be
 -- filtered out during processing with manual oversight. The keyset pagination over the
 -- measurements chooses arbitrarily between duplicates.
 CREATE TABLE measurement (
     sensor_identifier UUID NOT NULL REFERENCES sensor (identifier) ON DELETE CASCADE,
-    attribute TEXT NOT NULL,
+    attribute_identifier INT NOT NULL,
     value DOUBLE PRECISION NOT NULL,
     revision INT,
     creation_timestamp TIMESTAMPTZ NOT NULL,
-    receipt_timestamp TIMESTAMPTZ NOT NULL
+    receipt_timestamp TIMESTAMPTZ NOT NULL DEFAULT now()
 );
 
-SELECT create_hypertable('measurement', 'creation_timestamp');
+-- Chunks of one day keep the chunk that is currently written to small enough to stay in
+-- memory together with its indexes, even with hundreds of sensors
+SELECT create_hypertable('measurement', 'creation_timestamp', chunk_time_interval => INTERVAL '1 day');
 
+CREATE INDEX ON measurement (sensor_identifier ASC, creation_timestamp DESC);
 
-CREATE MATERIALIZED VIEW measurement_aggregation_1_hour
-WITH (timescaledb.continuous, timescaledb.materialized_only = true, timescaledb.create_group_indexes = false) AS
-    SELECT
-        sensor_identifier,
-        attribute,
-        avg(value)::DOUBLE PRECISION AS average,
-        time_bucket('1 hour', creation_timestamp) AS bucket_timestamp
-    FROM measurement
-    GROUP BY sensor_identifier, attribute, bucket_timestamp
-WITH DATA;
+-- Chunks are compressed once they are older than the refresh window of the aggregates,
+-- so that refreshes and late measurements rarely touch compressed chunks. Segments hold
+-- the series of one sensor and attribute, so that queries for a single sensor only
+-- decompress that sensor's segments. Compressed chunks are read transparently.
+ALTER TABLE measurement SET (
+    timescaledb.compress,
+    timescaledb.compress_segmentby = 'sensor_identifier, attribute_identifier',
+    timescaledb.compress_orderby = 'creation_timestamp DESC'
+);
 
+SELECT add_compression_policy('measurement', compress_after => INTERVAL '2 weeks');
 
-CREATE INDEX ON measurement_aggregation_1_hour (sensor_identifier ASC, bucket_timestamp ASC, attribute ASC);
+-- The aggregates of the measurements and the tables of the wide storage mode are
+-- generated from the measurement families into measurements.sql by scripts/generate
 
-SELECT add_continuous_aggregate_policy(
-    continuous_aggregate => 'measurement_aggregation_1_hour',
-    start_offset => '10 days',
-    end_offset => '1 hour',
-    schedule_interval => '1 hour');
+
+-- Raw measurements are dropped chunk by chunk once they are older than the retention
+-- period in the job's config, which the server sets from HERMES_MEASUREMENT_RETENTION.
+-- The aggregates are kept. Before dropping, the aggregates are refreshed up to the same
+-- horizon, finer resolutions first, so that measurements that arrived after their
+-- buckets left the refresh policies' windows are still materialized. Only invalidated
+-- buckets are recomputed, so this is cheap when there were no late arrivals.
+-- The job remembers its horizon in the config. Buckets before the oldest chunk that
+-- the previous run kept are never refreshed again: Their raw measurements are partly
+-- dropped, and a late measurement would replace them with the aggregates of just itself.
+CREATE PROCEDURE retain_measurements(job_id INT, config JSONB)
+LANGUAGE plpgsql AS $$
+DECLARE
+    horizon TIMESTAMPTZ := now() - (config ->> 'drop_after')::INTERVAL;
+    previous TIMESTAMPTZ := (config ->> 'horizon')::TIMESTAMPTZ;
+    name TEXT;
+    width INTERVAL;
+    since TIMESTAMPTZ;
+BEGIN
+    IF horizon IS NULL THEN
+        RETURN;
+    END IF;
+    FOR name IN
+        SELECT view_name
+        FROM timescaledb_information.continuous_aggregates
+        -- The coarser aggregates are built on the finer ones instead of a measurement
+        -- table, so they are selected by their own name
+        WHERE view_name ~ '^measurement.*_aggregation_'
+        ORDER BY array_position(
+            ARRAY['1_minute', '10_minutes', '1_hour', '1_day'],
+            substring(view_name FROM '_aggregation_(.*)$')
+        ) ASC
+    LOOP
+        width := replace(substring(name FROM '_aggregation_(.*)$'), '_', ' ')::INTERVAL;
+        -- Without a previous run, the raw measurements are complete
+        SELECT least(previous, min(range_start)) INTO since
+        FROM timescaledb_information.chunks
+        WHERE
+            hypertable_name = substring(name FROM '^(.*)_aggregation_')
+            AND range_end > previous;
+        -- Refresh only whole buckets, so that none reaches before the complete range
+        since := time_bucket(width, since - INTERVAL '1 microsecond') + width;
+        IF since IS NULL OR since < time_bucket(width, horizon) THEN
+            CALL refresh_continuous_aggregate(name::REGCLASS, since, time_bucket(width, horizon));
+        END IF;
+        COMMIT;
+    END LOOP;
+    FOR name IN
+        SELECT hypertable_name
+        FROM timescaledb_information.hypertables
+        WHERE hypertable_name ~ '^measurement'
+    LOOP
+        PERFORM drop_chunks(name::REGCLASS, older_than => horizon);
+        COMMIT;
+    END LOOP;
+    PERFORM alter_job(job_id, config => config || jsonb_build_object('horizon', horizon));
+END
+$$;
+
+SELECT add_job(
+    proc => 'retain_measurements',
+    schedule_interval => '1 day',
+    config => '{"drop_after": null}',
+    scheduled => false);
 
 
 -- Logs don't have a unique primary key. Enforcing uniqueness over the combination
@@ -114,11 +208,75 @@ CREATE TABLE log (
     message TEXT NOT NULL,
     revision INT,
     creation_timestamp TIMESTAMPTZ NOT NULL,
-    receipt_timestamp TIMESTAMPTZ NOT NULL
+    receipt_timestamp TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+SELECT create_hypertable('log', 'creation_timestamp', chunk_time_interval => INTERVAL '1 week');
+
+CREATE INDEX ON log (sensor_identifier ASC, creation_timestamp DESC);
+
+ALTER TABLE log SET (
+    timescaledb.compress,
+    timescaledb.compress_segmentby = 'sensor_identifier',
+    timescaledb.compress_orderby = 'creation_timestamp DESC'
 );
 
-SELECT create_hypertable('log', 'creation_timestamp');
+SELECT add_compression_policy('log', compress_after => INTERVAL '1 week');
 
 SELECT add_retention_policy(
     relation => 'log',
     drop_after => INTERVAL '8 weeks');
+
+
+-- Warnings and errors are summarized per sensor, message and day so that reading a
+-- sensor's log summary doesn't scan all of its logs. Logs that are not yet materialized
+-- are aggregated from the log table when read.
+CREATE MATERIALIZED VIEW log_aggregation
+WITH (timescaledb.continuous, timescaledb.materialized_only = false, timescaledb.create_group_indexes = false) AS
+    SELECT
+        sensor_identifier,
+        severity,
+        message,
+        time_bucket('1 day', creation_timestamp) AS bucket_timestamp,
+        first(revision, creation_timestamp) AS min_revision,
+        last(revision, creation_timestamp) AS max_revision,
+        min(creation_timestamp) AS min_creation_timestamp,
+        max(creation_timestamp) AS max_creation_timestamp,
+        count(*) AS count
+    FROM log
+    WHERE severity IN ('warning', 'error')
+    GROUP BY sensor_identifier, severity, message, bucket_timestamp
+WITH NO DATA;
+
+CREATE INDEX ON log_aggregation (sensor_identifier ASC, bucket_timestamp DESC);
+
+-- Sensors replay their backlog after an outage, so the refresh window covers almost the
+-- whole retention period of the logs. Only buckets that received logs since the last
+-- refresh are recomputed, so the wide window is cheap. It stays a week clear of the
+-- retention horizon, where a bucket can straddle a chunk that was already dropped.
+SELECT add_continuous_aggregate_policy(
+    continuous_aggregate => 'log_aggregation',
+    start_offset => '7 weeks',
+    end_offset => '1 hour',
+    schedule_interval => '1 hour');
+
+SELECT add_retention_policy(
+    relation => 'log_aggregation',
+    drop_after => INTERVAL '8 weeks');
+
+
+-- The latest state of each sensor, maintained by the ingest together with the writes
+-- so that a network's current state can be read without scanning the time series. The
+-- measurements map each attribute name to its newest value with the value's revision
+-- and creation timestamp (in unix time).
+CREATE TABLE sensor_latest (
+    sensor_identifier UUID PRIMARY KEY REFERENCES sensor (identifier) ON DELETE CASCADE,
+    measurements JSONB NOT NULL DEFAULT '{}',
+    log_severity TEXT,
+    log_message TEXT,
+    log_revision INT,
+    log_creation_timestamp TIMESTAMPTZ,
+    acknowledgment_revision INT,
+    acknowledgment_timestamp TIMESTAMPTZ,
+    acknowledgment_success BOOLEAN
+);
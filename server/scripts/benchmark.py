@@ -0,0 +1,621 @@
+import argparse
+import asyncio
+import contextlib
+import json
+import random
+import secrets
+import statistics
+import time
+import uuid
+
+import aiomqtt
+import asyncpg
+import pendulum
+
+import app.database as database
+import app.mqtt as mqtt
+import app.settings as settings
+import app.validation as validation
+
+
+########################################################################################
+# Synthetic payloads
+########################################################################################
+
+
+# Attributes of the edge node's CO2 and system measurements
+CO2_ATTRIBUTES = [
+    "gmp343_raw",
+    "gmp343_compensated",
+    "gmp343_filtered",
+    "gmp343_temperature",
+    "bme280_temperature",
+    "bme280_humidity",
+    "bme280_pressure",
+    "sht45_temperature",
+    "sht45_humidity",
+]
+SYSTEM_ATTRIBUTES = [
+    "enclosure_bme280_temperature",
+    "enclosure_bme280_humidity",
+    "enclosure_bme280_pressure",
+    "raspi_cpu_temperature",
+    "raspi_disk_usage",
+    "raspi_cpu_usage",
+    "raspi_memory_usage",
+    "ups_powered_by_grid",
+    "ups_battery_is_fully_charged",
+    "ups_battery_error_detected",
+    "ups_battery_above_voltage_threshold",
+]
+
+
+def measurements(count, attributes, timestamp=1683645000.0):
+    """Return `count` measurements with random values for the given attributes."""
+    return [
+        {
+            "revision": 3,
+            "timestamp": timestamp + i * 10,
+            "value": {attribute: random.uniform(0, 1000) for attribute in attributes},
+        }
+        for i in range(count)
+    ]
+
+
+def logs(count, timestamp=1683645000.0):
+    """Return `count` logs with messages of realistic length."""
+    return [
+        {
+            "severity": random.choice(["info", "warning", "error"]),
+            "revision": 3,
+            "timestamp": timestamp + i * 10,
+            "message": "The CPU is toasty; Get the marshmallows ready! " * 4,
+        }
+        for i in range(count)
+    ]
+
+
+def acknowledgments(count, timestamp=1683645000.0):
+    """Return `count` acknowledgments."""
+    return [
+        {"revision": i, "timestamp": timestamp + i * 10, "success": True}
+        for i in range(count)
+    ]
+
+
+########################################################################################
+# Benchmark: validation
+########################################################################################
+
+
+def _decode_measurements_with_models(sensor_identifier, payload):
+    """Decode measurements via pydantic model instances, as the server used to."""
+    return [
+        (
+            sensor_identifier,
+            attribute,
+            value,
+            element.revision,
+            element.timestamp,
+        )
+        for element in validation.MeasurementsValidator.validate_json(payload)
+        for attribute, value in element.value.items()
+    ]
+
+
+def _decode_logs_with_models(sensor_identifier, payload):
+    """Decode logs via pydantic model instances, as the server used to."""
+    return [
+        (
+            sensor_identifier,
+            element.severity,
+            element.message,
+            element.revision,
+            element.timestamp,
+        )
+        for element in validation.LogsValidator.validate_json(payload)
+    ]
+
+
+def _decode_acknowledgments_with_models(sensor_identifier, payload):
+    """Decode acknowledgments via pydantic model instances, as the server used to."""
+    return [
+        (sensor_identifier, element.revision, element.timestamp, element.success)
+        for element in validation.AcknowledgmentsValidator.validate_json(payload)
+    ]
+
+
+def _throughput(decode, payload, duration):
+    """Return the number of rows per second that the decode function produces."""
+    sensor_identifier = "81bf7042-e20f-4a97-ac44-c15853e3618f"
+    rows, start = 0, time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < duration:
+        for _ in range(64):
+            rows += len(decode(sensor_identifier, payload))
+    return rows / elapsed
+
+
+def benchmark_validation(args):
+    """Compare decoding payloads via model instances and via plain dictionaries."""
+    cases = [
+        (
+            "measurements (CO2)",
+            _decode_measurements_with_models,
+            mqtt._decode_measurements,
+            lambda n: measurements(n, CO2_ATTRIBUTES),
+        ),
+        (
+            "measurements (system)",
+            _decode_measurements_with_models,
+            mqtt._decode_measurements,
+            lambda n: measurements(n, SYSTEM_ATTRIBUTES),
+        ),
+        ("logs", _decode_logs_with_models, mqtt._decode_logs, logs),
+        (
+            "acknowledgments",
+            _decode_acknowledgments_with_models,
+            mqtt._decode_acknowledgments,
+            acknowledgments,
+        ),
+    ]
+    print(f"{'payload':<24}{'batch':>6}{'models':>16}{'dictionaries':>16}{'ratio':>8}")
+    for name, reference, candidate, generate in cases:
+        for batch in args.batches:
+            payload = json.dumps(generate(batch)).encode()
+            # Both paths have to produce the same rows
+            assert reference("x", payload) == candidate("x", payload)
+            x = _throughput(reference, payload, args.duration)
+            y = _throughput(candidate, payload, args.duration)
+            print(f"{name:<24}{batch:>6}{x:>12,.0f} r/s{y:>12,.0f} r/s{y / x:>7.2f}x")
+
+
+########################################################################################
+# Benchmark: ingest
+########################################################################################
+
+
+class _Client:
+    """In-process stand-in for the aiomqtt client that the listener reads from."""
+
+    def __init__(self):
+        self.queue = asyncio.Queue()
+
+    async def subscribe(self, *args, **kwargs):
+        pass
+
+    def publish(self, topic, payload):
+        self.queue.put_nowait(
+            aiomqtt.Message(topic, payload, qos=1, retain=False, mid=0, properties=None)
+        )
+
+    @contextlib.asynccontextmanager
+    async def messages(self):
+        async def generator():
+            while True:
+                yield await self.queue.get()
+
+        yield generator()
+
+
+class _Recorder:
+    """Proxy for the database pool that records the time spent writing rows."""
+
+    def __init__(self, dbpool):
+        self.dbpool = dbpool
+        self.origins = {}  # When each (sensor, timestamp) sample was published
+        self.duration = 0  # Seconds spent waiting for the database
+        self.latencies = []  # Seconds from publication until written, for each sample
+        self.finish = None  # When the last row was written
+
+    def __getattr__(self, name):
+        return getattr(self.dbpool, name)
+
+    async def copy_records_to_table(self, table_name, records, columns, target=None):
+        start = time.perf_counter()
+        await (target or self.dbpool).copy_records_to_table(
+            table_name=table_name, records=records, columns=columns
+        )
+        self.duration += time.perf_counter() - start
+        self.finish = time.time()
+        # Samples are written as one row per attribute with the narrow storage mode
+        index = columns.index("creation_timestamp")
+        for record in records:
+            origin = self.origins.pop((record[0], record[index]), None)
+            if origin is not None:
+                self.latencies.append(self.finish - origin)
+
+    @contextlib.asynccontextmanager
+    async def acquire(self):
+        async with self.dbpool.acquire() as connection:
+            yield _Connection(connection, self)
+
+
+class _Connection:
+    """Proxy for a database connection that records its writes like the pool."""
+
+    def __init__(self, connection, recorder):
+        self.connection = connection
+        self.recorder = recorder
+
+    def __getattr__(self, name):
+        return getattr(self.connection, name)
+
+    async def copy_records_to_table(self, table_name, records, columns):
+        await self.recorder.copy_records_to_table(
+            table_name, records, columns, target=self.connection
+        )
+
+
+async def _create_sensors(dbpool, count):
+    """Create a network with the given number of sensors for the benchmark."""
+    query, arguments = database.parametrize(
+        identifier="create-network",
+        arguments={"network_name": f"benchmark-{secrets.token_hex(4)}"},
+    )
+    network_identifier = (await dbpool.fetch(query, *arguments))[0][
+        "network_identifier"
+    ]
+    sensor_identifiers = []
+    for i in range(count):
+        query, arguments = database.parametrize(
+            identifier="create-sensor",
+            arguments={
+                "network_identifier": network_identifier,
+                "sensor_name": f"sensor-{i}",
+            },
+        )
+        elements = await dbpool.fetch(query, *arguments)
+        sensor_identifiers.append(elements[0]["sensor_identifier"])
+    return network_identifier, sensor_identifiers
+
+
+async def _publish(client, recorder, sensor_identifiers, attributes, args):
+    """Publish the synthetic traffic of all sensors at the configured rate."""
+    for i in range(args.messages):
+        start = time.perf_counter()
+        for sensor_identifier in sensor_identifiers:
+            payload = measurements(args.batch, attributes, timestamp=time.time())
+            for element in payload:
+                recorder.origins[sensor_identifier, element["timestamp"]] = time.time()
+            client.publish(
+                topic=f"measurements/{sensor_identifier}",
+                payload=json.dumps(payload).encode(),
+            )
+        if args.rate > 0:
+            await asyncio.sleep(max(0, 1 / args.rate - time.perf_counter() + start))
+        elif i % 64 == 0:
+            await asyncio.sleep(0)  # Let the listener work while we publish
+
+
+async def _ingest(args):
+    async with database.pool() as dbpool:
+        network_identifier, sensor_identifiers = await _create_sensors(
+            dbpool, args.sensors
+        )
+        try:
+            client, recorder = _Client(), _Recorder(dbpool)
+            attributes = {
+                "co2": CO2_ATTRIBUTES,
+                "system": SYSTEM_ATTRIBUTES,
+                "synthetic": [f"attribute_{i}" for i in range(args.attributes)],
+            }[args.family]
+            samples = args.sensors * args.messages * args.batch
+            async with mqtt.Registry(recorder) as registry:
+                task = asyncio.create_task(mqtt.listen(client, recorder, registry))
+                start = time.time()
+                await _publish(client, recorder, sensor_identifiers, attributes, args)
+                while len(recorder.latencies) < samples:
+                    await asyncio.sleep(0.01)
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        finally:
+            # Deleting the network cascades to its sensors and their measurements
+            await dbpool.execute(
+                "DELETE FROM network WHERE identifier = $1;", network_identifier
+            )
+    duration = recorder.finish - start
+    latencies = statistics.quantiles(recorder.latencies, n=100)
+    print(f"storage:         {settings.MEASUREMENT_STORAGE}")
+    print(f"samples:         {samples:,} in {duration:.2f} s")
+    print(f"throughput:      {samples * len(attributes) / duration:,.0f} values/s")
+    print(f"messages:        {args.sensors * args.messages / duration:,.0f} msg/s")
+    print(
+        f"latency:         p50 {latencies[49] * 1000:.0f} ms, p90"
+        f" {latencies[89] * 1000:.0f} ms, p99 {latencies[98] * 1000:.0f} ms, max"
+        f" {max(recorder.latencies) * 1000:.0f} ms"
+    )
+    print(
+        f"database time:   {recorder.duration:.2f} s"
+        f" ({recorder.duration / duration:.0%} of wall time)"
+    )
+
+
+def benchmark_ingest(args):
+    """Replay synthetic sensor traffic through the MQTT listener into the database."""
+    asyncio.run(_ingest(args))
+
+
+########################################################################################
+# Benchmark: compression
+########################################################################################
+
+
+# The synthetic dataset starts on 2001-01-01, so that its chunks don't overlap with any
+# other data and are outside of the refresh windows of the continuous aggregates
+_START = 978307200.0
+_SHOW_CHUNKS = """
+SELECT show_chunks(
+    'measurement', newer_than => $1::TIMESTAMPTZ, older_than => $2::TIMESTAMPTZ
+)::TEXT AS chunk;
+"""
+_DROP_CHUNKS = """
+SELECT drop_chunks(
+    'measurement', newer_than => $1::TIMESTAMPTZ, older_than => $2::TIMESTAMPTZ
+);
+"""
+# Pause the compression policy so that it doesn't compress the dataset in between
+_SCHEDULE_COMPRESSION = """
+SELECT alter_job(job_id, scheduled => $1)
+FROM timescaledb_information.jobs
+WHERE proc_name = 'policy_compression' AND hypertable_name = 'measurement';
+"""
+_COMPRESSION_STATS = """
+SELECT
+    sum(before_compression_total_bytes) AS before,
+    sum(after_compression_total_bytes) AS after
+FROM chunk_compression_stats('measurement')
+WHERE format('%s.%s', chunk_schema, chunk_name) = any($1::TEXT[]);
+"""
+
+
+async def _generate(dbpool, sensor_identifiers, args):
+    """Write a dataset of smoothly varying CO2 measurements for all sensors."""
+    dictionary = mqtt.Dictionary()
+    count = 0
+    for sensor_identifier in sensor_identifiers:
+        values = {attribute: random.uniform(0, 1000) for attribute in CO2_ATTRIBUTES}
+        for day in range(args.days):
+            rows = []
+            for i in range(0, 86400, args.interval):
+                for attribute in CO2_ATTRIBUTES:
+                    values[attribute] += random.gauss(0, 0.5)
+                    rows.append((
+                        sensor_identifier,
+                        attribute,
+                        round(values[attribute], 2),
+                        3,
+                        _START + day * 86400 + i,
+                    ))
+            await dbpool.copy_records_to_table(
+                table_name="measurement",
+                records=await dictionary.encode(rows, dbpool),
+                columns=mqtt.MEASUREMENT_COLUMNS,
+            )
+            count += len(rows)
+    return count
+
+
+async def _latencies(dbpool, sensor_identifiers, args):
+    """Return the median latency of the existing read queries in milliseconds."""
+    middle = _START + args.days * 86400 / 2
+    cases = {
+        "oldest page": ("read-measurements-next", {}),
+        "page before cursor": (
+            "read-measurements-previous",
+            {"creation_timestamp": middle},
+        ),
+        "page of attribute": (
+            "read-measurements-previous",
+            {"creation_timestamp": middle, "attribute": "gmp343_raw"},
+        ),
+        "export of one day": (
+            "export-measurements",
+            {"start_timestamp": middle, "end_timestamp": middle + 86400},
+        ),
+    }
+    latencies = {}
+    for name, (identifier, arguments) in cases.items():
+        durations = []
+        for i in range(args.repetitions):
+            query, parameters = database.parametrize(
+                identifier=identifier,
+                arguments={
+                    "sensor_identifier": random.choice(sensor_identifiers),
+                    **({"limit": 64} if identifier.startswith("read-") else {}),
+                    **arguments,
+                },
+            )
+            start = time.perf_counter()
+            await dbpool.fetch(query, *parameters)
+            durations.append(time.perf_counter() - start)
+        latencies[name] = statistics.median(durations) * 1000
+    return latencies
+
+
+async def _compression(args):
+    async with database.pool() as dbpool:
+        network_identifier, sensor_identifiers = await _create_sensors(
+            dbpool, args.sensors
+        )
+        end = _START + args.days * 86400
+        await dbpool.execute(_SCHEDULE_COMPRESSION, False)
+        try:
+            start = time.perf_counter()
+            count = await _generate(dbpool, sensor_identifiers, args)
+            print(f"rows:            {count:,} in {time.perf_counter() - start:.2f} s")
+            chunks = [
+                element["chunk"]
+                for element in await dbpool.fetch(_SHOW_CHUNKS, _START, end)
+            ]
+            await dbpool.execute("ANALYZE measurement;")
+            before = await _latencies(dbpool, sensor_identifiers, args)
+            start = time.perf_counter()
+            for chunk in chunks:
+                await dbpool.execute("SELECT compress_chunk($1::REGCLASS);", chunk)
+            duration = time.perf_counter() - start
+            print(f"compression:     {len(chunks)} chunks in {duration:.2f} s")
+            await dbpool.execute("ANALYZE measurement;")
+            after = await _latencies(dbpool, sensor_identifiers, args)
+            sizes = (await dbpool.fetch(_COMPRESSION_STATS, chunks))[0]
+        finally:
+            # Drop the chunks directly instead of deleting from compressed chunks
+            await dbpool.execute(_DROP_CHUNKS, _START, end)
+            await dbpool.execute(_SCHEDULE_COMPRESSION, True)
+            await dbpool.execute(
+                "DELETE FROM network WHERE identifier = $1;", network_identifier
+            )
+    print(
+        f"size:            {sizes['before'] / 2**20:,.1f} MiB uncompressed,"
+        f" {sizes['after'] / 2**20:,.1f} MiB compressed"
+        f" ({sizes['before'] / sizes['after']:.1f}x)"
+    )
+    print(f"{'query':<24}{'uncompressed':>16}{'compressed':>16}")
+    for name in before.keys():
+        print(f"{name:<24}{before[name]:>13.2f} ms{after[name]:>13.2f} ms")
+
+
+def benchmark_compression(args):
+    """Compare size and read latency of a synthetic dataset before/after compression."""
+    asyncio.run(_compression(args))
+
+
+########################################################################################
+# Benchmark: codecs
+########################################################################################
+
+
+_CREATE_TABLE = """
+CREATE TEMPORARY TABLE codecs (
+    sensor_identifier UUID,
+    creation_timestamp TIMESTAMPTZ,
+    value JSONB
+);
+"""
+_INSERT = "INSERT INTO codecs VALUES ($1, $2, $3);"
+_SELECT = "SELECT * FROM codecs ORDER BY creation_timestamp ASC;"
+
+
+async def _initialize_with_text_codecs(connection):
+    """Install the text codecs that the server used to use."""
+    await connection.set_type_codec(
+        typename="timestamptz",
+        schema="pg_catalog",
+        encoder=lambda x: pendulum.from_timestamp(x).isoformat(),
+        decoder=lambda x: pendulum.parse(x).float_timestamp,
+    )
+    await connection.set_type_codec(
+        typename="jsonb",
+        schema="pg_catalog",
+        encoder=json.dumps,
+        decoder=json.loads,
+    )
+    await connection.set_type_codec(
+        typename="uuid", schema="pg_catalog", encoder=str, decoder=str
+    )
+
+
+async def _roundtrip(initialize, rows, args):
+    """Return the rows read back and the write and read throughput in rows/s."""
+    connection = await asyncpg.connect(
+        host=settings.POSTGRESQL_URL,
+        port=settings.POSTGRESQL_PORT,
+        user=settings.POSTGRESQL_USERNAME,
+        password=settings.POSTGRESQL_PASSWORD,
+        database=settings.POSTGRESQL_DATABASE,
+    )
+    try:
+        await initialize(connection)
+        await connection.execute(_CREATE_TABLE)
+        writes, reads = [], []
+        for _ in range(args.repetitions):
+            await connection.execute("TRUNCATE codecs;")
+            start = time.perf_counter()
+            await connection.executemany(_INSERT, rows)
+            writes.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            elements = await connection.fetch(_SELECT)
+            reads.append(time.perf_counter() - start)
+    finally:
+        await connection.close()
+    return (
+        [tuple(element) for element in elements],
+        len(rows) / statistics.median(writes),
+        len(rows) / statistics.median(reads),
+    )
+
+
+async def _codecs(args):
+    sensor_identifiers = [str(uuid.uuid4()) for _ in range(args.sensors)]
+    rows = [
+        (
+            random.choice(sensor_identifiers),
+            # Timestamps with microseconds exercise the rounding of both codecs
+            round(_START + i + random.random(), 6),
+            {attribute: random.uniform(0, 1000) for attribute in CO2_ATTRIBUTES},
+        )
+        for i in range(args.rows)
+    ]
+    text = await _roundtrip(_initialize_with_text_codecs, rows, args)
+    binary = await _roundtrip(database.initialize, rows, args)
+    # Both codecs have to produce the same values
+    assert text[0] == binary[0]
+    print(f"{'direction':<24}{'text':>16}{'binary':>16}{'ratio':>8}")
+    for name, x, y in [("write", text[1], binary[1]), ("read", text[2], binary[2])]:
+        print(f"{name:<24}{x:>12,.0f} r/s{y:>12,.0f} r/s{y / x:>7.2f}x")
+
+
+def benchmark_codecs(args):
+    """Compare writing and reading rows with the former text and the binary codecs."""
+    asyncio.run(_codecs(args))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers(required=True)
+    # Validation
+    subparser = subparsers.add_parser(
+        "validation", help="compare the two ways of decoding MQTT payloads"
+    )
+    subparser.add_argument("--batches", type=int, nargs="+", default=[1, 16, 256])
+    subparser.add_argument("--duration", type=float, default=1.0)
+    subparser.set_defaults(function=benchmark_validation)
+    # Ingest
+    subparser = subparsers.add_parser(
+        "ingest", help="measure the throughput of the MQTT listener"
+    )
+    subparser.add_argument("--sensors", type=int, default=20)
+    subparser.add_argument("--messages", type=int, default=500, help="per sensor")
+    subparser.add_argument("--batch", type=int, default=1, help="elements/message")
+    subparser.add_argument(
+        "--family", choices=["co2", "system", "synthetic"], default="co2"
+    )
+    subparser.add_argument(
+        "--attributes", type=int, default=9, help="per element of synthetic family"
+    )
+    subparser.add_argument(
+        "--rate", type=float, default=0, help="messages/s per sensor; 0 is unlimited"
+    )
+    subparser.set_defaults(function=benchmark_ingest)
+    # Compression
+    subparser = subparsers.add_parser(
+        "compression", help="measure the compression ratio and read latency"
+    )
+    subparser.add_argument("--sensors", type=int, default=20)
+    subparser.add_argument("--days", type=int, default=14)
+    subparser.add_argument(
+        "--interval", type=int, default=60, help="seconds between samples"
+    )
+    subparser.add_argument("--repetitions", type=int, default=20, help="per query")
+    subparser.set_defaults(function=benchmark_compression)
+    # Codecs
+    subparser = subparsers.add_parser(
+        "codecs", help="compare the throughput of the text and binary codecs"
+    )
+    subparser.add_argument("--rows", type=int, default=10000)
+    subparser.add_argument("--sensors", type=int, default=20)
+    subparser.add_argument("--repetitions", type=int, default=5)
+    subparser.set_defaults(function=benchmark_codecs)
+    # Run the selected benchmark
+    args = parser.parse_args()
+    args.function(args)
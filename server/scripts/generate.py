@@ -0,0 +1,299 @@
+import app.mqtt as mqtt
+
+
+# Resolutions of the measurement aggregates, from finest to coarsest
+RESOLUTIONS = ["1 minute", "10 minutes", "1 hour", "1 day"]
+# Columns of the family tables that are not attributes
+METADATA = ["sensor_identifier", "revision", "creation_timestamp", "receipt_timestamp"]
+
+HEADER = """\
+-- Generated by scripts/generate from the measurement families in app/mqtt.py; Don't
+-- edit this file by hand. It's executed after schema.sql."""
+
+
+def _name(table, resolution):
+    """Return the name of a table's continuous aggregate at the given resolution."""
+    return f"{table}_aggregation_{resolution.replace(' ', '_')}"
+
+
+def _policy(table, resolution):
+    return f"""\
+SELECT add_continuous_aggregate_policy(
+    continuous_aggregate => '{_name(table, resolution)}',
+    start_offset => '10 days',
+    end_offset => '{resolution}',
+    schedule_interval => '{resolution}');"""
+
+
+def _generic_ladder():
+    """Return the aggregates of the generic table with one row per attribute."""
+    blocks = []
+    for i, resolution in enumerate(RESOLUTIONS):
+        if i == 0:
+            source = "measurement"
+            columns = [
+                f"time_bucket('{resolution}', creation_timestamp) AS bucket_timestamp",
+                "min(value) AS minimum",
+                "max(value) AS maximum",
+                "avg(value) AS average",
+                "count(*) AS count",
+            ]
+            grouping = "bucket_timestamp"
+        else:
+            source = _name("measurement", RESOLUTIONS[i - 1])
+            columns = [
+                f"time_bucket('{resolution}', bucket_timestamp) AS bucket_timestamp",
+                "min(minimum) AS minimum",
+                "max(maximum) AS maximum",
+                "sum(average * count) / sum(count) AS average",
+                "sum(count)::BIGINT AS count",
+            ]
+            grouping = f"time_bucket('{resolution}', bucket_timestamp)"
+        comment = (
+            "-- The measurements are aggregated into a ladder of resolutions. Each"
+            " level is computed\n-- from the next finer level, so refreshes never"
+            " read more than the finest level's rows.\n-- Averages are weighted by"
+            " the number of values they summarize.\n"
+        )
+        name = _name("measurement", resolution)
+        blocks.append(f"""\
+{comment if i == 0 else ""}CREATE MATERIALIZED VIEW {name}
+WITH (timescaledb.continuous, timescaledb.materialized_only = true, timescaledb.create_group_indexes = false) AS
+    SELECT
+        sensor_identifier,
+        attribute_identifier,
+{_indent(columns, 8, ",")}
+    FROM {source}
+    GROUP BY sensor_identifier, attribute_identifier, {grouping}
+WITH NO DATA;
+
+CREATE INDEX ON {name} (sensor_identifier ASC, bucket_timestamp ASC, attribute_identifier ASC);
+
+{_policy("measurement", resolution)}""")
+    return blocks
+
+
+def _family_table(table, attributes, first):
+    """Return the definition of a family's hypertable with one column per attribute."""
+    comment = (
+        "-- With the wide storage mode (see HERMES_MEASUREMENT_STORAGE), samples of the"
+        " well-known\n-- measurement families of the edge nodes are stored as a single"
+        " row with one column per\n-- attribute instead of one row per attribute."
+        " Attributes that a sample doesn't contain\n-- are NULL. Samples with other"
+        " attributes fall back to the generic table.\n"
+    )
+    chunks = (
+        "-- The family tables hold one row per sample instead of one row per attribute,"
+        " so their\n-- chunks can span a longer time; They are compressed the same way"
+        " as the generic table\n"
+    )
+    columns = [
+        "sensor_identifier UUID NOT NULL REFERENCES sensor (identifier) ON DELETE CASCADE",
+        "revision INT",
+        "creation_timestamp TIMESTAMPTZ NOT NULL",
+        "receipt_timestamp TIMESTAMPTZ NOT NULL DEFAULT now()",
+        *[f"{attribute} DOUBLE PRECISION" for attribute in attributes],
+    ]
+    return f"""\
+{comment if first else ""}CREATE TABLE {table} (
+{_indent(columns, 4, ",")}
+);
+
+{chunks if first else ""}SELECT create_hypertable('{table}', 'creation_timestamp', chunk_time_interval => INTERVAL '1 week');
+
+CREATE INDEX ON {table} (sensor_identifier ASC, creation_timestamp DESC);
+
+ALTER TABLE {table} SET (
+    timescaledb.compress,
+    timescaledb.compress_segmentby = 'sensor_identifier',
+    timescaledb.compress_orderby = 'creation_timestamp DESC'
+);
+
+SELECT add_compression_policy('{table}', compress_after => INTERVAL '2 weeks');"""
+
+
+def _family_ladder(table, attributes):
+    """Return the aggregates of a family's table with four columns per attribute."""
+    blocks = []
+    for i, resolution in enumerate(RESOLUTIONS):
+        if i == 0:
+            source = table
+            columns = [
+                f"time_bucket('{resolution}', creation_timestamp) AS bucket_timestamp"
+            ]
+            for x in attributes:
+                columns += [
+                    f"min({x}) AS {x}_minimum",
+                    f"max({x}) AS {x}_maximum",
+                    f"avg({x}) AS {x}_average",
+                    f"count({x}) AS {x}_count",
+                ]
+            grouping = "bucket_timestamp"
+        else:
+            source = _name(table, RESOLUTIONS[i - 1])
+            columns = [
+                f"time_bucket('{resolution}', bucket_timestamp) AS bucket_timestamp"
+            ]
+            for x in attributes:
+                columns += [
+                    f"min({x}_minimum) AS {x}_minimum",
+                    f"max({x}_maximum) AS {x}_maximum",
+                    f"sum({x}_average * {x}_count) / nullif(sum({x}_count), 0) AS"
+                    f" {x}_average",
+                    f"sum({x}_count)::BIGINT AS {x}_count",
+                ]
+            grouping = f"time_bucket('{resolution}', bucket_timestamp)"
+        blocks.append(f"""\
+CREATE MATERIALIZED VIEW {_name(table, resolution)}
+WITH (timescaledb.continuous, timescaledb.materialized_only = true) AS
+    SELECT
+        sensor_identifier,
+{_indent(columns, 8, ",")}
+    FROM {source}
+    GROUP BY sensor_identifier, {grouping}
+WITH NO DATA;
+
+{_policy(table, resolution)}""")
+    return blocks
+
+
+def _sample_view():
+    """Return the view of the measurements of both storage modes as samples."""
+    metadata = ", ".join(f"'{column}'" for column in METADATA)
+    branches = ["""\
+    SELECT
+        measurement.sensor_identifier,
+        measurement.revision,
+        measurement.creation_timestamp,
+        jsonb_object_agg(attribute.name, measurement.value) AS value
+    FROM measurement
+    JOIN attribute ON attribute.identifier = measurement.attribute_identifier
+    -- Grouping in the order of the index lets pages stream from an index scan
+    GROUP BY
+        measurement.sensor_identifier,
+        measurement.creation_timestamp,
+        measurement.revision"""]
+    for table in mqtt.FAMILIES:
+        branches.append(f"""\
+    SELECT
+        sensor_identifier,
+        revision,
+        creation_timestamp,
+        jsonb_strip_nulls(to_jsonb(x) - ARRAY[{metadata}]) AS value
+    FROM {table} AS x""")
+    return f"""\
+-- Measurements of both storage modes with one row per sample; Data points in the generic
+-- table with the same timestamp and revision are assembled back into samples
+CREATE VIEW measurement_sample AS
+{_union(branches)};"""
+
+
+def _bucket_views():
+    """Return one view per resolution of the aggregates of both storage modes."""
+    blocks = []
+    for resolution in RESOLUTIONS:
+        branches = [f"""\
+    SELECT
+        x.sensor_identifier,
+        attribute.name AS attribute,
+        x.bucket_timestamp,
+        x.minimum,
+        x.maximum,
+        x.average,
+        x.count
+    FROM {_name("measurement", resolution)} AS x
+    JOIN attribute ON attribute.identifier = x.attribute_identifier"""]
+        for table, attributes in mqtt.FAMILIES.items():
+            values = [
+                f"('{x}', x.{x}_minimum, x.{x}_maximum, x.{x}_average, x.{x}_count)"
+                for x in attributes
+            ]
+            branches.append(f"""\
+    SELECT
+        x.sensor_identifier,
+        y.attribute,
+        x.bucket_timestamp,
+        y.minimum,
+        y.maximum,
+        y.average,
+        y.count
+    FROM {_name(table, resolution)} AS x
+    CROSS JOIN LATERAL (
+        VALUES
+{_indent(values, 12, ",")}
+    ) AS y (attribute, minimum, maximum, average, count)
+    WHERE y.count > 0""")
+        blocks.append(f"""\
+-- Aggregates of both storage modes in buckets of {resolution} with one row per attribute
+CREATE VIEW measurement_bucket_{resolution.replace(" ", "_")} AS
+{_union(branches)};""")
+    return blocks
+
+
+def _value_views():
+    """Return the views of the measurements with one row per attribute."""
+    branches = []
+    for table, attributes in mqtt.FAMILIES.items():
+        values = [f"('{x}', x.{x})" for x in attributes]
+        branches.append(f"""\
+    SELECT
+        x.sensor_identifier,
+        y.attribute,
+        y.value,
+        x.revision,
+        x.creation_timestamp
+    FROM {table} AS x
+    CROSS JOIN LATERAL (
+        VALUES
+{_indent(values, 12, ",")}
+    ) AS y (attribute, value)
+    WHERE y.value IS NOT NULL""")
+    return [
+        f"""\
+-- Measurements of the wide storage mode with one row per attribute
+CREATE VIEW measurement_family_value AS
+{_union(branches)};""",
+        """\
+-- Measurements of both storage modes with one row per attribute
+CREATE VIEW measurement_value AS
+    SELECT
+        measurement.sensor_identifier,
+        attribute.name AS attribute,
+        measurement.value,
+        measurement.revision,
+        measurement.creation_timestamp
+    FROM measurement
+    JOIN attribute ON attribute.identifier = measurement.attribute_identifier
+    UNION ALL
+    SELECT sensor_identifier, attribute, value, revision, creation_timestamp
+    FROM measurement_family_value;""",
+    ]
+
+
+def _indent(lines, width, separator):
+    return f"{separator}\n".join(" " * width + line for line in lines)
+
+
+def _union(branches):
+    return "\n    UNION ALL\n".join(branches)
+
+
+def generate():
+    """Return the SQL definitions of the measurement families and aggregates."""
+    blocks = _generic_ladder()
+    # The header is part of the first statement, so that it isn't executed on its own
+    blocks[0] = f"{HEADER}\n\n{blocks[0]}"
+    for i, (table, attributes) in enumerate(mqtt.FAMILIES.items()):
+        blocks.append(_family_table(table, attributes, first=i == 0))
+    for table, attributes in mqtt.FAMILIES.items():
+        blocks.extend(_family_ladder(table, attributes))
+    blocks.append(_sample_view())
+    blocks.extend(_bucket_views())
+    blocks.extend(_value_views())
+    # Statements are separated by two blank lines, see scripts/initialize.py
+    return "\n\n\n".join(blocks) + "\n"
+
+
+if __name__ == "__main__":
+    with open("measurements.sql", "w") as file:
+        file.write(generate())
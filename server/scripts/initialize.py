@@ -7,12 +7,14 @@ import tests.conftest
 async def initialize(populate=False):
     """Initialize the database schema, optionally populate with example data."""
     async with tests.conftest._connection() as connection:
-        with open("schema.sql") as file:
-            for statement in file.read().split("\n\n\n"):
-                await connection.execute(statement)
+        # The measurement aggregates and families are generated, see scripts/generate
+        for path in ["schema.sql", "measurements.sql"]:
+            with open(path) as file:
+                for statement in file.read().split("\n\n\n"):
+                    await connection.execute(statement)
         if populate:
             await tests.conftest._populate(connection)
-            await connection.execute("CALL refresh_continuous_aggregate('measurement_aggregation_1_hour', NULL, NULL);")  # fmt: skip
+            await tests.conftest._refresh(connection)
 
 
 if __name__ == "__main__":
@@ -5,6 +5,7 @@ import os
 import asyncpg
 import pytest
 
+import app.auth as auth
 import app.database as database
 
 
@@ -48,6 +49,20 @@ async def _populate(connection):
             )
 
 
+async def _refresh(connection):
+    """Materialize all continuous aggregates, the finer resolutions first."""
+    elements = await connection.fetch("SELECT view_name FROM timescaledb_information.continuous_aggregates;")  # fmt: skip
+    # The coarser aggregates are computed from the finer ones
+    resolutions = ["1_minute", "10_minutes", "1_hour", "1_day"]
+
+    def key(element):
+        suffix = element["view_name"].split("_aggregation_")[-1]
+        return resolutions.index(suffix) if suffix in resolutions else 0
+
+    for element in sorted(elements, key=key):
+        await connection.execute(f"CALL refresh_continuous_aggregate('{element['view_name']}', NULL, NULL);")  # fmt: skip
+
+
 @pytest.fixture(scope="function")
 async def setup(connection):
     """Reset the database to contain the initial test data for each test."""
@@ -56,5 +71,12 @@ async def setup(connection):
         await connection.execute('DELETE FROM "user";')
         await connection.execute("DELETE FROM network;")
         await connection.execute("DELETE FROM sensor;")
+        await connection.execute("DELETE FROM attribute;")
         # Populate with the initial test data again
         await _populate(connection)
+        # Continue generating attribute codes after the ones from the test data
+        await connection.execute("SELECT setval(pg_get_serial_sequence('attribute', 'identifier'), max(identifier)) FROM attribute;")  # fmt: skip
+    # Forget what the server cached during the previous test
+    auth.sessions.clear()
+    auth.relationships.clear()
+    auth.sensors.clear()
@@ -0,0 +1,115 @@
+import types
+
+import pytest
+
+import app.auth as auth
+import app.errors as errors
+
+
+########################################################################################
+# Cache
+########################################################################################
+
+
+def test_cache_returns_cached_values():
+    """Test that the cache returns values until they are invalidated."""
+    cache = auth.Cache(ttl=3600, size=4096)
+    cache.set("a", 1)
+    cache.set("b", None)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    cache.invalidate("a")
+    with pytest.raises(KeyError):
+        cache.get("a")
+    cache.clear()
+    with pytest.raises(KeyError):
+        cache.get("b")
+
+
+def test_cache_forgets_expired_values():
+    """Test that values expire after the shorter of the default and the given ttl."""
+    cache = auth.Cache(ttl=0, size=4096)
+    cache.set("a", 1, ttl=3600)
+    with pytest.raises(KeyError):
+        cache.get("a")
+    cache = auth.Cache(ttl=3600, size=4096)
+    cache.set("a", 1, ttl=-1)
+    with pytest.raises(KeyError):
+        cache.get("a")
+    assert len(cache.entries) == 0
+
+
+def test_cache_evicts_least_recently_used_values():
+    """Test that the cache stays within its size by evicting the unused values."""
+    cache = auth.Cache(ttl=3600, size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    with pytest.raises(KeyError):
+        cache.get("b")
+
+
+########################################################################################
+# Authorization
+########################################################################################
+
+
+class _Pool:
+    """Fake database pool that answers authorization queries and counts them."""
+
+    def __init__(self, elements):
+        self.elements = elements
+        self.queries = 0
+
+    async def fetch(self, query, *arguments):
+        self.queries += 1
+        return self.elements
+
+
+def _request(dbpool):
+    """Return a fake request of an authenticated user."""
+    return types.SimpleNamespace(
+        state=types.SimpleNamespace(identity="user", dbpool=dbpool)
+    )
+
+
+@pytest.fixture(scope="function")
+def caches():
+    """Start each test with empty authorization caches."""
+    auth.relationships.clear()
+    auth.sensors.clear()
+    yield
+    auth.relationships.clear()
+    auth.sensors.clear()
+
+
+@pytest.mark.anyio
+async def test_authorize_sensor_from_cache(caches):
+    """Test that repeated authorizations of a sensor don't query the database."""
+    dbpool = _Pool([{"user_identifier": "user"}])
+    request = _request(dbpool)
+    sensor = auth.Sensor({"network_identifier": "n", "sensor_identifier": "s"})
+    assert await auth.authorize(request, sensor) == auth.Relationship.OWNER
+    assert await auth.authorize(request, sensor) == auth.Relationship.OWNER
+    # The relationship with the network was cached along with the sensor
+    assert await auth.authorize(request, auth.Network("n")) == auth.Relationship.OWNER
+    assert dbpool.queries == 1
+    # Invalidating the sensor reads it from the database again
+    auth.sensors.invalidate(("n", "s"))
+    assert await auth.authorize(request, sensor) == auth.Relationship.OWNER
+    assert dbpool.queries == 2
+
+
+@pytest.mark.anyio
+async def test_authorize_nonexistent_sensor_without_cache(caches):
+    """Test that sensors that don't exist are looked up again every time."""
+    dbpool = _Pool([])
+    request = _request(dbpool)
+    sensor = auth.Sensor({"network_identifier": "n", "sensor_identifier": "s"})
+    for _ in range(2):
+        with pytest.raises(errors.NotFoundError):
+            await auth.authorize(request, sensor)
+    assert dbpool.queries == 2
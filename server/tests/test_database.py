@@ -0,0 +1,242 @@
+import json
+
+import asgi_lifespan
+import pytest
+
+import app.database as database
+import app.main as main
+import app.settings as settings
+import scripts.generate as generate
+import tests.conftest as conftest
+
+
+@pytest.fixture(scope="session")
+def sensor_identifier():
+    return "81bf7042-e20f-4a97-ac44-c15853e3618f"
+
+
+########################################################################################
+# Query registry
+########################################################################################
+
+
+def test_parametrize():
+    """Test translating named arguments into a tuple of numbered arguments."""
+    query, arguments = database.parametrize(
+        identifier="create-permission",
+        arguments={"network_identifier": "y", "user_identifier": "x"},
+    )
+    assert "${" not in query
+    assert arguments == ("x", "y")
+    # Missing arguments are filled with None
+    _, arguments = database.parametrize(
+        identifier="create-permission",
+        arguments=[{"user_identifier": "x"}, {"network_identifier": "y"}],
+    )
+    assert arguments == [("x", None), (None, "y")]
+    with pytest.raises(ValueError):
+        database.parametrize(identifier="create-permission", arguments={"z": 1})
+
+
+def test_aggregates_queries_match_resolutions():
+    """Test that each resolution of the server has its aggregates view and query."""
+    assert sorted(main._RESOLUTIONS) == sorted(generate.RESOLUTIONS)
+    for resolution in main._RESOLUTIONS:
+        query, _ = database.parametrize(
+            identifier=f"read-measurements-aggregates-{resolution.replace(' ', '-')}",
+            arguments={},
+        )
+        assert f"FROM measurement_bucket_{resolution.replace(' ', '_')}\n" in query
+
+
+########################################################################################
+# Keyset pagination
+########################################################################################
+
+
+# The pagination queries before they were split by direction, as reference
+_REFERENCE = """
+SELECT {columns}
+FROM {table}
+WHERE
+    sensor_identifier = $1
+    AND CASE
+        WHEN $2::TIMESTAMPTZ IS NOT NULL
+            THEN (
+                CASE
+                    WHEN $3 = 'next' THEN creation_timestamp > $2
+                    WHEN $3 = 'previous' THEN creation_timestamp < $2
+                    ELSE TRUE
+                END
+            )
+        ELSE TRUE
+    END
+ORDER BY
+    CASE WHEN $3 = 'next' THEN creation_timestamp END ASC,
+    CASE WHEN $3 = 'previous' THEN creation_timestamp END DESC
+LIMIT 64;
+"""
+
+
+async def _pages(connection, identifier, reference, sensor_identifier, direction):
+    """Page through all elements and check that each page matches the reference."""
+    creation_timestamp, count = None, 0
+    while True:
+        query, arguments = database.parametrize(
+            identifier=f"{identifier}-{direction}",
+            arguments={
+                "sensor_identifier": sensor_identifier,
+                "creation_timestamp": creation_timestamp,
+                "limit": 64,
+            },
+        )
+        page = await connection.fetch(query, *arguments)
+        expected = await connection.fetch(
+            reference, sensor_identifier, creation_timestamp, direction
+        )
+        assert [dict(x) for x in page] == [dict(x) for x in expected]
+        if len(page) == 0:
+            return count
+        creation_timestamp, count = page[-1]["creation_timestamp"], count + len(page)
+
+
+@pytest.mark.anyio
+async def test_read_measurements_pages(setup, connection, sensor_identifier):
+    """Test that paging through measurements returns the same pages as before."""
+    await connection.executemany(
+        "INSERT INTO measurement VALUES ($1, 1, $2, NULL, $3, now());",
+        [(sensor_identifier, float(i), 1000.0 + i) for i in range(150)],
+    )
+    reference = _REFERENCE.format(
+        columns="revision, creation_timestamp, value", table="measurement_sample"
+    )
+    for direction in ["next", "previous"]:
+        count = await _pages(
+            connection, "read-measurements", reference, sensor_identifier, direction
+        )
+        assert count == 154
+
+
+@pytest.mark.anyio
+async def test_read_logs_pages(setup, connection, sensor_identifier):
+    """Test that paging through logs returns the same pages as before."""
+    await connection.executemany(
+        "INSERT INTO log VALUES ($1, 'info', $2, NULL, $3, now());",
+        [(sensor_identifier, f"message {i}", 1000.0 + i) for i in range(150)],
+    )
+    reference = _REFERENCE.format(
+        columns=(
+            "severity, message AS subject, '' AS details, revision, creation_timestamp"
+        ),
+        table="log",
+    )
+    for direction in ["next", "previous"]:
+        count = await _pages(
+            connection, "read-logs", reference, sensor_identifier, direction
+        )
+        assert count == 155
+
+
+########################################################################################
+# Retention
+########################################################################################
+
+
+@pytest.mark.anyio
+async def test_retain_measurements(setup, connection, sensor_identifier):
+    """Test that raw measurements are aggregated before they are dropped."""
+
+    async def insert(timestamp):
+        await connection.execute(
+            "INSERT INTO measurement"
+            " SELECT $1, identifier, 5000.0, NULL, $2, now()"
+            " FROM attribute WHERE name = 'temperature';",
+            sensor_identifier,
+            timestamp,
+        )
+
+    async def aggregate():
+        return await connection.fetchval(
+            "SELECT sum(count) FROM measurement_aggregation_1_day"
+            " WHERE sensor_identifier = $1;",
+            sensor_identifier,
+        )
+
+    # Materialize everything, then add a measurement to an old bucket that the
+    # aggregates have to catch up on before the raw measurements are dropped
+    await conftest._refresh(connection)
+    await insert(500.0)
+    job = await connection.fetchval(
+        "SELECT job_id FROM timescaledb_information.jobs"
+        " WHERE proc_name = 'retain_measurements';"
+    )
+    await connection.execute(
+        "SELECT alter_job($1, config => $2);", job, {"drop_after": "1 year"}
+    )
+    try:
+        await connection.execute(f"CALL run_job({job});")
+        count = await connection.fetchval(
+            "SELECT count(*) FROM measurement WHERE sensor_identifier = $1;",
+            sensor_identifier,
+        )
+        assert count == 0
+        assert await aggregate() == 8
+        # A measurement that arrives after its bucket's raw measurements were dropped
+        # must not replace the bucket's aggregates with the aggregates of itself
+        await insert(0.0)
+        await connection.execute(f"CALL run_job({job});")
+        assert await aggregate() == 8
+    finally:
+        await connection.execute(
+            "SELECT alter_job($1, config => $2);", job, {"drop_after": None}
+        )
+
+
+@pytest.mark.anyio
+async def test_configure_measurement_retention(setup, connection, monkeypatch):
+    """Test that the server configures the retention job from its settings."""
+    monkeypatch.setattr(settings, "MEASUREMENT_RETENTION", "1 year")
+    query = (
+        "SELECT job_id, scheduled, config FROM timescaledb_information.jobs"
+        " WHERE proc_name = 'retain_measurements';"
+    )
+    try:
+        async with asgi_lifespan.LifespanManager(main.app):
+            element = await connection.fetchrow(query)
+    finally:
+        await connection.execute(
+            "SELECT alter_job(job_id, scheduled => false, config => $1)"
+            " FROM timescaledb_information.jobs"
+            " WHERE proc_name = 'retain_measurements';",
+            {"drop_after": None},
+        )
+    assert element["scheduled"]
+    assert element["config"] == {"drop_after": "1 year"}
+
+
+########################################################################################
+# Codecs
+########################################################################################
+
+
+@pytest.mark.anyio
+async def test_codecs(connection, sensor_identifier):
+    """Test that the binary codecs give the same values as the text representations."""
+    value = {"temperature": 23.1, "message": "ü", "values": [1, None]}
+    element = await connection.fetchrow(
+        """
+        SELECT
+            $1::UUID AS uuid,
+            $1::UUID::TEXT AS uuid_text,
+            $2::JSONB AS jsonb,
+            $2::JSONB::TEXT AS jsonb_text,
+            $3::TIMESTAMPTZ AS timestamp,
+            extract(epoch FROM $3::TIMESTAMPTZ)::DOUBLE PRECISION AS timestamp_text;
+        """,
+        sensor_identifier,
+        value,
+        1683645000.123456,
+    )
+    assert element["uuid"] == element["uuid_text"] == sensor_identifier
+    assert element["jsonb"] == json.loads(element["jsonb_text"]) == value
+    assert element["timestamp"] == element["timestamp_text"] == 1683645000.123456
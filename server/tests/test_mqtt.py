@@ -1,8 +1,14 @@
+import asyncio
+import contextlib
+import json
+
 import aiomqtt
+import asyncpg
 import pytest
 
 import app.mqtt as mqtt
 import app.settings as settings
+import scripts.generate as generate
 
 
 @pytest.fixture(scope="session")
@@ -18,6 +24,221 @@ async def mqtt_client():
         yield mqtt_client
 
 
+class _Pool:
+    """Stand-in for the database pool that records the executed batches.
+
+    Batches that contain one of the `unknown` sensor identifiers are rejected like
+    PostgreSQL would reject them because of the foreign key constraint.
+    """
+
+    def __init__(self, sensors=(), unknown=()):
+        self.batches = []
+        self.tables = []
+        self.latest = []  # Arguments of the updates of the latest state
+        self.attributes = {}
+        self.sensors = list(sensors)
+        self.unknown = set(unknown)
+
+    async def fetch(self, query, *arguments):
+        await asyncio.sleep(0)
+        if "INSERT INTO attribute" in query:
+            for name in arguments[0]:
+                self.attributes.setdefault(name, len(self.attributes) + 1)
+            return [
+                {"attribute_identifier": self.attributes[x], "attribute_name": x}
+                for x in arguments[0]
+            ]
+        return [{"sensor_identifier": x} for x in self.sensors]
+
+    async def copy_records_to_table(self, table_name, records, columns):
+        await asyncio.sleep(0)
+        if any(record[0] in self.unknown for record in records):
+            raise asyncpg.ForeignKeyViolationError()
+        self.batches.append(records)
+        self.tables.append(table_name)
+
+    async def executemany(self, query, arguments):
+        await asyncio.sleep(0)
+        if "INSERT INTO sensor_latest" not in query:
+            return
+        if any(x[0] in self.unknown for x in arguments):
+            raise asyncpg.ForeignKeyViolationError()
+        self.latest.extend(arguments)
+
+    @contextlib.asynccontextmanager
+    async def acquire(self):
+        yield self
+
+    @contextlib.asynccontextmanager
+    async def transaction(self):
+        """Roll back the batches that were written when an error occurs."""
+        count, latest = len(self.batches), len(self.latest)
+        try:
+            yield
+        except Exception:
+            del self.batches[count:]
+            del self.tables[count:]
+            del self.latest[latest:]
+            raise
+
+
+def _rows(sensor_identifier, count):
+    return [(sensor_identifier, "temperature", 23.1, 0, float(i)) for i in range(count)]
+
+
+@pytest.mark.anyio
+async def test_buffer_flushes_when_full():
+    """Test that the buffer writes in bulk as soon as it reaches its size."""
+    dbpool = _Pool()
+    buffer = mqtt.Buffer(dbpool, size=4, latency=3600)
+    await buffer.put(mqtt._process_measurements, _rows("a", 3))
+    assert len(dbpool.batches) == 0
+    await buffer.put(mqtt._process_measurements, _rows("b", 2))
+    assert [len(batch) for batch in dbpool.batches] == [5]
+    assert buffer.count == 0
+
+
+@pytest.mark.anyio
+async def test_buffer_flushes_after_latency():
+    """Test that the buffer writes partial batches after the maximum latency."""
+    dbpool = _Pool()
+    async with mqtt.Buffer(dbpool, size=4096, latency=0.01) as buffer:
+        await buffer.put(mqtt._process_measurements, _rows("a", 1))
+        await buffer.put(mqtt._process_measurements, _rows("b", 1))
+        await asyncio.sleep(0.1)
+        assert [len(batch) for batch in dbpool.batches] == [2]
+
+
+@pytest.mark.anyio
+async def test_buffer_isolates_unknown_sensors():
+    """Test that rows of known sensors are written if a batch has unknown sensors."""
+    dbpool = _Pool(unknown={"b"})
+    buffer = mqtt.Buffer(dbpool, size=4096, latency=3600)
+    await buffer.put(mqtt._process_measurements, _rows("a", 2))
+    await buffer.put(mqtt._process_measurements, _rows("b", 2))
+    await buffer.put(mqtt._process_measurements, _rows("c", 1))
+    await buffer.flush()
+    assert [len(batch) for batch in dbpool.batches] == [2, 1]
+
+
+@pytest.mark.anyio
+async def test_dispatcher_preserves_order_per_sensor():
+    """Test that the workers write each sensor's messages in the order received."""
+    dbpool = _Pool()
+    async with mqtt.Dispatcher(dbpool, workers=3, size=2) as dispatcher:
+        for i in range(16):
+            for sensor_identifier in ["a", "b", "c", "d"]:
+                await dispatcher.put(
+                    sensor_identifier,
+                    mqtt._decode_measurements,
+                    mqtt._process_measurements,
+                    mqtt._encode_payload(
+                        [{"timestamp": float(i), "value": {"temperature": 23.1}}]
+                    ),
+                )
+    # All queued messages are written when the dispatcher exits
+    rows = [row for batch in dbpool.batches for row in batch]
+    assert len(rows) == 64
+    for sensor_identifier in ["a", "b", "c", "d"]:
+        timestamps = [row[4] for row in rows if row[0] == sensor_identifier]
+        assert timestamps == sorted(timestamps)
+
+
+def test_deduplicator_drops_redeliveries():
+    """Test that rows are dropped if they were received before within the window."""
+    deduplicator = mqtt.Deduplicator(window=3600, size=4096)
+    assert deduplicator.filter(_rows("a", 2)) == _rows("a", 2)
+    assert deduplicator.filter(_rows("a", 3)) == _rows("a", 3)[2:]
+    assert deduplicator.filter(_rows("b", 1)) == _rows("b", 1)
+    assert deduplicator.suppressed == 2
+
+
+def test_deduplicator_keeps_rows_with_equal_hashes():
+    """Test that distinct rows are kept even if their hashes collide."""
+    deduplicator = mqtt.Deduplicator(window=3600, size=4096)
+    rows = [("a", "temperature", -1.0, 0, 0.0), ("a", "temperature", -2.0, 0, 0.0)]
+    assert hash(rows[0]) == hash(rows[1])
+    assert deduplicator.filter(rows) == rows
+    assert deduplicator.suppressed == 0
+
+
+def test_deduplicator_forgets_old_rows():
+    """Test that the deduplicator stays within its size and time window."""
+    deduplicator = mqtt.Deduplicator(window=3600, size=2)
+    deduplicator.filter(_rows("a", 3))
+    assert len(deduplicator.rows) == 2
+    assert deduplicator.filter(_rows("a", 1)) == _rows("a", 1)
+    deduplicator = mqtt.Deduplicator(window=0, size=4096)
+    deduplicator.filter(_rows("a", 1))
+    assert deduplicator.filter(_rows("a", 1)) == _rows("a", 1)
+    assert deduplicator.suppressed == 0
+
+
+@pytest.mark.anyio
+async def test_registry_keeps_sensors_added_during_refresh():
+    """Test that a sensor created while the registry reloads is not forgotten."""
+    dbpool = _Pool(sensors=["a", "b"])
+    registry = mqtt.Registry(dbpool)
+    task = asyncio.create_task(registry.refresh())
+    await asyncio.sleep(0)  # The refresh is now waiting for the database
+    registry.add("c")
+    await task
+    assert "a" in registry and "b" in registry and "c" in registry
+    assert "d" not in registry
+
+
+@pytest.mark.anyio
+async def test_dictionary_caches_attribute_codes():
+    """Test that attribute names are replaced by codes that are only looked up once."""
+    dbpool = _Pool()
+    dictionary = mqtt.Dictionary()
+    rows = _rows("a", 2) + [("b", "humidity", 40.0, 0, 0.0)]
+    rows = await dictionary.encode(rows, dbpool)
+    codes = dbpool.attributes
+    assert rows == [
+        ("a", codes["temperature"], 23.1, 0, 0.0),
+        ("a", codes["temperature"], 23.1, 0, 1.0),
+        ("b", codes["humidity"], 40.0, 0, 0.0),
+    ]
+    # The database would now return a different code if it were asked again
+    dbpool.attributes = {"pressure": 1, "temperature": 2, "humidity": 3}
+    rows = await dictionary.encode(_rows("a", 1), dbpool)
+    assert rows == [("a", codes["temperature"], 23.1, 0, 0.0)]
+
+
+def _value(value, revision, timestamp):
+    return {"value": value, "revision": revision, "creation_timestamp": timestamp}
+
+
+@pytest.mark.anyio
+async def test_process_measurements_updates_latest_values():
+    """Test that the newest value of each attribute is kept as the latest state."""
+    dbpool = _Pool()
+    rows = [
+        ("b", "temperature", 20.0, 0, 1.0),
+        ("a", "temperature", 21.0, 0, 3.0),
+        ("a", "temperature", 22.0, 1, 2.0),
+        ("a", "humidity", 40.0, 0, 1.0),
+    ]
+    await mqtt._process_measurements(rows, dbpool)
+    assert dbpool.latest == [
+        ("a", {"temperature": _value(21.0, 0, 3.0), "humidity": _value(40.0, 0, 1.0)}),
+        ("b", {"temperature": _value(20.0, 0, 1.0)}),
+    ]
+
+
+@pytest.mark.anyio
+async def test_process_logs_updates_latest_log():
+    """Test that the newest log of each sensor is kept as the latest state."""
+    dbpool = _Pool()
+    rows = [
+        ("a", "info", "Everything is fine.", 0, 2.0),
+        ("a", "error", "Something is wrong.", 0, 1.0),
+    ]
+    await mqtt._process_logs(rows, dbpool)
+    assert dbpool.latest == [("a", "info", "Everything is fine.", 0, 2.0)]
+
+
 @pytest.mark.anyio
 async def test_receiving_measurements_message(mqtt_client):
     """Test receiving a measurements message.
@@ -32,3 +253,54 @@ async def test_receiving_measurements_message(mqtt_client):
         ),
         qos=1,
     )
+
+
+def _sample(value, timestamp=1683645000.0):
+    return {"revision": 0, "timestamp": timestamp, "value": value}
+
+
+def test_decode_samples_by_family():
+    """Test that samples of known families become a single row in their table."""
+    payload = json.dumps([
+        _sample({"gmp343_raw": 410.2, "gmp343_compensated": 409.8}),
+        _sample({"wxt532_temperature": 21.0, "wxt532_last_update_time": 1.0}),
+        _sample({"gmp343_raw": 410.2, "temperature": 23.1}),
+        _sample({}),
+    ])
+    rows = mqtt._decode_samples("a", payload)
+    co2 = mqtt.FAMILIES["measurement_co2"]
+    assert rows[0][:4] == ("a", "measurement_co2", 0, 1683645000.0)
+    assert rows[0][4:] == (410.2, 409.8) + (None,) * (len(co2) - 2)
+    assert rows[1][1] == "measurement_wind_sensor"
+    # Samples with unknown attributes fall back to the generic table
+    assert rows[2:] == [
+        ("a", "measurement", "gmp343_raw", 410.2, 0, 1683645000.0),
+        ("a", "measurement", "temperature", 23.1, 0, 1683645000.0),
+    ]
+    for row in rows:
+        assert len(row) == len(mqtt.SAMPLE_COLUMNS[row[1]]) + 1
+
+
+@pytest.mark.anyio
+async def test_process_samples_isolates_unknown_sensors():
+    """Test that retries after a rejected batch don't duplicate rows of other tables."""
+    dbpool = _Pool(unknown={"b"})
+    rows = mqtt._decode_samples(
+        "a", json.dumps([_sample({"gmp343_raw": 1.0}), _sample({"x": 2.0})])
+    ) + mqtt._decode_samples("b", json.dumps([_sample({"x": 3.0})]))
+    await mqtt._write(mqtt._process_samples, rows, dbpool)
+    assert dbpool.tables == ["measurement_co2", "measurement"]
+    assert [[record[0] for record in batch] for batch in dbpool.batches] == [
+        ["a"],
+        ["a"],
+    ]
+    assert dbpool.latest == [(
+        "a",
+        {"gmp343_raw": _value(1.0, 0, 1683645000.0), "x": _value(2.0, 0, 1683645000.0)},
+    )]
+
+
+def test_families_match_schema():
+    """Test that the generated schema is up to date with the known families."""
+    with open("measurements.sql") as file:
+        assert file.read() == generate.generate(), "Run scripts/generate"
@@ -1,9 +1,15 @@
+import csv
+import io
+import json
+
 import asgi_lifespan
 import httpx
 import pytest
 
 import app.errors as errors
 import app.main as main
+import app.settings as settings
+import tests.conftest as conftest
 
 
 @pytest.fixture(scope="session")
@@ -177,6 +183,18 @@ async def test_read_networks_with_invalid_authentication(setup, client, token):
     assert returns(response, errors.UnauthorizedError)
 
 
+@pytest.mark.anyio
+async def test_read_networks_with_expired_session(
+    setup, client, access_token, monkeypatch
+):
+    """Test reading the networks with the access token of an expired session."""
+    monkeypatch.setattr(settings, "SESSION_LIFETIME", 86400)
+    response = await client.get(
+        url="/networks", headers={"Authorization": f"Bearer {access_token}"}
+    )
+    assert returns(response, errors.UnauthorizedError)
+
+
 ########################################################################################
 # Route: POST /networks/<network_identifier>/sensors
 ########################################################################################
@@ -274,6 +292,104 @@ async def test_read_sensors_with_invalid_authorization(
     assert returns(response, errors.ForbiddenError)
 
 
+########################################################################################
+# Route: GET /networks/<network_identifier>/latest
+########################################################################################
+
+
+@pytest.mark.anyio
+async def test_read_latest(
+    setup, client, network_identifier, sensor_identifier, access_token
+):
+    """Test reading the latest state of all sensors in a network."""
+    response = await client.get(
+        url=f"/networks/{network_identifier}/latest",
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert returns(response, 200)
+    assert len(response.json()) == 3
+    assert keys(
+        response,
+        {"sensor_identifier", "sensor_name", "measurements", "log", "acknowledgment"},
+    )
+    elements = {x["sensor_identifier"]: x for x in response.json()}
+    assert elements[sensor_identifier]["measurements"]["temperature"]["value"] == 7800
+    assert elements[sensor_identifier]["log"]["severity"] == "error"
+    assert elements[sensor_identifier]["acknowledgment"]["revision"] == 1
+    # Sensors that haven't sent anything yet have an empty state
+    assert elements["2d2a3794-2345-4500-8baa-493f88123087"]["measurements"] == {}
+    assert elements["2d2a3794-2345-4500-8baa-493f88123087"]["log"] is None
+
+
+@pytest.mark.anyio
+async def test_read_latest_with_invalid_authorization(setup, client, access_token):
+    """Test reading the latest state having unsufficient permissions."""
+    response = await client.get(
+        url="/networks/2f9a5285-4ce1-4ddb-a268-0164c70f4826/latest",
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert returns(response, errors.ForbiddenError)
+
+
+########################################################################################
+# Route: GET /networks/<network_identifier>/health
+########################################################################################
+
+
+@pytest.mark.anyio
+async def test_read_health(
+    setup, client, network_identifier, sensor_identifier, access_token
+):
+    """Test that sensors without recent measurements or logs are offline."""
+    response = await client.get(
+        url=f"/networks/{network_identifier}/health",
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert returns(response, 200)
+    assert len(response.json()) == 3
+    assert keys(
+        response,
+        {
+            "sensor_identifier",
+            "sensor_name",
+            "status",
+            "measurement_timestamp",
+            "log_timestamp",
+        },
+    )
+    assert all(element["status"] == "offline" for element in response.json())
+
+
+@pytest.mark.anyio
+async def test_read_health_with_windows(
+    setup, client, network_identifier, sensor_identifier, access_token
+):
+    """Test classifying the health with windows that cover the test data."""
+    response = await client.get(
+        url=f"/networks/{network_identifier}/health",
+        headers={"Authorization": f"Bearer {access_token}"},
+        params={"measurement_window": 2000000000, "log_window": 2000000000},
+    )
+    assert returns(response, 200)
+    elements = {x["sensor_identifier"]: x for x in response.json()}
+    assert elements[sensor_identifier]["status"] == "unstable"
+    assert elements[sensor_identifier]["measurement_timestamp"] == 300
+    assert elements[sensor_identifier]["log_timestamp"] == 400
+
+
+@pytest.mark.anyio
+async def test_read_health_with_invalid_window(
+    setup, client, network_identifier, access_token
+):
+    """Test classifying the health with a window that is not positive."""
+    response = await client.get(
+        url=f"/networks/{network_identifier}/health",
+        headers={"Authorization": f"Bearer {access_token}"},
+        params={"measurement_window": 0},
+    )
+    assert returns(response, errors.BadRequestError)
+
+
 ########################################################################################
 # Route: PUT /networks/<network_identifier>/sensors/<sensor_identifier>
 ########################################################################################
@@ -488,8 +604,365 @@ async def test_read_measurements_with_previous_page(
     assert sorts(response, lambda x: x["creation_timestamp"])
 
 
+@pytest.mark.anyio
+async def test_read_measurements_with_previous_page_without_cursor(
+    setup, client, network_identifier, sensor_identifier, access_token
+):
+    """Test reading the newest measurements."""
+    response = await client.get(
+        url=f"/networks/{network_identifier}/sensors/{sensor_identifier}/measurements",
+        headers={"Authorization": f"Bearer {access_token}"},
+        params={"direction": "previous"},
+    )
+    assert returns(response, 200)
+    assert isinstance(response.json(), list)
+    assert len(response.json()) == 4
+    assert response.json()[-1]["creation_timestamp"] == 300
+    assert sorts(response, lambda x: x["creation_timestamp"])
+
+
+@pytest.mark.anyio
+async def test_read_measurements_with_time_range_and_limit(
+    setup, client, network_identifier, sensor_identifier, access_token
+):
+    """Test reading measurements in a time range with a custom page size."""
+    response = await client.get(
+        url=f"/networks/{network_identifier}/sensors/{sensor_identifier}/measurements",
+        headers={"Authorization": f"Bearer {access_token}"},
+        params={"start": 100, "end": 300, "limit": 1, "direction": "previous"},
+    )
+    assert returns(response, 200)
+    assert [x["creation_timestamp"] for x in response.json()] == [200]
+
+
+@pytest.mark.anyio
+async def test_read_measurements_with_attribute(
+    setup, client, network_identifier, sensor_identifier, access_token
+):
+    """Test reading only the measurements that contain a given attribute."""
+    response = await client.get(
+        url=f"/networks/{network_identifier}/sensors/{sensor_identifier}/measurements",
+        headers={"Authorization": f"Bearer {access_token}"},
+        params={"attribute": "humidity"},
+    )
+    assert returns(response, 200)
+    assert len(response.json()) > 0
+    assert all(set(x["value"].keys()) == {"humidity"} for x in response.json())
+
+
+@pytest.mark.anyio
+async def test_read_measurements_with_columns_layout(
+    setup, client, network_identifier, sensor_identifier, access_token
+):
+    """Test that the columns layout holds the same measurements as the rows layout."""
+    url = f"/networks/{network_identifier}/sensors/{sensor_identifier}/measurements"
+    headers = {"Authorization": f"Bearer {access_token}"}
+    rows = await client.get(url=url, headers=headers)
+    response = await client.get(url=url, headers=headers, params={"layout": "columns"})
+    assert returns(response, 200)
+    columns, rows = response.json(), rows.json()
+    assert columns["creation_timestamp"] == [x["creation_timestamp"] for x in rows]
+    assert columns["revision"] == [x["revision"] for x in rows]
+    for attribute, values in columns["value"].items():
+        assert values == [x["value"].get(attribute) for x in rows]
+
+
+@pytest.mark.anyio
+async def test_read_measurements_with_excessive_limit(
+    setup, client, network_identifier, sensor_identifier, access_token
+):
+    """Test reading measurements with a page size above the maximum."""
+    response = await client.get(
+        url=f"/networks/{network_identifier}/sensors/{sensor_identifier}/measurements",
+        headers={"Authorization": f"Bearer {access_token}"},
+        params={"limit": 100000},
+    )
+    assert returns(response, errors.BadRequestError)
+
+
+########################################################################################
+# Route: GET /networks/<network_identifier>/sensors/<sensor_identifier>/measurements/aggregates
+########################################################################################
+
+
+@pytest.mark.anyio
+async def test_read_measurements_aggregates(
+    setup, connection, client, network_identifier, sensor_identifier, access_token
+):
+    """Test reading the aggregates of the coarsest sufficient resolution."""
+    await conftest._refresh(connection)
+    response = await client.get(
+        url=f"/networks/{network_identifier}/sensors/{sensor_identifier}/measurements/aggregates",
+        headers={"Authorization": f"Bearer {access_token}"},
+        params={"start": 0, "end": 3600, "points": 6},
+    )
+    assert returns(response, 200)
+    assert response.json()["resolution"] == 600
+    assert response.json()["attributes"] == {
+        "temperature": [{
+            "bucket_timestamp": 0,
+            "minimum": 6000.0,
+            "maximum": 8200.0,
+            "average": 7200.0,
+            "count": 4,
+        }],
+        "humidity": [{
+            "bucket_timestamp": 0,
+            "minimum": -0.4,
+            "maximum": 1.2,
+            "average": pytest.approx(0.3),
+            "count": 3,
+        }],
+    }
+
+
+@pytest.mark.anyio
+async def test_read_measurements_aggregates_with_unmaterialized_tail(
+    setup, connection, client, network_identifier, sensor_identifier, access_token
+):
+    """Test that buckets that are not materialized yet are aggregated on the fly."""
+    await conftest._refresh(connection)
+    await connection.execute(
+        "INSERT INTO measurement"
+        " SELECT $1, identifier, 5000.0, NULL, 7200.0, now()"
+        " FROM attribute WHERE name = 'temperature';",
+        sensor_identifier,
+    )
+    response = await client.get(
+        url=f"/networks/{network_identifier}/sensors/{sensor_identifier}/measurements/aggregates",
+        headers={"Authorization": f"Bearer {access_token}"},
+        params={"start": 0, "end": 10800, "points": 6},
+    )
+    assert returns(response, 200)
+    assert response.json()["resolution"] == 600
+    assert response.json()["attributes"]["temperature"] == [
+        {
+            "bucket_timestamp": 0,
+            "minimum": 6000.0,
+            "maximum": 8200.0,
+            "average": 7200.0,
+            "count": 4,
+        },
+        {
+            "bucket_timestamp": 7200,
+            "minimum": 5000.0,
+            "maximum": 5000.0,
+            "average": 5000.0,
+            "count": 1,
+        },
+    ]
+
+
+@pytest.mark.anyio
+async def test_read_measurements_aggregates_with_columns_layout(
+    setup, client, network_identifier, sensor_identifier, access_token
+):
+    """Test reading aggregates with one array per field."""
+    response = await client.get(
+        url=f"/networks/{network_identifier}/sensors/{sensor_identifier}/measurements/aggregates",
+        headers={"Authorization": f"Bearer {access_token}"},
+        params={"start": 0, "end": 3600, "points": 6, "layout": "columns"},
+    )
+    assert returns(response, 200)
+    assert response.json()["attributes"]["temperature"] == {
+        "bucket_timestamp": [0],
+        "minimum": [6000.0],
+        "maximum": [8200.0],
+        "average": [7200.0],
+        "count": [4],
+    }
+
+
+@pytest.mark.anyio
+async def test_read_measurements_aggregates_with_fine_resolution(
+    setup, client, network_identifier, sensor_identifier, access_token
+):
+    """Test that the finest resolution is used when no resolution gives enough points."""
+    response = await client.get(
+        url=f"/networks/{network_identifier}/sensors/{sensor_identifier}/measurements/aggregates",
+        headers={"Authorization": f"Bearer {access_token}"},
+        params={"start": 0, "end": 3600, "points": 1000},
+    )
+    assert returns(response, 200)
+    assert response.json()["resolution"] == 60
+
+
+@pytest.mark.anyio
+async def test_read_measurements_aggregates_with_invalid_points(
+    setup, client, network_identifier, sensor_identifier, access_token
+):
+    """Test reading aggregates with a number of points below the minimum."""
+    response = await client.get(
+        url=f"/networks/{network_identifier}/sensors/{sensor_identifier}/measurements/aggregates",
+        headers={"Authorization": f"Bearer {access_token}"},
+        params={"points": 0},
+    )
+    assert returns(response, errors.BadRequestError)
+
+
+########################################################################################
+# Route: GET /networks/<network_identifier>/sensors/<sensor_identifier>/measurements/export
+########################################################################################
+
+
+@pytest.mark.anyio
+async def test_export_measurements(
+    setup, client, network_identifier, sensor_identifier, access_token
+):
+    """Test exporting a sensor's measurements in a time range as NDJSON."""
+    response = await client.get(
+        url=f"/networks/{network_identifier}/sensors/{sensor_identifier}/measurements/export",
+        headers={"Authorization": f"Bearer {access_token}"},
+        params={"start": 0, "end": 300},
+    )
+    assert returns(response, 200)
+    assert response.headers["content-type"] == "application/x-ndjson"
+    elements = [json.loads(line) for line in response.text.splitlines()]
+    assert [element["creation_timestamp"] for element in elements] == [0, 100, 200]
+    assert all(
+        set(element.keys())
+        == {"sensor_identifier", "revision", "creation_timestamp", "value"}
+        for element in elements
+    )
+
+
+@pytest.mark.anyio
+async def test_export_measurements_with_nonexistent_sensor(
+    setup, client, network_identifier, identifier, access_token
+):
+    """Test exporting the measurements of a sensor that doesn't exist."""
+    response = await client.get(
+        url=f"/networks/{network_identifier}/sensors/{identifier}/measurements/export",
+        headers={"Authorization": f"Bearer {access_token}"},
+        params={"start": 0, "end": 300},
+    )
+    assert returns(response, errors.NotFoundError)
+
+
+@pytest.mark.anyio
+async def test_export_measurements_without_range(
+    setup, client, network_identifier, sensor_identifier, access_token
+):
+    """Test exporting a sensor's measurements without a time range."""
+    response = await client.get(
+        url=f"/networks/{network_identifier}/sensors/{sensor_identifier}/measurements/export",
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert returns(response, errors.BadRequestError)
+
+
+########################################################################################
+# Route: GET /networks/<network_identifier>/measurements/export
+########################################################################################
+
+
+@pytest.mark.anyio
+async def test_export_network_measurements_as_csv(
+    setup, client, network_identifier, access_token
+):
+    """Test exporting a network's measurements as CSV with one line per attribute."""
+    response = await client.get(
+        url=f"/networks/{network_identifier}/measurements/export",
+        headers={"Authorization": f"Bearer {access_token}"},
+        params={"start": 0, "end": 1000, "format": "csv"},
+    )
+    assert returns(response, 200)
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == [
+        "sensor_identifier",
+        "revision",
+        "creation_timestamp",
+        "attribute",
+        "value",
+    ]
+    assert len(rows) == 8
+
+
+@pytest.mark.anyio
+async def test_export_network_measurements_with_nonexistent_network(
+    setup, client, identifier, access_token
+):
+    """Test exporting the measurements of a network that doesn't exist."""
+    response = await client.get(
+        url=f"/networks/{identifier}/measurements/export",
+        headers={"Authorization": f"Bearer {access_token}"},
+        params={"start": 0, "end": 1000},
+    )
+    assert returns(response, errors.NotFoundError)
+
+
+########################################################################################
+# Route: GET /networks/<network_identifier>/sensors/<sensor_identifier>/logs/aggregates
+########################################################################################
+
+
+@pytest.mark.anyio
+async def test_read_logs_aggregates(
+    setup, client, network_identifier, sensor_identifier, access_token
+):
+    """Test reading the aggregation of a sensor's warnings and errors."""
+    response = await client.get(
+        url=f"/networks/{network_identifier}/sensors/{sensor_identifier}/logs/aggregates",
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert returns(response, 200)
+    assert response.json() == [
+        {
+            "severity": "warning",
+            "subject": "The CPU is toasty; Get the marshmallows ready!",
+            "min_revision": 0,
+            "max_revision": 1,
+            "min_creation_timestamp": 200,
+            "max_creation_timestamp": 300,
+            "count": 2,
+        },
+        {
+            "severity": "error",
+            "subject": "The CPU is burning; Please call the fire department.",
+            "min_revision": 2,
+            "max_revision": 2,
+            "min_creation_timestamp": 400,
+            "max_creation_timestamp": 400,
+            "count": 1,
+        },
+    ]
+
+
+########################################################################################
+# Route: GET /networks/<network_identifier>/logs/aggregates
+########################################################################################
+
+
+@pytest.mark.anyio
+async def test_read_network_logs_aggregates(
+    setup, client, network_identifier, sensor_identifier, access_token
+):
+    """Test reading the aggregation of the warnings and errors of a network."""
+    response = await client.get(
+        url=f"/networks/{network_identifier}/logs/aggregates",
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert returns(response, 200)
+    assert len(response.json()) == 2
+    assert keys(
+        response,
+        {
+            "sensor_identifier",
+            "severity",
+            "subject",
+            "min_revision",
+            "max_revision",
+            "min_creation_timestamp",
+            "max_creation_timestamp",
+            "count",
+        },
+    )
+    assert all(x["sensor_identifier"] == sensor_identifier for x in response.json())
+    assert sorts(response, lambda x: x["max_creation_timestamp"])
+
+
 # TODO check logs
-# TODO check log aggregation
 # TODO check create sensor when network exists but user does not have permission
 # TODO check missing/wrong authentication
 # TODO differences between 401 and 404
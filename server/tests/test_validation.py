@@ -99,3 +99,116 @@ def test_validate_route_create_configuration_body_fail(value):
         pydantic.TypeAdapter(
             validation.routes._CreateConfigurationRequestBody
         ).validate_python(value)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        {},
+        {"start": "0", "end": "1683645000.5"},
+        {"limit": "1"},
+        {"limit": "16384", "attribute": "temperature", "direction": "previous"},
+    ],
+)
+def test_validate_route_read_measurements_query_pass(value):
+    pydantic.TypeAdapter(
+        validation.routes._ReadMeasurementsRequestQuery
+    ).validate_python(value)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        {"limit": "0"},
+        {"limit": "16385"},
+        {"start": "-1"},
+        {"attribute": "Temperature"},
+        {"attributes": "temperature"},
+    ],
+)
+def test_validate_route_read_measurements_query_fail(value):
+    with pytest.raises(pydantic.ValidationError):
+        pydantic.TypeAdapter(
+            validation.routes._ReadMeasurementsRequestQuery
+        ).validate_python(value)
+
+
+########################################################################################
+# MQTT messages
+########################################################################################
+
+
+def _validate(validator, payload):
+    """Validate into plain data so that models and dictionaries can be compared."""
+    try:
+        elements = validator.validate_json(payload)
+    except pydantic.ValidationError:
+        return None
+    return [
+        (
+            element.model_dump()
+            if isinstance(element, pydantic.BaseModel)
+            else {"revision": None, **element}
+        )
+        for element in elements
+    ]
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        '[{"timestamp": 1.5, "value": {"temperature": 23.1, "humidity": 0.62}}]',
+        '[{"timestamp": 1.5, "revision": 2, "value": {}}]',
+        '[{"timestamp": 1.5, "revision": null, "value": {"x": 1}}]',
+        '[{"timestamp": 1, "value": {"x_1": -1.0}}, {"timestamp": 2, "value": {}}]',
+        "[]",
+        "{}",
+        '[{"value": {"x": 1.0}}]',
+        '[{"timestamp": "1.5", "value": {"x": 1.0}}]',
+        '[{"timestamp": -1.0, "value": {"x": 1.0}}]',
+        '[{"timestamp": 2147483648.0, "value": {"x": 1.0}}]',
+        '[{"timestamp": 1.5, "revision": 1.0, "value": {"x": 1.0}}]',
+        '[{"timestamp": 1.5, "revision": -1, "value": {"x": 1.0}}]',
+        '[{"timestamp": 1.5, "value": {"x": true}}]',
+        '[{"timestamp": 1.5, "value": {"x": "1.0"}}]',
+        '[{"timestamp": 1.5, "value": {"X": 1.0}}]',
+        '[{"timestamp": 1.5, "value": {"x__x": 1.0}}]',
+        f'[{{"timestamp": 1.5, "value": {{"{"x" * 65}": 1.0}}}}]',
+        '[{"timestamp": 1.5, "value": {"x": 1.0}, "extra": 1}]',
+    ],
+)
+def test_validate_mqtt_measurements_dictionaries(payload):
+    assert _validate(validation.MeasurementsValidator, payload) == _validate(
+        validation.MeasurementsDictValidator, payload
+    )
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        '[{"timestamp": 1.5, "severity": "info", "message": "The CPU is toasty"}]',
+        '[{"timestamp": 1.5, "revision": 0, "severity": "error", "message": ""}]',
+        f'[{{"timestamp": 1.5, "severity": "warning", "message": "{"x" * 20000}"}}]',
+        '[{"timestamp": 1.5, "severity": "debug", "message": "The CPU is toasty"}]',
+        '[{"timestamp": 1.5, "severity": "info", "message": null}]',
+        '[{"timestamp": 1.5, "severity": "info"}]',
+    ],
+)
+def test_validate_mqtt_logs_dictionaries(payload):
+    assert _validate(validation.LogsValidator, payload) == _validate(
+        validation.LogsDictValidator, payload
+    )
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        '[{"timestamp": 1.5, "revision": 0, "success": true}]',
+        '[{"timestamp": 1.5, "success": true}]',
+        '[{"timestamp": 1.5, "revision": 0, "success": 1}]',
+    ],
+)
+def test_validate_mqtt_acknowledgments_dictionaries(payload):
+    assert _validate(validation.AcknowledgmentsValidator, payload) == _validate(
+        validation.AcknowledgmentsDictValidator, payload
+    )